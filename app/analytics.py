@@ -0,0 +1,496 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+STRONG_TOPIC_SCORE = 75
+WEAK_TOPIC_SCORE = 60
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def classify_topics(topic_scores):
+    """``{"strong": [...], "weak": [...]}`` from average topic scores."""
+    return {
+        "strong": [topic for topic, score in topic_scores.items() if score >= STRONG_TOPIC_SCORE],
+        "weak": [topic for topic, score in topic_scores.items() if score <= WEAK_TOPIC_SCORE],
+    }
+
+
+class _Codes:
+    # categorical column: value <-> small integer code, in order of first appearance
+
+    def __init__(self):
+        self.values = []
+        self.index = {}
+
+    def code(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _column(values, count, dtype):
+    return np.fromiter(values, dtype=dtype, count=count)
+
+
+# ------------------ ONE CANDIDATE ------------------ #
+
+class PerformanceAnalyzer:
+    """
+    Report of one candidate from their recorded responses
+    (``session.get_all_responses()``), in the shape ``FeedbackGenerator``
+    and the report exporters expect.
+    """
+
+    def __init__(self, responses, role=None):
+        self.role = role
+
+        topics = _Codes()
+        count = len(responses)
+        self.topic_codes = _column((topics.code(r.get("topic")) for r in responses), count, np.intp)
+        self.topics = topics.values
+        self.scores = _column((r["score"] for r in responses), count, np.float64)
+        self.confidences = _column((r["confidence"] for r in responses), count, np.float64)
+
+    def topic_scores(self):
+        counts = np.bincount(self.topic_codes, minlength=len(self.topics))
+        totals = np.bincount(self.topic_codes, weights=self.scores, minlength=len(self.topics))
+        return {topic: round(float(total / count), 2) for topic, total, count in zip(self.topics, totals, counts)}
+
+    def generate_report(self):
+        topic_scores = self.topic_scores()
+        answered = len(self.scores)
+
+        return {
+            "role": self.role,
+            "overall_score": round(float(self.scores.mean()), 2) if answered else 0,
+            "confidence_score": round(float(self.confidences.mean()), 2) if answered else 0,
+            "topic_scores": topic_scores,
+            "classification": classify_topics(topic_scores),
+        }
+
+
+# ------------------ COHORT ------------------ #
+
+class _Derived:
+    # per-session and per-(session, topic) averages of a Cohort, rebuilt after each change
+
+    def __init__(self, session, topic, score, session_role, n_topics):
+        n_sessions = len(session_role)
+        counts = np.bincount(session, minlength=n_sessions)
+        totals = np.bincount(session, weights=score, minlength=n_sessions)
+
+        # rounded like report scores, so a candidate ties with their own archived session
+        answered = counts > 0
+        self.session_role = session_role[answered]
+        self.session_score = np.round(totals[answered] / counts[answered], 2)
+
+        pairs, inverse = np.unique(session * n_topics + topic, return_inverse=True)
+        self.pair_session = pairs // n_topics
+        self.pair_topic = pairs % n_topics
+        self.pair_role = session_role[self.pair_session]
+        self.pair_score = np.round(np.bincount(inverse, weights=score) / np.bincount(inverse), 2)
+
+        self._sorted = {}
+
+    def sorted_scores(self, role_code, topic_code=None):
+        """Sorted session averages of one role (overall, or for one topic); cached."""
+        key = (role_code, topic_code)
+        scores = self._sorted.get(key)
+        if scores is None:
+            if topic_code is None:
+                scores = self.session_score[self.session_role == role_code]
+            else:
+                scores = self.pair_score[(self.pair_role == role_code) & (self.pair_topic == topic_code)]
+            scores = self._sorted[key] = np.sort(scores)
+        return scores
+
+
+def _percentile_rank(sorted_scores, score):
+    # share of the cohort below the score, ties counting half
+    below = np.searchsorted(sorted_scores, score, side="left")
+    not_above = np.searchsorted(sorted_scores, score, side="right")
+    return round(100.0 * float(below + not_above) / (2 * len(sorted_scores)), 2)
+
+
+class Cohort:
+    """
+    Scores of many finished sessions, for cohort statistics.
+
+    Responses are stored columnarly (parallel NumPy arrays of session,
+    topic and score codes, with each session's role alongside). Session and
+    per-topic averages are derived once with ``np.bincount`` after a
+    change, so percentiles, ranks and distributions over thousands of
+    sessions are a handful of array operations rather than loops over
+    responses. Sessions are averaged first, so every candidate counts once
+    whatever the number of answers.
+    """
+
+    def __init__(self):
+        self._sessions = _Codes()
+        self._roles = _Codes()
+        self._topics = _Codes()
+
+        # per session
+        self._session_role = np.empty(0, np.intp)
+        self._session_recorded = np.empty(0, np.float64)
+
+        # per response
+        self._session = np.empty(0, np.intp)
+        self._topic = np.empty(0, np.intp)
+        self._score = np.empty(0, np.float64)
+
+        self._derived = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from ``(session_id, role, recorded_at, topic, score)`` rows, e.g. straight from a query."""
+        cohort = cls()
+        cohort.extend(rows)
+        return cohort
+
+    def extend(self, rows):
+        """
+        Add ``(session_id, role, recorded_at, topic, score)`` rows. A session
+        already in the cohort is replaced by its new rows, so feeding the
+        archive's changes keeps the cohort in step with it.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+
+        replaced = [self._sessions.index[session_id] for session_id in {row[0] for row in rows}
+                    if session_id in self._sessions.index]
+        if replaced:
+            keep = ~np.isin(self._session, replaced)
+            self._session, self._topic, self._score = self._session[keep], self._topic[keep], self._score[keep]
+
+        count = len(rows)
+        session = _column((self._sessions.code(row[0]) for row in rows), count, np.intp)
+
+        n_sessions = len(self._sessions.values)
+        session_role = np.zeros(n_sessions, np.intp)
+        session_role[:len(self._session_role)] = self._session_role
+        session_recorded = np.zeros(n_sessions, np.float64)
+        session_recorded[:len(self._session_recorded)] = self._session_recorded
+
+        # every row of a session carries the same role and time, so the last write is as good as any
+        session_role[session] = _column((self._roles.code(row[1]) for row in rows), count, np.intp)
+        session_recorded[session] = _column((row[2] for row in rows), count, np.float64)
+
+        self._session_role, self._session_recorded = session_role, session_recorded
+        self._session = np.concatenate([self._session, session])
+        self._topic = np.concatenate([self._topic, _column((self._topics.code(row[3]) for row in rows), count, np.intp)])
+        self._score = np.concatenate([self._score, _column((row[4] for row in rows), count, np.float64)])
+        self._derived = None
+
+    def retain(self, recorded_after):
+        """Drop sessions recorded before the ``recorded_after`` timestamp; returns how many were dropped."""
+        keep = self._session_recorded >= recorded_after
+        dropped = int(len(keep) - keep.sum())
+        if not dropped:
+            return 0
+
+        # renumber the surviving sessions 0..n-1 so ids of dropped sessions are not kept forever
+        new_code = np.cumsum(keep) - 1
+        rows = keep[self._session]
+        self._session = new_code[self._session[rows]]
+        self._topic, self._score = self._topic[rows], self._score[rows]
+        self._session_role, self._session_recorded = self._session_role[keep], self._session_recorded[keep]
+
+        sessions = _Codes()
+        for session_id, kept in zip(self._sessions.values, keep):
+            if kept:
+                sessions.code(session_id)
+        self._sessions = sessions
+
+        self._derived = None
+        return dropped
+
+    def _derive(self):
+        if self._derived is None:
+            self._derived = _Derived(self._session, self._topic, self._score, self._session_role, max(1, len(self._topics.values)))
+        return self._derived
+
+    def __len__(self):
+        """Sessions with at least one response."""
+        return len(self._derive().session_score)
+
+    def roles(self):
+        return list(self._roles.values)
+
+    def score_distribution(self, role=None, bins=10):
+        """Per role: sessions, mean, median, spread and a 0-100 histogram of overall session scores."""
+        derived = self._derive()
+        distribution = {}
+
+        for role_code, role_name in enumerate(self._roles.values):
+            if role is not None and role_name != role:
+                continue
+
+            scores = derived.sorted_scores(role_code)
+            if not scores.size:
+                continue
+
+            counts, edges = np.histogram(scores, bins=bins, range=(0, 100))
+            distribution[role_name] = {
+                "sessions": int(scores.size),
+                "mean": round(float(scores.mean()), 2),
+                "median": round(float(np.median(scores)), 2),
+                "std": round(float(scores.std()), 2),
+                "bins": [round(float(edge), 2) for edge in edges],
+                "counts": counts.tolist(),
+            }
+
+        return distribution
+
+    def topic_percentiles(self, role=None, percentiles=DEFAULT_PERCENTILES):
+        """Per topic: sessions that answered it, mean and percentiles of their topic averages."""
+        derived = self._derive()
+
+        mask = np.ones(len(derived.pair_score), bool)
+        if role is not None:
+            role_code = self._roles.index.get(role)
+            if role_code is None:
+                return {}
+            mask = derived.pair_role == role_code
+
+        topic, score = derived.pair_topic[mask], derived.pair_score[mask]
+        if not score.size:
+            return {}
+
+        # group by topic: sort once, then each topic is one contiguous slice
+        order = np.lexsort((score, topic))
+        topic, score = topic[order], score[order]
+        starts = np.flatnonzero(np.r_[True, topic[1:] != topic[:-1]])
+        ends = np.r_[starts[1:], len(topic)]
+
+        result = {}
+        for start, end in zip(starts, ends):
+            scores = score[start:end]
+            values = np.percentile(scores, percentiles)
+            result[self._topics.values[topic[start]]] = {
+                "sessions": int(end - start),
+                "mean": round(float(scores.mean()), 2),
+                **{f"p{p:g}": round(float(value), 2) for p, value in zip(percentiles, values)},
+            }
+
+        return result
+
+    def rank(self, report):
+        """
+        Where one candidate's report (``PerformanceAnalyzer.generate_report()``
+        or ``session.get_report()``) stands among the cohort of its role:
+        rank and percentile of the overall score and of each topic score.
+        """
+        derived = self._derive()
+        role_code = self._roles.index.get(report.get("role"))
+        scores = derived.sorted_scores(role_code) if role_code is not None else None
+        if scores is None or not scores.size:
+            return {"error": f"No cohort for role {report.get('role')!r}"}
+
+        overall = report["overall_score"]
+
+        topics = {}
+        for topic, score in report["topic_scores"].items():
+            topic_code = self._topics.index.get(topic)
+            topic_scores = derived.sorted_scores(role_code, topic_code) if topic_code is not None else None
+            if topic_scores is None or not topic_scores.size:
+                continue
+            topics[topic] = {
+                "score": score,
+                "percentile": _percentile_rank(topic_scores, score),
+                "sessions": int(topic_scores.size),
+            }
+
+        return {
+            "role": report["role"],
+            "sessions": int(scores.size),
+            "overall": {
+                "score": overall,
+                "rank": int(scores.size - np.searchsorted(scores, overall, side="right")) + 1,
+                "percentile": _percentile_rank(scores, overall),
+            },
+            "topics": topics,
+        }
+
+
+# ------------------ ARCHIVE ------------------ #
+
+class SQLiteCohortArchive:
+    """
+    Scores of finished sessions, kept in one SQLite (WAL) file after the
+    sessions themselves expire; every worker on the host shares it.
+    Recording a session again replaces its earlier copy.
+    """
+
+    # seq grows with every recording, so readers can fetch only what changed since they last looked
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cohort_sessions (
+            session_id  TEXT PRIMARY KEY,
+            role        TEXT NOT NULL,
+            recorded_at REAL NOT NULL,
+            seq         INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS cohort_sessions_seq ON cohort_sessions (seq);
+        CREATE INDEX IF NOT EXISTS cohort_sessions_recorded_at ON cohort_sessions (recorded_at);
+        CREATE TABLE IF NOT EXISTS cohort_scores (
+            session_id TEXT NOT NULL,
+            topic      TEXT,
+            score      REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS cohort_scores_session ON cohort_scores (session_id);
+    """
+
+    def __init__(self, path="data/cohort.db", timeout=5.0):
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def _conn(self):
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def record(self, session_id, role, responses):
+        conn = self._conn
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM cohort_scores WHERE session_id = ?", (session_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cohort_sessions (session_id, role, recorded_at, seq)"
+                " SELECT ?, ?, ?, COALESCE(MAX(seq), 0) + 1 FROM cohort_sessions",
+                (session_id, role, time.time())
+            )
+            conn.executemany(
+                "INSERT INTO cohort_scores (session_id, topic, score) VALUES (?, ?, ?)",
+                [(session_id, response.get("topic"), response["score"]) for response in responses]
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.execute("COMMIT")
+
+    def changes_since(self, seq):
+        """``(seq, session_id, role, recorded_at, topic, score)`` rows of sessions recorded after ``seq``."""
+        return self._conn.execute(
+            "SELECT seq, session_id, role, recorded_at, topic, score"
+            " FROM cohort_sessions JOIN cohort_scores USING (session_id)"
+            " WHERE seq > ? ORDER BY seq",
+            (seq,)
+        ).fetchall()
+
+    def purge(self, older_than):
+        """Drop sessions recorded before the ``older_than`` timestamp."""
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM cohort_scores WHERE session_id IN"
+                " (SELECT session_id FROM cohort_sessions WHERE recorded_at < ?)",
+                (older_than,)
+            )
+            deleted = conn.execute("DELETE FROM cohort_sessions WHERE recorded_at < ?", (older_than,)).rowcount
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.execute("COMMIT")
+        return deleted
+
+
+class CohortAnalytics:
+    """
+    The API's view of the archive: records finished sessions and answers
+    cohort queries from an in-memory ``Cohort``.
+
+    At most every ``refresh_seconds`` the cohort fetches only the sessions
+    recorded since it last looked and drops those past ``ttl_seconds``; the
+    archive itself is purged of them from time to time, so neither grows
+    without bound. Queries run under a lock, so a refresh never changes the
+    cohort under a query.
+    """
+
+    def __init__(self, archive, refresh_seconds=10.0, ttl_seconds=90 * 86400.0):
+        self.archive = archive
+        self.refresh_seconds = refresh_seconds
+        self.ttl_seconds = ttl_seconds
+
+        self._cohort = Cohort()
+        self._seq = 0
+        self._checked_at = None
+        self._purged_at = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, session_id, role, responses):
+        if responses:
+            self.archive.record(session_id, role, responses)
+        self._maybe_purge()
+
+    def _maybe_purge(self):
+        now = time.time()
+        if now - self._purged_at >= min(self.ttl_seconds, 3600.0):
+            self._purged_at = now
+            self.archive.purge(now - self.ttl_seconds)
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+            return
+        self._checked_at = now
+
+        changes = self.archive.changes_since(self._seq)
+        if changes:
+            self._seq = changes[-1][0]
+            self._cohort.extend(row[1:] for row in changes)
+        self._cohort.retain(time.time() - self.ttl_seconds)
+
+    def stats(self, role=None, bins=10):
+        with self._lock:
+            self._refresh()
+            return {
+                "sessions": len(self._cohort),
+                "score_distribution": self._cohort.score_distribution(role, bins=bins),
+                "topic_percentiles": self._cohort.topic_percentiles(role),
+            }
+
+    def rank(self, report):
+        with self._lock:
+            self._refresh()
+            return self._cohort.rank(report)
+
+
+def cohort_analytics_from_env():
+    """``CohortAnalytics`` over ``COHORT_DB_PATH``; None (cohort analytics off) when it is unset."""
+    db_path = os.environ.get("COHORT_DB_PATH")
+    if not db_path:
+        return None
+
+    return CohortAnalytics(
+        SQLiteCohortArchive(db_path),
+        refresh_seconds=float(os.environ.get("COHORT_REFRESH_SECONDS", 10)),
+        ttl_seconds=float(os.environ.get("COHORT_TTL_SECONDS", 90 * 86400)),
+    )
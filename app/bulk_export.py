@@ -0,0 +1,293 @@
+"""
+Bulk report export: PDF and JSON reports for many candidates at once.
+
+    python -m app.bulk_export reports.ndjson exports/
+    python -m app.bulk_export reports.ndjson exports/ --workers 8 --zip exports.zip
+    python -m app.bulk_export reports.ndjson exports/ --formats json
+
+Each input line is ``{"report": {...}, "feedback": {...}}`` (``feedback`` is
+generated from the report when missing), with an optional ``id`` naming the
+candidate's files. PDFs are rendered across a process pool, each to its own
+``<output_dir>/<id>.pdf``; JSON reports are streamed into one
+``reports.ndjson``. ``manifest.ndjson`` lists every report with its files
+and render time, and ``--zip`` bundles all of it into one archive.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import statistics
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.executors import InlineExecutor
+from app.feedback import FeedbackGenerator
+from utils.report_exporter import render_report_pdf
+
+
+FORMATS = ("pdf", "json")
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+# ------------------ WORKER SIDE ------------------ #
+
+def render_chunk(output_dir, items):
+    """
+    Render ``[(report_id, report, feedback), ...]`` to ``<output_dir>/<report_id>.pdf``;
+    returns ``(path or None, render seconds, error or None)`` per item, in order.
+    """
+    results = []
+    for report_id, report, feedback in items:
+        started = time.perf_counter()
+        try:
+            path = Path(output_dir) / f"{report_id}.pdf"
+            path.write_bytes(render_report_pdf(report, feedback))
+            results.append((str(path), time.perf_counter() - started, None))
+        except Exception as e:
+            results.append((None, time.perf_counter() - started, f"{type(e).__name__}: {e}"))
+    return results
+
+
+# ------------------ INPUT ------------------ #
+
+def read_reports(f):
+    """``(id, report, feedback, error)`` per NDJSON line; ``id`` may be None."""
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield None, None, None, f"line {line_number}: not valid JSON"
+            continue
+
+        if not isinstance(item, dict) or not isinstance(item.get("report"), dict):
+            yield None, None, None, f"line {line_number}: expected an object with a report"
+            continue
+
+        yield item.get("id"), item["report"], item.get("feedback"), None
+
+
+def _as_items(pairs):
+    # (report, feedback) pairs, or (id, report, feedback, error) rows from read_reports
+    for pair in pairs:
+        if len(pair) == 4:
+            yield pair
+        else:
+            report, feedback = pair
+            yield None, report, feedback, None
+
+
+class _ReportIds:
+    # file-safe, unique per run: a repeated or missing id never overwrites another candidate's files
+
+    def __init__(self):
+        self.used = set()
+        self.count = 0
+
+    def assign(self, report_id, report):
+        self.count += 1
+        if report_id is None and isinstance(report, dict):
+            report_id = report.get("session_id")
+
+        base = _UNSAFE.sub("_", str(report_id)).strip("._") if report_id is not None else ""
+        base = base[:100] or f"report_{self.count:06d}"
+
+        report_id, suffix = base, 1
+        while report_id in self.used:
+            suffix += 1
+            report_id = f"{base}_{suffix}"
+        self.used.add(report_id)
+        return report_id
+
+
+# ------------------ DRIVER ------------------ #
+
+def _timing_summary(seconds):
+    if not seconds:
+        return {}
+    ordered = sorted(seconds)
+    return {
+        "render_ms_median": round(statistics.median(ordered) * 1000, 1),
+        "render_ms_p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 1),
+        "render_ms_max": round(ordered[-1] * 1000, 1),
+    }
+
+
+def export_reports(pairs, output_dir, formats=FORMATS, workers=None, chunk_size=4, zip_path=None, log=None,
+                   log_interval=2.0):
+    """
+    Export every ``(report, feedback)`` pair (or ``read_reports`` row) into
+    ``output_dir``; returns the run summary, including render time
+    percentiles. Outputs keep input order; ``log`` gets a progress line
+    every ``log_interval`` seconds.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if "pdf" in formats and workers:
+        # spawn, not fork, as in the API's grading pool
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = InlineExecutor()
+
+    # enough chunks queued to keep every worker busy, and no more
+    max_in_flight = max(1, workers) * 2
+    ids = _ReportIds()
+    started = time.perf_counter()
+    summary = {"reports": 0, "errors": 0, "pdfs": 0}
+    render_seconds = []
+
+    ndjson_path = output_dir / "reports.ndjson"
+    manifest_path = output_dir / "manifest.ndjson"
+    ndjson = open(ndjson_path, "w", encoding="utf-8") if "json" in formats else None
+    manifest = open(manifest_path, "w", encoding="utf-8")
+    pending = deque()
+    logged_at = [started]
+
+    def finish_one():
+        entries, rendered, future = pending.popleft()
+
+        if future is not None:
+            for entry, (pdf_path, seconds, error) in zip(rendered, future.result()):
+                entry["render_ms"] = round(seconds * 1000, 1)
+                render_seconds.append(seconds)
+                if error is not None:
+                    entry["error"] = error
+                else:
+                    entry["pdf"] = Path(pdf_path).name
+                    summary["pdfs"] += 1
+
+        for entry in entries:
+            summary["reports"] += 1
+            summary["errors"] += entry["error"] is not None
+            manifest.write(json.dumps(entry) + "\n")
+
+        now = time.perf_counter()
+        if log is not None and now - logged_at[0] >= log_interval:
+            logged_at[0] = now
+            log(f"exported {summary['reports']:,} reports, {summary['reports'] / (now - started):,.1f} reports/s, "
+                f"{summary['errors']:,} errors")
+
+    try:
+        items = _as_items(pairs)
+        while True:
+            chunk = list(itertools.islice(items, chunk_size))
+            if not chunk:
+                break
+
+            entries, rendered, jobs = [], [], []
+            for report_id, report, feedback, error in chunk:
+                if error is not None:
+                    entries.append({"id": None, "error": error})
+                    continue
+
+                report_id = ids.assign(report_id, report)
+                entry = {"id": report_id, "error": None}
+                entries.append(entry)
+
+                try:
+                    if feedback is None:
+                        feedback = FeedbackGenerator(report).generate_feedback()
+                except (KeyError, TypeError) as e:
+                    entry["error"] = f"incomplete report: {type(e).__name__}: {e}"
+                    continue
+
+                if ndjson is not None:
+                    ndjson.write(json.dumps({"id": report_id, "report": report, "feedback": feedback}) + "\n")
+                    entry["json"] = ndjson_path.name
+                if "pdf" in formats:
+                    rendered.append(entry)
+                    jobs.append((report_id, report, feedback))
+
+            # chunks finish in submission order, so the manifest keeps input order
+            future = executor.submit(render_chunk, str(output_dir), jobs) if jobs else None
+            pending.append((entries, rendered, future))
+
+            if len(pending) >= max_in_flight:
+                finish_one()
+
+        while pending:
+            finish_one()
+    finally:
+        executor.shutdown(wait=True)
+        manifest.close()
+        if ndjson is not None:
+            ndjson.close()
+
+    if zip_path is not None:
+        bundle(output_dir, zip_path)
+        summary["zip"] = str(zip_path)
+
+    elapsed = time.perf_counter() - started
+    summary.update({
+        "elapsed_s": round(elapsed, 2),
+        "reports_per_s": round(summary["reports"] / elapsed, 2) if elapsed else 0.0,
+        **_timing_summary(render_seconds),
+        "output_dir": str(output_dir),
+    })
+    return summary
+
+
+def bundle(output_dir, zip_path):
+    """Zip the PDFs, ``reports.ndjson`` and ``manifest.ndjson`` of an export."""
+    output_dir = Path(output_dir)
+    with open(output_dir / "manifest.ndjson", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for name in ("manifest.ndjson", "reports.ndjson"):
+            if (output_dir / name).exists():
+                archive.write(output_dir / name, name, compress_type=zipfile.ZIP_DEFLATED)
+        for entry in entries:
+            if entry.get("pdf"):
+                # PDF streams are compressed already
+                archive.write(output_dir / entry["pdf"], entry["pdf"], compress_type=zipfile.ZIP_STORED)
+
+
+# ------------------ CLI ------------------ #
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="NDJSON of {report, feedback, id} objects ('-' for stdin)")
+    parser.add_argument("output_dir", help="directory for the PDFs, reports.ndjson and manifest.ndjson")
+    parser.add_argument("--formats", default="pdf,json", help="comma-separated: pdf, json (default: both)")
+    parser.add_argument("--workers", type=int, default=None, help="PDF rendering processes (default: CPU count, 0: inline)")
+    parser.add_argument("--chunk-size", type=int, default=4, help="reports sent to a worker at a time")
+    parser.add_argument("--zip", dest="zip_path", help="also bundle everything into this zip file")
+    args = parser.parse_args()
+
+    formats = tuple(f.strip() for f in args.formats.split(",") if f.strip())
+    if not formats or any(f not in FORMATS for f in formats):
+        parser.error(f"--formats must be a comma-separated subset of {', '.join(FORMATS)}")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        summary = export_reports(
+            read_reports(src), args.output_dir,
+            formats=formats,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            zip_path=args.zip_path,
+            log=lambda message: print(message, file=sys.stderr, flush=True),
+        )
+    finally:
+        if src is not sys.stdin:
+            src.close()
+
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""
+Offline bulk grading: re-score archives of recorded answers.
+
+    python -m app.bulk_grade answers.jsonl graded.jsonl
+    python -m app.bulk_grade answers.csv graded.csv --workers 8 --chunk-size 1000
+    python -m app.bulk_grade answers.csv graded.jsonl --bank data/questions.qbank --role "Data Scientist"
+
+Input rows (CSV with a header, or JSON Lines) need ``question_id`` and
+``user_answer``; ``role`` is optional (``--role`` sets a default, and
+without either the question id must belong to a single role). Every other
+field is passed through to the output. Rows are read, graded across a
+process pool and written in chunks, with a bounded number of chunks in
+flight, so memory stays flat however large the input is; output keeps
+input order. Rows that cannot be graded get an ``error`` field instead.
+"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from app.evaluator import evaluate_answers_batch
+from app.executors import InlineExecutor
+from app.question_bank import DEFAULT_BANK_PATH, get_question_bank
+from app.session import parse_keywords
+from app.similarity import get_similarity_engine
+
+
+RESULT_FIELDS = ("score", "confidence", "keyword_match", "matched_keywords", "missing_keywords", "feedback", "error")
+
+
+def _format(path, explicit=None):
+    if explicit:
+        return explicit
+    return "csv" if str(path).lower().endswith(".csv") else "jsonl"
+
+
+# ------------------ WORKER SIDE ------------------ #
+
+# per worker process: questions resolved so far, keywords already parsed
+_resolved = {}
+_roles_by_id = {}
+
+
+def _roles_of(bank, question_id):
+    # built once per worker, and only if some row comes without a role
+    if not _roles_by_id:
+        for role in bank.roles():
+            for question in bank.role_questions(role):
+                _roles_by_id.setdefault(str(question.get("question_id")), []).append((role, question.get("question_id")))
+    return _roles_by_id.get(str(question_id), [])
+
+
+def _resolve(bank, role, question_id):
+    """``(role, question_id, ideal_answer, keywords)`` or an error string."""
+    key = (role, question_id)
+    resolved = _resolved.get(key)
+    if resolved is not None:
+        return resolved
+
+    if role:
+        candidates = [(role, question_id)]
+    else:
+        candidates = _roles_of(bank, question_id)
+        if len(candidates) > 1:
+            return f"question_id {question_id!r} exists in several roles; give a role"
+
+    question = None
+    for candidate_role, candidate_id in candidates:
+        question = bank.get_question(candidate_role, candidate_id)
+        if question is not None:
+            role, question_id = candidate_role, candidate_id
+            break
+
+    if question is None:
+        return f"Unknown question_id {question_id!r}" + (f" for role {role!r}" if role else "")
+
+    # only bank questions are kept, so this stays bounded by the bank whatever the input holds
+    resolved = _resolved[key] = (role, question_id, question.get("ideal_answer"), parse_keywords(question.get("keywords", "")))
+    return resolved
+
+
+def grade_chunk(bank_path, default_role, items):
+    """
+    Grade ``[(role, question_id, user_answer), ...]`` in one batch; returns
+    one result dict (or ``{"error": ...}``) per item, in order.
+    """
+    bank = get_question_bank(bank_path)
+    engine = get_similarity_engine(bank)
+
+    results = [None] * len(items)
+    todo = []
+
+    for i, (role, question_id, user_answer) in enumerate(items):
+        if question_id in (None, ""):
+            results[i] = {"error": "missing question_id"}
+            continue
+
+        resolved = _resolve(bank, role or default_role, question_id)
+        if isinstance(resolved, str):
+            results[i] = {"error": resolved}
+        else:
+            todo.append((i, resolved, user_answer if isinstance(user_answer, str) else ""))
+
+    if todo:
+        graded = evaluate_answers_batch(
+            [answer for _, _, answer in todo],
+            [resolved[2] for _, resolved, _ in todo],
+            [resolved[3] for _, resolved, _ in todo],
+            question_ids=[resolved[1] for _, resolved, _ in todo],
+            roles=[resolved[0] for _, resolved, _ in todo],
+            engine=engine,
+        )
+        for (i, _, _), result in zip(todo, graded):
+            results[i] = result
+
+    return results
+
+
+# ------------------ INPUT / OUTPUT ------------------ #
+
+class Unreadable(dict):
+    """A JSONL line that could not be parsed; written out with its ``error``."""
+
+
+def read_rows(f, fmt):
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = Unreadable(line=line_number, error="not valid JSON")
+        yield row if isinstance(row, dict) else Unreadable(line=line_number, error="not a JSON object")
+
+
+class ResultWriter:
+    """Writes graded rows as JSON Lines or CSV (keyword lists joined with ``; ``)."""
+
+    def __init__(self, f, fmt):
+        self.f = f
+        self.fmt = fmt
+        self._csv = None
+
+    def write(self, row, result):
+        # re-grading an earlier output: its old results are replaced, never mixed in
+        out = {field: value for field, value in row.items() if field not in RESULT_FIELDS}
+        out.update(result)
+
+        if self.fmt == "jsonl":
+            self.f.write(json.dumps(out) + "\n")
+            return
+
+        if self._csv is None:
+            # columns: the first row's input fields, then the result fields
+            fields = [field for field in row if field not in RESULT_FIELDS] + list(RESULT_FIELDS)
+            self._csv = csv.DictWriter(self.f, fieldnames=fields, extrasaction="ignore")
+            self._csv.writeheader()
+
+        for field in ("matched_keywords", "missing_keywords"):
+            if isinstance(out.get(field), list):
+                out[field] = "; ".join(out[field])
+        self._csv.writerow(out)
+
+
+# ------------------ DRIVER ------------------ #
+
+class Progress:
+
+    def __init__(self, total_bytes, interval=2.0, stream=sys.stderr):
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.stream = stream
+        self.started = time.perf_counter()
+        self._reported = self.started
+        self.rows = 0
+        self.errors = 0
+
+    def update(self, rows, errors, position=None, force=False):
+        self.rows += rows
+        self.errors += errors
+
+        now = time.perf_counter()
+        if not force and now - self._reported < self.interval:
+            return
+        self._reported = now
+
+        elapsed = now - self.started
+        done = f" ({position / self.total_bytes:.0%})" if position is not None and self.total_bytes else ""
+        print(f"graded {self.rows:,} rows{done}, {self.rows / max(elapsed, 1e-9):,.0f} rows/s, "
+              f"{self.errors:,} errors", file=self.stream, flush=True)
+
+
+def grade_file(input_path, output_path, bank_path=DEFAULT_BANK_PATH, role=None, workers=None, chunk_size=1000,
+               input_format=None, output_format=None, progress_interval=2.0):
+    """Grade every row of ``input_path`` into ``output_path``; returns the run summary."""
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    input_format = _format(input_path, input_format)
+    output_format = _format(output_path, output_format)
+
+    if workers:
+        # spawn, not fork, as in the API's grading pool
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        # --workers 0: grade in this process (handy for debugging and tiny files)
+        executor = InlineExecutor()
+
+    # enough chunks queued to keep every worker busy, and no more
+    max_in_flight = max(1, workers) * 2
+    progress = Progress(os.path.getsize(input_path), interval=progress_interval)
+
+    newline = "" if input_format == "csv" else None
+    with open(input_path, encoding="utf-8", newline=newline) as src, \
+            open(output_path, "w", encoding="utf-8", newline="" if output_format == "csv" else None) as dst:
+        writer = ResultWriter(dst, output_format)
+        rows = read_rows(src, input_format)
+        pending = deque()
+
+        def drain_one():
+            chunk, future = pending.popleft()
+            errors = 0
+            for row, result in zip(chunk, future.result()):
+                if isinstance(row, Unreadable):
+                    result = {"error": row["error"]}
+                errors += "error" in result
+                writer.write(row, result)
+            progress.update(len(chunk), errors, src.buffer.tell())
+
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                items = [(row.get("role"), row.get("question_id"), row.get("user_answer")) for row in chunk]
+                pending.append((chunk, executor.submit(grade_chunk, bank_path, role, items)))
+
+                if len(pending) >= max_in_flight:
+                    drain_one()
+
+            while pending:
+                drain_one()
+        finally:
+            executor.shutdown(wait=True)
+
+    elapsed = time.perf_counter() - progress.started
+    progress.update(0, 0, force=True)
+    return {
+        "rows": progress.rows,
+        "errors": progress.errors,
+        "elapsed_s": round(elapsed, 2),
+        "rows_per_s": round(progress.rows / elapsed, 1) if elapsed else 0.0,
+        "output": str(output_path),
+    }
+
+
+# ------------------ CLI ------------------ #
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="answers to grade (.csv or .jsonl)")
+    parser.add_argument("output", help="graded rows to write (.csv or .jsonl)")
+    parser.add_argument("--bank", default=DEFAULT_BANK_PATH, help="question bank (CSV or compiled .qbank)")
+    parser.add_argument("--role", help="role for rows that do not name one")
+    parser.add_argument("--workers", type=int, default=None, help="grading processes (default: CPU count, 0: inline)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="answers per batch sent to a worker")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--output-format", choices=("csv", "jsonl"), help="default: from the file extension")
+    args = parser.parse_args()
+
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    summary = grade_file(
+        args.input, args.output,
+        bank_path=args.bank,
+        role=args.role,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        input_format=args.input_format,
+        output_format=args.output_format,
+    )
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
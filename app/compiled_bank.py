@@ -0,0 +1,446 @@
+"""
+Compiled question bank: a validated, memory-mappable binary form of the CSV.
+
+    python -m app.compiled_bank data/questions.csv data/questions.qbank
+    python -m app.compiled_bank data/questions.csv data/questions.qbank --strict
+
+Rows are grouped by role (CSV order is kept within a role) and stored
+column by column: each text column is one offsets array plus one UTF-8
+blob, and keywords are stored already split and normalized exactly as
+``parse_keywords`` would return them. A hash index over (role,
+question_id) makes lookups a binary search. Loading only maps the file,
+so it is near-instant, and every worker process that maps the same file
+shares its pages through the OS page cache.
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+from app.keyword_matcher import KeywordMatcher
+
+
+MAGIC = b"QBANK\x00\x00\x01"
+FORMAT_VERSION = 1
+SUFFIX = ".qbank"
+_ALIGN = 8
+
+
+def is_compiled_bank(path):
+    return str(path).endswith(SUFFIX)
+
+
+def _key_hash(role, question_id):
+    digest = hashlib.blake2b(f"{role}\x00{question_id}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+# ------------------ VALIDATION ------------------ #
+
+class BankValidationError(ValueError):
+    pass
+
+
+def validate_rows(rows, columns):
+    """
+    Issues in the bank as ``{"errors": {...}, "warnings": {...}}``, each
+    kind mapping to the CSV line numbers it affects. Missing columns and
+    duplicate (role, question_id) pairs are errors; ``TO_BE_ADDED`` or
+    empty ideal answers and empty keywords are warnings.
+    """
+    errors = {}
+    warnings = {}
+
+    missing = [c for c in ("role", "topic", "question_id", "question_text", "ideal_answer", "keywords") if c not in columns]
+    if missing:
+        errors["missing columns"] = missing
+        return {"errors": errors, "warnings": warnings}
+
+    seen = {}
+    for i, row in enumerate(rows):
+        line = i + 2   # header is line 1
+
+        if not row["role"]:
+            errors.setdefault("missing role", []).append(line)
+        if not row["question_id"]:
+            errors.setdefault("missing question_id", []).append(line)
+
+        key = (row["role"], row["question_id"])
+        if key in seen:
+            errors.setdefault("duplicate question_id", []).append(line)
+        seen[key] = line
+
+        if row["ideal_answer"] == "TO_BE_ADDED":
+            warnings.setdefault("ideal_answer is TO_BE_ADDED", []).append(line)
+        elif not row["ideal_answer"]:
+            warnings.setdefault("empty ideal_answer", []).append(line)
+
+        if not row["keywords"] or not any(row["keywords"]):
+            warnings.setdefault("empty keywords", []).append(line)
+
+    return {"errors": errors, "warnings": warnings}
+
+
+# ------------------ COMPILER ------------------ #
+
+def _read_rows(csv_path):
+    import pandas as pd
+    from app.session import parse_keywords
+
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=True)
+    df.columns = df.columns.str.strip().str.lower()
+    df = df.astype(object).where(df.notna(), None)
+
+    columns = list(df.columns)
+    rows = df.to_dict("records")
+    if "keywords" in columns:
+        for row in rows:
+            row["keywords"] = parse_keywords(row["keywords"])
+    return columns, rows
+
+
+def _string_column(values):
+    encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    nulls = np.fromiter((value is None for value in values), dtype=np.uint8, count=len(values))
+    return offsets, b"".join(encoded), nulls
+
+
+def compile_bank(csv_path, output_path, strict=False):
+    """
+    Validate ``csv_path`` and write the compiled bank to ``output_path``.
+
+    Raises ``BankValidationError`` on errors (and, with ``strict``, on
+    warnings too); otherwise returns the validation report. The file is
+    written next to the target and swapped in atomically, so processes
+    that still map the old bank keep reading a consistent copy.
+    """
+    columns, rows = _read_rows(csv_path)
+    report = validate_rows(rows, columns)
+
+    if report["errors"] or (strict and report["warnings"]):
+        raise BankValidationError(format_report(report))
+
+    # role partitions, in order of first appearance; CSV order within each role
+    by_role = {}
+    for row in rows:
+        by_role.setdefault(row["role"], []).append(row)
+    ordered = [row for role_rows in by_role.values() for row in role_rows]
+
+    roles = []
+    start = 0
+    for role, role_rows in by_role.items():
+        roles.append({"role": role, "start": start, "stop": start + len(role_rows)})
+        start += len(role_rows)
+
+    arrays = {}   # name -> numpy array or bytes, written in this order
+    text_columns = [c for c in columns if c not in ("role", "keywords")]
+
+    for column in text_columns:
+        offsets, blob, nulls = _string_column([row[column] for row in ordered])
+        arrays[f"{column}.offsets"] = offsets
+        arrays[f"{column}.data"] = blob
+        arrays[f"{column}.nulls"] = nulls
+
+    keyword_counts = [len(row["keywords"]) for row in ordered]
+    row_offsets = np.zeros(len(ordered) + 1, dtype=np.uint64)
+    np.cumsum(keyword_counts, out=row_offsets[1:])
+    offsets, blob, _ = _string_column([keyword for row in ordered for keyword in row["keywords"]])
+    arrays["keywords.rows"] = row_offsets
+    arrays["keywords.offsets"] = offsets
+    arrays["keywords.data"] = blob
+
+    hashes = np.fromiter(
+        (_key_hash(row["role"], row["question_id"]) for row in ordered), dtype=np.uint64, count=len(ordered)
+    )
+    order = np.argsort(hashes, kind="stable")
+    arrays["index.hashes"] = hashes[order]
+    arrays["index.rows"] = order.astype(np.uint64)
+
+    # lay the arrays out after the header, each 8-byte aligned
+    layout = {}
+    position = 0
+    for name, array in arrays.items():
+        raw = array.tobytes() if isinstance(array, np.ndarray) else array
+        layout[name] = {
+            "offset": position,
+            "bytes": len(raw),
+            "dtype": array.dtype.str if isinstance(array, np.ndarray) else None,
+        }
+        position += len(raw) + (-len(raw) % _ALIGN)
+
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "source": str(csv_path),
+        "compiled_at": time.time(),
+        "rows": len(ordered),
+        "columns": columns,
+        "text_columns": text_columns,
+        "roles": roles,
+        "arrays": layout,
+        "warnings": {kind: len(lines) for kind, lines in report["warnings"].items()},
+    }).encode("utf-8")
+    data_start = len(MAGIC) + 8 + len(header)
+    data_start += -data_start % _ALIGN
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        f.write(b"\0" * (data_start - f.tell()))
+
+        for name, array in arrays.items():
+            raw = array.tobytes() if isinstance(array, np.ndarray) else array
+            f.write(raw)
+            f.write(b"\0" * (-len(raw) % _ALIGN))
+
+    os.replace(tmp_path, output_path)
+    return report
+
+
+def format_report(report, limit=20):
+    lines = []
+    for level in ("errors", "warnings"):
+        for kind, where in report[level].items():
+            shown = ", ".join(str(w) for w in where[:limit]) + (" ..." if len(where) > limit else "")
+            label = "columns" if kind == "missing columns" else "lines"
+            lines.append(f"{level[:-1]}: {kind} ({len(where)}) - {label} {shown}")
+    return "\n".join(lines)
+
+
+# ------------------ READER ------------------ #
+
+class _Snapshot:
+    """One mapped version of the bank file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a compiled question bank")
+
+        header_len = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 8], "little")
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[header_start:header_start + header_len])
+        if self.header["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"{path} has format {self.header['format_version']}, expected {FORMAT_VERSION}")
+
+        data_start = header_start + header_len
+        data_start += -data_start % _ALIGN
+
+        self._blobs = {}
+        self.arrays = {}
+        for name, spec in self.header["arrays"].items():
+            offset = data_start + spec["offset"]
+            if spec["dtype"] is None:
+                self._blobs[name] = offset
+            else:
+                dtype = np.dtype(spec["dtype"])
+                self.arrays[name] = np.frombuffer(self._mmap, dtype, spec["bytes"] // dtype.itemsize, offset)
+
+        self.rows = self.header["rows"]
+        self.text_columns = set(self.header["text_columns"])
+        self.roles = {entry["role"]: (entry["start"], entry["stop"]) for entry in self.header["roles"]}
+        self._role_starts = sorted((start, role) for role, (start, _) in self.roles.items())
+        self._starts = [start for start, _ in self._role_starts]
+        self._records = {}
+        self._matchers = {}
+        self._lock = threading.Lock()
+
+    def _string(self, column, i):
+        offsets = self.arrays[f"{column}.offsets"]
+        base = self._blobs[f"{column}.data"]
+        return self._mmap[base + int(offsets[i]):base + int(offsets[i + 1])].decode("utf-8")
+
+    def text(self, column, row):
+        if self.arrays[f"{column}.nulls"][row]:
+            return None
+        return self._string(column, row)
+
+    def keywords(self, row):
+        rows = self.arrays["keywords.rows"]
+        return [self._string("keywords", i) for i in range(int(rows[row]), int(rows[row + 1]))]
+
+    def role_of(self, row):
+        return self._role_starts[bisect.bisect_right(self._starts, row) - 1][1]
+
+    def role_records(self, role):
+        # one small view object per question, created once per role and shared by every session
+        records = self._records.get(role)
+        if records is None:
+            start, stop = self.roles.get(role, (0, 0))
+            with self._lock:
+                records = self._records.get(role)
+                if records is None:
+                    records = self._records[role] = tuple(CompiledQuestion(self, row) for row in range(start, stop))
+        return records
+
+    def keyword_matcher(self, row):
+        # compiled on first use, not at load, which only maps the file; dropped with the snapshot
+        matcher = self._matchers.get(row)
+        if matcher is None:
+            matcher = self._matchers.setdefault(row, KeywordMatcher(self.keywords(row)))
+        return matcher
+
+    def find_row(self, role, question_id):
+        if role not in self.roles:
+            return None
+
+        hashes = self.arrays["index.hashes"]
+        rows = self.arrays["index.rows"]
+        target = np.uint64(_key_hash(role, question_id))
+
+        i = int(np.searchsorted(hashes, target))
+        while i < len(hashes) and hashes[i] == target:
+            row = int(rows[i])
+            if self.text("question_id", row) == str(question_id) and self.role_of(row) == role:
+                return row
+            i += 1
+        return None
+
+    def find(self, role, question_id):
+        row = self.find_row(role, question_id)
+        if row is None:
+            return None
+
+        start, _ = self.roles[role]
+        return self.role_records(role)[row - start]
+
+
+class CompiledQuestion(Mapping):
+    """Read-only view of one question; fields are decoded from the mapped file on access."""
+
+    __slots__ = ("_snapshot", "_row")
+
+    def __init__(self, snapshot, row):
+        self._snapshot = snapshot
+        self._row = row
+
+    def __getitem__(self, key):
+        if key == "keywords":
+            return self._snapshot.keywords(self._row)
+        if key == "role":
+            return self._snapshot.role_of(self._row)
+        if key in self._snapshot.text_columns:
+            return self._snapshot.text(key, self._row)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._snapshot.header["columns"])
+
+    def __len__(self):
+        return len(self._snapshot.header["columns"])
+
+    def __repr__(self):
+        return f"CompiledQuestion({dict(self)!r})"
+
+
+class CompiledBank:
+    """
+    ``QuestionBank`` over a compiled ``.qbank`` file.
+
+    Same interface and reload-on-change behaviour; records are
+    ``CompiledQuestion`` views instead of dicts, and keywords come back
+    already split (``parse_keywords`` passes lists through unchanged).
+    """
+
+    def __init__(self, path, reload_interval=1.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.version = 0
+
+        self._mtime = None
+        self._checked_at = 0.0
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Map the file again if it was replaced since the last load."""
+        now = time.monotonic()
+        if not force and self._mtime is not None and now - self._checked_at < self.reload_interval:
+            return
+
+        with self._lock:
+            self._checked_at = now
+            mtime = os.stat(self.path).st_mtime_ns
+
+            if force or mtime != self._mtime:
+                # sessions holding records of the old snapshot keep it mapped
+                self._snapshot = _Snapshot(self.path)
+                self._mtime = mtime
+                self.version += 1
+
+    @property
+    def stamp(self):
+        """The loaded file as ``path@mtime``: unlike ``version``, the same in every process on the host."""
+        self.refresh()
+        return f"{self.path}@{self._mtime}"
+
+    def roles(self):
+        self.refresh()
+        return list(self._snapshot.roles)
+
+    def role_questions(self, role):
+        self.refresh()
+        return self._snapshot.role_records(role)
+
+    def get_question(self, role, question_id):
+        self.refresh()
+        return self._snapshot.find(role, question_id)
+
+    def keyword_matcher(self, role, question_id):
+        """The question's compiled ``KeywordMatcher``, or None if it is not in the bank."""
+        self.refresh()
+        snapshot = self._snapshot
+        row = snapshot.find_row(role, question_id)
+        return snapshot.keyword_matcher(row) if row is not None else None
+
+    def __len__(self):
+        self.refresh()
+        return self._snapshot.rows
+
+
+# ------------------ CLI ------------------ #
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a question-bank CSV and compile it to a .qbank file.")
+    parser.add_argument("csv", help="question bank CSV, e.g. data/questions.csv")
+    parser.add_argument("output", help=f"compiled bank to write (*{SUFFIX})")
+    parser.add_argument("--strict", action="store_true", help="treat warnings as errors")
+    args = parser.parse_args()
+
+    if not is_compiled_bank(args.output):
+        parser.error(f"output must end in {SUFFIX}")
+
+    try:
+        report = compile_bank(args.csv, args.output, strict=args.strict)
+    except BankValidationError as e:
+        print(e, file=sys.stderr)
+        print("compile failed", file=sys.stderr)
+        return 1
+
+    if report["warnings"]:
+        print(format_report(report))
+
+    size = Path(args.output).stat().st_size
+    print(f"wrote {args.output} ({size / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
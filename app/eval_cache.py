@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from app.keyword_matcher import normalize
+from app.metrics import EVAL_CACHE_LOOKUPS_TOTAL
+
+
+def question_digest(ideal_answer, keywords):
+    """Identifies what an answer is graded against, so an edited or ad-hoc question never shares entries."""
+    payload = json.dumps([ideal_answer if isinstance(ideal_answer, str) else None, list(keywords or ())])
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def cache_key(scoring_version, role, question_id, question, cleaned_answer, user_answer):
+    """
+    Key of one grading result.
+
+    The TF-IDF side only sees ``clean_text(user_answer)``, but keyword
+    matching runs on the raw answer with its own normalization, so the key
+    covers both forms: answers that differ in case or spacing share an
+    entry, answers that differ in punctuation do not.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (scoring_version, role, question_id, question, cleaned_answer, normalize(user_answer)):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _copy(result):
+    # callers own what they get back: responses keep the keyword lists
+    return {
+        **result,
+        "matched_keywords": list(result["matched_keywords"]),
+        "missing_keywords": list(result["missing_keywords"]),
+    }
+
+
+# ------------------ SHARED LAYER ------------------ #
+
+class SQLiteResultStore:
+    """
+    Grading results shared by every process on the host through one SQLite
+    (WAL) file. Entries older than the TTL are ignored and purged, and the
+    table is trimmed to the newest ``max_entries`` from time to time.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS evaluations (
+            key       TEXT PRIMARY KEY,
+            result    TEXT NOT NULL,
+            stored_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS evaluations_stored_at ON evaluations (stored_at);
+    """
+
+    def __init__(self, path="data/eval_cache.db", ttl_seconds=3600.0, max_entries=100_000, timeout=1.0):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = threading.local()
+        self._trimmed_at = 0.0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def _conn(self):
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def get(self, key):
+        row = self._conn.execute(
+            "SELECT result FROM evaluations WHERE key = ? AND stored_at >= ?",
+            (key, time.time() - self.ttl_seconds)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, result):
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO evaluations (key, result, stored_at) VALUES (?, ?, ?)",
+            (key, json.dumps(result), now)
+        )
+
+        if now - self._trimmed_at >= min(self.ttl_seconds, 60.0):
+            self._trimmed_at = now
+            self._trim(now)
+
+    def _trim(self, now):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM evaluations WHERE stored_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM evaluations WHERE key IN"
+                " (SELECT key FROM evaluations ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.execute("COMMIT")
+
+    def clear(self):
+        self._conn.execute("DELETE FROM evaluations")
+
+
+# ------------------ CACHE ------------------ #
+
+class EvaluationCache:
+    """
+    Bounded LRU + TTL cache of grading results.
+
+    Lookups check this process's LRU first, then the optional ``shared``
+    store; a shared hit is copied into the LRU. Safe to use from many
+    threads. A failing shared store only costs hits, never a grading.
+    """
+
+    def __init__(self, max_entries=10_000, ttl_seconds=3600.0, shared=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+
+        self._entries = OrderedDict()   # key -> (result, stored_at), LRU first
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[1] < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    EVAL_CACHE_LOOKUPS_TOTAL.labels("memory", "hit").inc()
+                    return _copy(entry[0])
+                del self._entries[key]
+
+        EVAL_CACHE_LOOKUPS_TOTAL.labels("memory", "miss").inc()
+        if self.shared is None:
+            return None
+
+        try:
+            result = self.shared.get(key)
+        except sqlite3.Error:
+            result = None
+
+        EVAL_CACHE_LOOKUPS_TOTAL.labels("shared", "hit" if result is not None else "miss").inc()
+        if result is not None:
+            self._remember(key, result, now)
+            return _copy(result)
+        return None
+
+    def put(self, key, result):
+        self._remember(key, _copy(result), time.monotonic())
+
+        if self.shared is not None:
+            try:
+                self.shared.put(key, result)
+            except sqlite3.Error:
+                pass
+
+    def _remember(self, key, result, now):
+        with self._lock:
+            self._entries[key] = (result, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# ------------------ SHARED INSTANCE ------------------ #
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_evaluation_cache():
+    """
+    The process-wide cache, configured from the environment, or None when
+    ``EVAL_CACHE=0``. ``EVAL_CACHE_DB_PATH`` adds the SQLite layer that
+    every process on the host shares.
+    """
+    global _cache
+
+    if os.environ.get("EVAL_CACHE", "1") in ("0", "false", "no"):
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ttl_seconds = float(os.environ.get("EVAL_CACHE_TTL_SECONDS", 3600))
+                db_path = os.environ.get("EVAL_CACHE_DB_PATH")
+
+                _cache = EvaluationCache(
+                    max_entries=int(os.environ.get("EVAL_CACHE_SIZE", 10_000)),
+                    ttl_seconds=ttl_seconds,
+                    shared=SQLiteResultStore(
+                        db_path,
+                        ttl_seconds=ttl_seconds,
+                        max_entries=int(os.environ.get("EVAL_CACHE_DB_SIZE", 100_000)),
+                    ) if db_path else None,
+                )
+
+    return _cache
@@ -1,11 +1,18 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+from app.eval_cache import cache_key, get_evaluation_cache, question_digest
+from app.keyword_matcher import get_keyword_matcher, normalize  # noqa: F401 - normalize used to live here; re-exported
+from app.metrics import EVALUATIONS_TOTAL, GRADING_STAGE_SECONDS
+from app.similarity import get_similarity_engine
 from utils.text_preprocessing import clean_text
-import math
+import time
 
 
 # ------------------ SIMILARITY ------------------ #
 def compute_similarity(user_answer: str, ideal_answer: str) -> float:
+    # imported on first use: scikit-learn takes over a second to import
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     user_clean = clean_text(user_answer)
     ideal_clean = clean_text(ideal_answer)
 
@@ -18,99 +25,115 @@ def compute_similarity(user_answer: str, ideal_answer: str) -> float:
 
 # ------------------ KEYWORD LOGIC (IMPROVED) ------------------ #
 
-def normalize(text):
-    return (
-        text.lower()
-        .replace(" ", "")
-        .replace("s", "")
-        .replace("ing", "")
-    )
-
+# pass the bank question's bank, role and question_id to reuse its compiled matcher;
+# without them the keywords are compiled for this one call
 
-def keyword_match_score(user_answer, keywords):
-    if not keywords:
-        return 0
-
-    user_norm = normalize(user_answer)
-
-    matched = sum(
-        1 for word in keywords if normalize(word) in user_norm or user_norm in normalize(word)
-    )
+def keyword_match_score(user_answer, keywords, bank=None, role=None, question_id=None):
+    score, _, _ = get_keyword_matcher(keywords, bank, role, question_id).match(user_answer)
+    return score
 
-    return (matched / len(keywords)) * 100
 
+def keyword_match_details(user_answer, keywords, bank=None, role=None, question_id=None):
+    _, matched, missed = get_keyword_matcher(keywords, bank, role, question_id).match(user_answer)
+    return matched, missed
 
-def keyword_match_details(user_answer, keywords):
-    user_norm = normalize(user_answer)
-
-    matched = []
-    missed = []
 
-    for word in keywords:
-        if normalize(word) in user_norm:
-            matched.append(word)
-        else:
-            missed.append(word)
-
-    return matched, missed
+# ------------------ MAIN EVALUATION ------------------ #
+GOOD_FEEDBACK = "Good answer. Core concept is correct."
+PARTIAL_FEEDBACK = "Partial understanding. Add more detail."
+WEAK_FEEDBACK = "Weak answer. Missing key concepts."
 
-def normalize(text):
-    return text.lower().replace(" ", "").replace("s", "")
+GRADING_STAGES = ("clean", "tfidf", "keywords", "feedback")
 
+# bump whenever a change here alters scores, so cached results are not reused
+SCORING_VERSION = 1
 
-# ------------------ MAIN EVALUATION ------------------ #
-def evaluate_answer(user_answer, ideal_answer, keywords):
 
-    # TF-IDF similarity (0–1 → convert to %)
-    if ideal_answer and ideal_answer != "TO_BE_ADDED":
-        similarity = compute_similarity(user_answer, ideal_answer) * 100
-    else:
-        similarity = 0
+def _observe_stages(mode, *timestamps):
+    # consecutive perf_counter() readings, one interval per grading stage
+    for stage, start, end in zip(GRADING_STAGES, timestamps, timestamps[1:]):
+        GRADING_STAGE_SECONDS.labels(stage, mode).observe(end - start)
 
-    # Keyword score (already %)
-    keyword_score = keyword_match_score(user_answer, keywords)
 
-    # Final weighted score
+def combine_scores(similarity, keyword_score):
+    """Final score and confidence (both %) from the similarity and keyword signals."""
+    # prevent semantic mismatch penalty
     final_score = max((0.4 * similarity) + (0.6 * keyword_score), keyword_score)
 
-    # Keyword details
-    matched, missed = keyword_match_details(user_answer, keywords)
-
     # Confidence (based on consistency of scoring signals)
     confidence = (0.7 * similarity) + (0.3 * keyword_score)
 
+    # boost for strong keyword coverage
     if keyword_score >= 60:
+        final_score = max(final_score, 70)
         confidence = max(confidence, 65)
 
+    return min(final_score, 100), confidence
 
-    if keyword_score >= 60:
-        final_score = max(final_score, 60)
 
+def feedback_for(final_score):
+    if final_score >= 70:
+        return GOOD_FEEDBACK
+    if final_score >= 50:
+        return PARTIAL_FEEDBACK
+    return WEAK_FEEDBACK
+
+
+def _cache_key(engine, role, question_id, ideal_answer, keywords, cleaned_answer, user_answer):
+    # bank questions also depend on the fitted model; ad-hoc ones only on their own text
+    in_bank = question_id is not None and role is not None
+    scoring_version = f"{SCORING_VERSION}/{engine.scoring_version if in_bank else 'adhoc'}"
+    question = question_digest(ideal_answer, keywords)
+    return cache_key(scoring_version, role, question_id, question, cleaned_answer, user_answer)
+
+
+def evaluate_answer(user_answer, ideal_answer, keywords, question_id=None, role=None, engine=None):
+    started = time.perf_counter()
+    cleaned_answer = clean_text(user_answer)
+    cleaned = time.perf_counter()
+
+    if question_id is not None and role is not None:
+        engine = engine or get_similarity_engine()
+
+    # repeated answers (retries, resubmits, "I don't know") are served from the cache
+    cache = get_evaluation_cache()
+    key = None
+    if cache is not None:
+        key = _cache_key(engine, role, question_id, ideal_answer, keywords, cleaned_answer, user_answer)
+        result = cache.get(key)
+        if result is not None:
+            EVALUATIONS_TOTAL.labels("single").inc()
+            return result
+
+    # similarity to the ideal answer, TF-IDF or semantic per SCORING_MODE (0–1 → convert to %)
+    if ideal_answer and ideal_answer != "TO_BE_ADDED":
+        similarity = None
 
-    base_score = (0.4 * similarity) + (0.6 * keyword_score)
+        # bank-fitted model with a precomputed ideal vector, when the question is in the bank
+        if question_id is not None and role is not None:
+            similarity = engine.similarity(role, question_id, cleaned_answer, cleaned=True)
 
-    # prevent semantic mismatch penalty
-    final_score = max(base_score, keyword_score)
+        # ad-hoc question: fit on the two documents
+        if similarity is None:
+            similarity = compute_similarity(cleaned_answer, ideal_answer)
 
-    # boost for strong keyword coverage
-    if keyword_score >= 60:
-        final_score = max(final_score, 70)
+        similarity *= 100
+    else:
+        similarity = 0
 
-    final_score = min(final_score, 100)
+    scored = time.perf_counter()
 
-    # Feedback generation
-    if final_score >= 70:
-        feedback = "Good answer. Core concept is correct."
-    elif final_score >= 50:
-        feedback = "Partial understanding. Add more detail."
-    else:
-        feedback = "Weak answer. Missing key concepts."
+    # Keyword score (already %) and details, from one pass over the answer
+    bank = engine.bank if engine is not None else None
+    keyword_score, matched, missed = get_keyword_matcher(keywords, bank, role, question_id).match(user_answer)
+    matched_at = time.perf_counter()
 
-    print("SIM:", similarity)
-    print("KEY:", keyword_score)
-    print("FINAL:", final_score)
+    final_score, confidence = combine_scores(similarity, keyword_score)
 
-    return {
+    # Feedback generation
+    feedback = feedback_for(final_score)
+
+    result = {
         "score": round(final_score, 2),
         "confidence": round(confidence, 2),
         "keyword_match": round(keyword_score, 2),
@@ -118,4 +141,140 @@ def evaluate_answer(user_answer, ideal_answer, keywords):
         "missing_keywords": missed,
         "feedback": feedback
     }
-    
\ No newline at end of file
+
+    if key is not None:
+        cache.put(key, result)
+
+    _observe_stages("single", started, cleaned, scored, matched_at, time.perf_counter())
+    EVALUATIONS_TOTAL.labels("single").inc()
+    return result
+
+
+# ------------------ BATCH EVALUATION ------------------ #
+def evaluate_answers_batch(user_answers, ideal_answers, keywords_list, question_ids=None, roles=None, engine=None):
+    """
+    Grade many answers at once; returns the same dicts as ``evaluate_answer``.
+
+    ``roles`` may be a single role for the whole batch or one per answer.
+    Answers to bank questions are scored per role in one vectorized pass;
+    the threshold rules run as array operations over the whole batch.
+    """
+    started = time.perf_counter()
+    n = len(user_answers)
+    question_ids = question_ids if question_ids is not None else [None] * n
+    roles = roles if isinstance(roles, (list, tuple)) else [roles] * n
+
+    cleaned_answers = [clean_text(user_answer) for user_answer in user_answers]
+    cleaned = time.perf_counter()
+
+    if any(question_ids[i] is not None and roles[i] is not None for i in range(n)):
+        engine = engine or get_similarity_engine()
+
+    # answers seen before come from the cache; only the rest are graded
+    cache = get_evaluation_cache()
+    results = [None] * n
+    keys = [None] * n
+
+    if cache is not None:
+        for i in range(n):
+            keys[i] = _cache_key(engine, roles[i], question_ids[i], ideal_answers[i], keywords_list[i],
+                                 cleaned_answers[i], user_answers[i])
+            results[i] = cache.get(keys[i])
+
+    todo = [i for i in range(n) if results[i] is None]
+    if todo:
+        graded, (scored, matched_at) = _grade_batch(
+            [user_answers[i] for i in todo],
+            [cleaned_answers[i] for i in todo],
+            [ideal_answers[i] for i in todo],
+            [keywords_list[i] for i in todo],
+            [question_ids[i] for i in todo],
+            [roles[i] for i in todo],
+            engine
+        )
+        for i, result in zip(todo, graded):
+            results[i] = result
+            if cache is not None:
+                cache.put(keys[i], result)
+
+        _observe_stages("batch", started, cleaned, scored, matched_at, time.perf_counter())
+
+    EVALUATIONS_TOTAL.labels("batch").inc(n)
+    return results
+
+
+def _grade_batch(user_answers, cleaned_answers, ideal_answers, keywords_list, question_ids, roles, engine):
+    # the uncached part of evaluate_answers_batch; also returns its stage timestamps
+    n = len(user_answers)
+
+    # TF-IDF similarity (0–1), grouped per role so each role is one transform
+    similarity = np.zeros(n)
+    by_role = {}
+    ad_hoc = []
+
+    for i, ideal_answer in enumerate(ideal_answers):
+        if not (ideal_answer and ideal_answer != "TO_BE_ADDED"):
+            continue
+
+        if question_ids[i] is not None and roles[i] is not None:
+            by_role.setdefault(roles[i], []).append(i)
+        else:
+            ad_hoc.append(i)
+
+    for role, items in by_role.items():
+        model = engine.model(role)
+        known = [i for i in items if model is not None and question_ids[i] in model]
+        ad_hoc.extend(i for i in items if model is None or question_ids[i] not in model)
+
+        if known:
+            similarity[known] = model.similarities(
+                [question_ids[i] for i in known],
+                [cleaned_answers[i] for i in known],
+                cleaned=True
+            )
+
+    for i in ad_hoc:
+        similarity[i] = compute_similarity(cleaned_answers[i], ideal_answers[i])
+
+    similarity *= 100
+    scored = time.perf_counter()
+
+    # keyword coverage (%) with matched/missed lists, one pass per answer
+    bank = engine.bank if engine is not None else None
+    keyword_matches = [
+        get_keyword_matcher(keywords, bank, role, question_id).match(user_answer)
+        for user_answer, keywords, role, question_id in zip(user_answers, keywords_list, roles, question_ids)
+    ]
+    keyword_score = np.array([match[0] for match in keyword_matches], dtype=np.float64)
+    matched_at = time.perf_counter()
+
+    # same rules as evaluate_answer, over the whole batch
+    strong_keywords = keyword_score >= 60
+
+    final_score = np.maximum((0.4 * similarity) + (0.6 * keyword_score), keyword_score)
+    final_score = np.where(strong_keywords, np.maximum(final_score, 70), final_score)
+    final_score = np.minimum(final_score, 100)
+
+    confidence = (0.7 * similarity) + (0.3 * keyword_score)
+    confidence = np.where(strong_keywords, np.maximum(confidence, 65), confidence)
+
+    feedback = np.select(
+        [final_score >= 70, final_score >= 50],
+        [GOOD_FEEDBACK, PARTIAL_FEEDBACK],
+        WEAK_FEEDBACK
+    )
+
+    results = []
+    for i in range(n):
+        _, matched, missed = keyword_matches[i]
+
+        results.append({
+            "score": round(float(final_score[i]), 2),
+            "confidence": round(float(confidence[i]), 2),
+            "keyword_match": round(float(keyword_score[i]), 2),
+            "matched_keywords": matched,
+            "missing_keywords": missed,
+            "feedback": str(feedback[i])
+        })
+
+    return results, (scored, matched_at)
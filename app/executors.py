@@ -0,0 +1,19 @@
+from concurrent.futures import Executor, Future
+
+
+class InlineExecutor(Executor):
+    """
+    ``Executor`` that runs each call in the calling thread, at ``submit``.
+
+    Stands in for a process pool when the CLIs run with ``--workers 0``
+    (debugging, tiny inputs): the driver code stays the same, only nothing
+    runs in parallel.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
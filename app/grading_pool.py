@@ -0,0 +1,164 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.evaluator import evaluate_answer, evaluate_answers_batch
+from app.metrics import EVAL_CACHE_LOOKUPS_TOTAL, EVALUATIONS_TOTAL, GRADING_STAGE_SECONDS
+from app.profiling import current_capture, profiled_call
+from app.question_bank import DEFAULT_BANK_PATH, get_question_bank
+from app.similarity import get_similarity_engine
+
+
+# ------------------ WORKER SIDE ------------------ #
+
+def _warm_worker(bank_path):
+    # load the bank and fit every role's model before the first real request
+    bank = get_question_bank(bank_path)
+    engine = get_similarity_engine(bank)
+    for role in bank.roles():
+        engine.model(role)
+
+
+def _ping():
+    return os.getpid()
+
+
+# grading metrics recorded in a worker travel back with each result
+_WORKER_METRICS = (GRADING_STAGE_SECONDS, EVALUATIONS_TOTAL, EVAL_CACHE_LOOKUPS_TOTAL)
+
+
+def _drain_metrics():
+    return [metric.drain() for metric in _WORKER_METRICS]
+
+
+def _merge_metrics(drained):
+    for metric, state in zip(_WORKER_METRICS, drained):
+        metric.merge(state)
+
+
+def _grade(user_answer, ideal_answer, keywords, question_id, role):
+    result = evaluate_answer(user_answer, ideal_answer, keywords, question_id=question_id, role=role)
+    return result, _drain_metrics()
+
+
+def _grade_batch(user_answers, ideal_answers, keywords_list, question_ids, role):
+    results = evaluate_answers_batch(user_answers, ideal_answers, keywords_list, question_ids=question_ids, roles=role)
+    return results, _drain_metrics()
+
+
+# ------------------ POOL ------------------ #
+
+class GradingPool:
+    """
+    Runs CPU-bound grading off the event loop.
+
+    ``kind="process"`` sidesteps the GIL with a pool of warm worker
+    processes, each holding its own question bank and TF-IDF models;
+    ``kind="thread"`` shares this process's models instead. With
+    ``warm=False`` nothing is loaded up front: workers start on the first
+    submit and fit each role's model when it is first graded.
+    """
+
+    def __init__(self, kind="process", workers=None, bank_path=DEFAULT_BANK_PATH, min_batch_chunk=64, warm=True):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown grading executor {kind!r}")
+
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.bank_path = bank_path
+        self.min_batch_chunk = min_batch_chunk
+        self.warm = warm
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._executor is not None:
+                return
+
+            if self.kind == "process":
+                # spawn, not fork: the server already runs threads when the pool starts
+                executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker if self.warm else None,
+                    initargs=(self.bank_path,) if self.warm else ()
+                )
+                # make every worker start (and warm up) now, not on the first submits
+                if self.warm:
+                    for future in [executor.submit(_ping) for _ in range(self.workers)]:
+                        future.result()
+            else:
+                if self.warm:
+                    _warm_worker(self.bank_path)
+                executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="grading")
+
+            self._executor = executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    async def _run(self, fn, *args):
+        if self._executor is None:
+            await asyncio.get_running_loop().run_in_executor(None, self.start)
+
+        # a profiled request is profiled where the grading actually runs
+        capture = current_capture()
+        if capture is not None:
+            (result, drained), captured = await asyncio.get_running_loop().run_in_executor(
+                self._executor, profiled_call, capture.mode, fn, *args
+            )
+            capture.add(captured)
+        else:
+            result, drained = await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+        _merge_metrics(drained)
+        return result
+
+    async def evaluate(self, user_answer, ideal_answer, keywords, question_id=None, role=None):
+        return await self._run(_grade, user_answer, ideal_answer, keywords, question_id, role)
+
+    async def evaluate_batch(self, user_answers, ideal_answers, keywords_list, question_ids, roles):
+        """``evaluate_answers_batch`` split into chunks that grade in parallel."""
+        n = len(user_answers)
+        if n == 0:
+            return []
+
+        roles = roles if isinstance(roles, (list, tuple)) else [roles] * n
+        size = max(self.min_batch_chunk, math.ceil(n / self.workers))
+
+        chunks = await asyncio.gather(*[
+            self._run(
+                _grade_batch,
+                user_answers[i:i + size],
+                ideal_answers[i:i + size],
+                keywords_list[i:i + size],
+                question_ids[i:i + size],
+                roles[i:i + size]
+            )
+            for i in range(0, n, size)
+        ])
+
+        return [result for chunk in chunks for result in chunk]
+
+
+def fast_start():
+    """``FAST_START=1``: skip eager warm-up, for short-lived processes that may never grade."""
+    return os.environ.get("FAST_START", "0") in ("1", "true", "yes")
+
+
+def grading_pool_from_env():
+    """``GRADING_EXECUTOR`` (process|thread), ``GRADING_WORKERS`` and ``FAST_START`` configure the pool."""
+    workers = os.environ.get("GRADING_WORKERS")
+    return GradingPool(
+        kind=os.environ.get("GRADING_EXECUTOR", "process"),
+        workers=int(workers) if workers else None,
+        warm=not fast_start(),
+    )
@@ -0,0 +1,175 @@
+from collections import deque
+
+
+# Below this many distinct keywords, one C-level substring scan per keyword
+# beats walking the automaton character by character in Python.
+AUTOMATON_MIN_PATTERNS = 256
+
+
+def normalize(text):
+    return text.lower().replace(" ", "").replace("s", "")
+
+
+# ------------------ AHO-CORASICK ------------------ #
+
+def _build_automaton(patterns):
+    goto = [{}]
+    output = [[]]
+
+    for pattern in patterns:
+        state = 0
+        for ch in pattern:
+            next_state = goto[state].get(ch)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][ch] = next_state
+                goto.append({})
+                output.append([])
+            state = next_state
+        output[state].append(pattern)
+
+    # breadth-first failure links; outputs inherit their failure state's outputs
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+
+    while queue:
+        state = queue.popleft()
+        for ch, next_state in goto[state].items():
+            queue.append(next_state)
+
+            failure = fail[state]
+            while failure and ch not in goto[failure]:
+                failure = fail[failure]
+
+            fail[next_state] = goto[failure].get(ch, 0)
+            output[next_state] = output[next_state] + output[fail[next_state]]
+
+    return goto, fail, output
+
+
+class KeywordMatcher:
+    """
+    A question's keyword list compiled once into a multi-pattern matcher.
+
+    ``match`` normalizes the answer once and returns the keyword score with
+    the matched and missed keywords from the same pass.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self.patterns = [normalize(word) for word in self.keywords]
+
+        distinct = {pattern for pattern in self.patterns if pattern}
+        self._always = "" in self.patterns
+        self._distinct = sorted(distinct)
+        self._automaton = _build_automaton(self._distinct) if len(distinct) >= AUTOMATON_MIN_PATTERNS else None
+
+    def _found(self, text):
+        if self._automaton is None:
+            return {pattern for pattern in self._distinct if pattern in text}
+
+        goto, fail, output = self._automaton
+        remaining = len(self._distinct)
+        found = set()
+        state = 0
+
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            if output[state]:
+                found.update(output[state])
+                if len(found) == remaining:
+                    break
+
+        return found
+
+    def match(self, user_answer):
+        """Return ``(score, matched, missed)`` with the score in %."""
+        if not self.keywords:
+            return 0, [], []
+
+        return self.result(self._found(normalize(user_answer)))
+
+    def result(self, found):
+        """``(score, matched, missed)`` given the set of normalized patterns found."""
+        if not self.keywords:
+            return 0, [], []
+
+        if self._always:
+            found = found | {""}
+
+        matched = []
+        missed = []
+
+        for word, pattern in zip(self.keywords, self.patterns):
+            if pattern in found:
+                matched.append(word)
+            else:
+                missed.append(word)
+
+        return (len(matched) / len(self.keywords)) * 100, matched, missed
+
+    def stream(self):
+        """A ``KeywordStream`` for matching an answer that arrives in pieces."""
+        return KeywordStream(self)
+
+
+class KeywordStream:
+    """
+    ``KeywordMatcher.match`` over text that arrives in pieces.
+
+    ``normalize`` works character by character, so each ``feed`` only
+    normalizes and scans the new piece: the automaton carries on from the
+    state the previous piece left it in, and the substring scan also looks
+    at the last few characters before the piece, so keywords split across
+    two pieces are still found.
+    """
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.found = set()
+        self._state = 0
+        self._window = ""
+        self._overlap = max((len(pattern) for pattern in matcher._distinct), default=1) - 1
+
+    def feed(self, text):
+        text = normalize(text)
+        matcher = self.matcher
+
+        if matcher._automaton is not None:
+            goto, fail, output = matcher._automaton
+            state = self._state
+            for ch in text:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                if output[state]:
+                    self.found.update(output[state])
+            self._state = state
+            return
+
+        window = self._window + text
+        for pattern in matcher._distinct:
+            if pattern not in self.found and pattern in window:
+                self.found.add(pattern)
+        self._window = window[-self._overlap:] if self._overlap else ""
+
+    def result(self):
+        return self.matcher.result(self.found)
+
+
+def get_keyword_matcher(keywords, bank=None, role=None, question_id=None):
+    """
+    Matcher for ``keywords``. A bank question's matcher is compiled with the
+    bank's snapshot and shared by every answer to it; it is used when
+    ``(role, question_id)`` is in ``bank`` with these keywords. Anything
+    else (ad-hoc questions, edited keyword lists) is compiled on the spot.
+    """
+    if bank is not None and role is not None and question_id is not None:
+        matcher = bank.keyword_matcher(role, question_id)
+        if matcher is not None and matcher.keywords == list(keywords):
+            return matcher
+
+    return KeywordMatcher(keywords)
@@ -0,0 +1,178 @@
+import re
+
+from app.evaluator import combine_scores, feedback_for
+from app.keyword_matcher import get_keyword_matcher
+from app.metrics import LIVE_SCORING_MESSAGES_TOTAL
+from app.session import parse_keywords
+from app.similarity import get_similarity_engine, has_ideal_answer, tokenize
+
+
+MAX_ANSWER_CHARS = 20_000
+
+# the run of non-whitespace at the end of the text: the word still being typed
+_LAST_WORD = re.compile(r"\S*\Z")
+
+
+class LiveScorer:
+    """
+    Provisional score of one answer while it is being typed.
+
+    ``append`` only touches the new text: keywords go through a
+    ``KeywordStream`` and finished words update the running similarity
+    (TF-IDF or semantic, whichever the engine uses). The last word stays
+    pending until whitespace follows it, since more letters may still come.
+    Ad-hoc questions, which are not in the bank, have no precomputed ideal
+    vector; their provisional score counts keywords only.
+    """
+
+    def __init__(self, ideal_answer, keywords, question_id=None, role=None, engine=None):
+        self.question_id = question_id
+        self.keywords = parse_keywords(keywords)
+        self.similarity = None
+
+        engine = engine or get_similarity_engine()
+        self.keyword_stream = get_keyword_matcher(self.keywords, engine.bank, role, question_id).stream()
+
+        if has_ideal_answer(ideal_answer) and question_id is not None and role is not None:
+            model = engine.model(role)
+            if model is not None and question_id in model:
+                self.similarity = model.running(question_id)
+
+        self.chars = 0
+        self._pending = ""
+
+    def append(self, text):
+        self.chars += len(text)
+        self.keyword_stream.feed(text)
+
+        if self.similarity is not None:
+            text = self._pending + text
+            last_word = _LAST_WORD.search(text)
+            self._pending = last_word.group()
+            for token in tokenize(text[:last_word.start()]):
+                self.similarity.add(token)
+
+    def snapshot(self):
+        keyword_score, matched, missed = self.keyword_stream.result()
+
+        similarity = None
+        if self.similarity is not None:
+            pending = tokenize(self._pending)
+            similarity = self.similarity.value(pending[0] if pending else None) * 100
+
+        final_score, confidence = combine_scores(similarity or 0, keyword_score)
+
+        return {
+            "question_id": self.question_id,
+            "provisional_score": round(final_score, 2),
+            "confidence": round(confidence, 2),
+            "similarity": round(similarity, 2) if similarity is not None else None,
+            "keyword_match": round(keyword_score, 2),
+            "matched_keywords": matched,
+            "missing_keywords": missed,
+            "feedback": feedback_for(final_score),
+            "chars": self.chars,
+        }
+
+
+def _is_question_id(value):
+    # bank ids are strings or integers; bools are ints to Python, but not ids
+    return isinstance(value, (str, int)) and not isinstance(value, bool)
+
+
+def _question_error(question):
+    # question_data comes straight from the client, so check the fields the scorer reads
+    if not isinstance(question, dict):
+        return "question_data must be an object"
+
+    if question.get("question_id") is not None and not _is_question_id(question["question_id"]):
+        return "question_data.question_id must be a string or an integer"
+
+    keywords = question.get("keywords")
+    if not (keywords is None or isinstance(keywords, str)
+            or isinstance(keywords, list) and all(isinstance(k, str) for k in keywords)):
+        return "question_data.keywords must be a string or a list of strings"
+
+    return None
+
+
+class LiveConnection:
+    """
+    Message handling for one live-scoring connection of a session.
+
+    Messages are JSON objects:
+
+    - ``{"question_id": ...}`` or ``{"question_data": {...}}`` starts a new answer
+    - ``{"append": "..."}`` adds typed text
+    - ``{"replace": "..."}`` restarts the answer from the given text (edits, deletions)
+
+    Each one is answered with the current ``LiveScorer.snapshot()`` or an
+    ``{"error": ...}``.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.scorer = None
+        self._question = None
+
+    def _start(self, question):
+        self._question = question
+        self.scorer = LiveScorer(
+            question.get("ideal_answer"),
+            question.get("keywords", ""),
+            question_id=question.get("question_id"),
+            role=self.session.role,
+            engine=self.session.engine,
+        )
+
+    def handle(self, message):
+        """Apply one message; returns the reply. Fits the role's model on first use, so run it off the event loop."""
+        if not isinstance(message, dict):
+            return self._error("Expected a JSON object")
+
+        if "question_id" in message or "question_data" in message:
+            question = message.get("question_data")
+            if question is None:
+                question_id = message.get("question_id")
+                if not _is_question_id(question_id):
+                    return self._error("question_id must be a string or an integer")
+
+                question = self.session.bank.get_question(self.session.role, question_id)
+                if question is None:
+                    return self._error(f"Unknown question_id {question_id!r}")
+            else:
+                error = _question_error(question)
+                if error:
+                    return self._error(error)
+
+            self._start(question)
+            LIVE_SCORING_MESSAGES_TOTAL.labels("question").inc()
+            return self.scorer.snapshot()
+
+        if self.scorer is None:
+            return self._error("Send question_id or question_data first")
+
+        if "replace" in message:
+            kind, text = "replace", message["replace"]
+        elif "append" in message:
+            kind, text = "append", message["append"]
+        else:
+            return self._error("Unknown message")
+
+        if not isinstance(text, str):
+            return self._error(f"{kind} must be a string")
+
+        if kind == "replace":
+            if len(text) > MAX_ANSWER_CHARS:
+                return self._error("Answer too long")
+            self._start(self._question)
+        elif self.scorer.chars + len(text) > MAX_ANSWER_CHARS:
+            return self._error("Answer too long")
+
+        self.scorer.append(text)
+        LIVE_SCORING_MESSAGES_TOTAL.labels(kind).inc()
+        return self.scorer.snapshot()
+
+    def _error(self, message):
+        LIVE_SCORING_MESSAGES_TOTAL.labels("error").inc()
+        return {"error": message}
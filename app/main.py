@@ -4,11 +4,18 @@ df = pd.read_csv("data/questions.csv")
 
 print(df)
 
-from app.evaluator import evaluate_response
+from app.evaluator import evaluate_answer
+from app.question_bank import get_question_bank
+from app.session import parse_keywords
 
-result = evaluate_response(
+question = get_question_bank().get_question("Data Scientist", "Q5")
+
+result = evaluate_answer(
+    "Overfitting happens when a model memorizes training data and fails on new data",
+    question["ideal_answer"],
+    parse_keywords(question["keywords"]),
     question_id="Q5",
-    user_answer="Overfitting happens when a model memorizes training data and fails on new data"
+    role="Data Scientist"
 )
 
 print(result)
@@ -18,13 +25,12 @@ from app.session import InterviewSession
 session = InterviewSession(role="Data Scientist")
 
 for i in range(3):
-    q = session.get_question(i)
-    print("\nQuestion:", q["question_text"])
+    q = session.get_next_question()
+    print("\nQuestion:", q["question"])
 
-    result = session.submit_answer(
-        question_id=q["question_id"],
-        topic=q["topic"],
-        user_answer="This is a sample answer for testing"
+    result = session.evaluate_answer(
+        "This is a sample answer for testing",
+        q
     )
 
     print("Evaluation:", result)
@@ -32,7 +38,7 @@ for i in range(3):
 print("\nAll responses stored:")
 print(session.get_all_responses())
 
-from app.evaluator import PerformanceAnalyzer
+from app.analytics import PerformanceAnalyzer
 
 evaluation_results = session.get_all_responses()
 
@@ -0,0 +1,362 @@
+import bisect
+import threading
+import time
+
+
+# Prometheus' default latency buckets (seconds), extended down to 100µs for grading stages
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ------------------ METRIC TYPES ------------------ #
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *values):
+        """The child series for these label values (created on first use)."""
+        values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _lines(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._lines())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set(self, value):
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def drain(self):
+        """Take (and reset) every series, as ``{labels: value}``; see ``merge``."""
+        drained = {}
+        for values, child in list(self._children.items()):
+            with child._lock:
+                value, child.value = child.value, 0
+            if value:
+                drained[values] = value
+        return drained
+
+    def merge(self, drained):
+        """Add series taken with ``drain`` (e.g. in a worker process) into this counter."""
+        for values, value in drained.items():
+            self.labels(*values).inc(value)
+
+    def _lines(self):
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class Gauge(_Metric):
+    """A value that goes up and down; with ``function`` it is read at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, function=None):
+        super().__init__(name, documentation, labelnames, registry)
+        self.function = function
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def dec(self, amount=1):
+        self.labels().dec(amount)
+
+    def _lines(self):
+        if self.function is not None:
+            yield f"{self.name} {_format_value(self.function())}"
+            return
+
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def time(self):
+        return _Timer(self)
+
+    def drain(self):
+        with self._lock:
+            counts, total = self.counts, self.sum
+            self.counts = [0] * len(counts)
+            self.sum = 0.0
+        return counts, total
+
+    def merge(self, counts, total):
+        with self._lock:
+            for i, count in enumerate(counts):
+                self.counts[i] += count
+            self.sum += total
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def drain(self):
+        """Take (and reset) every series, as ``{labels: (counts, sum)}``; see ``merge``."""
+        return {
+            values: state
+            for values, child in list(self._children.items())
+            if any((state := child.drain())[0])
+        }
+
+    def merge(self, drained):
+        """Add series taken with ``drain`` (e.g. in a worker process) into this histogram."""
+        for values, (counts, total) in drained.items():
+            self.labels(*values).merge(counts, total)
+
+    def _lines(self):
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}"
+
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+# ------------------ REGISTRY ------------------ #
+
+class Registry:
+    """
+    Named metrics rendered in the Prometheus text format.
+
+    Recording only updates counters in memory; nothing is formatted until
+    ``render`` runs for a scrape.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name!r} is already registered")
+            self._metrics[metric.name] = metric
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render(registry=REGISTRY):
+    return registry.render()
+
+
+# ------------------ APPLICATION METRICS ------------------ #
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests by route",
+    ["method", "route"],
+)
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code",
+    ["method", "route", "status"],
+)
+
+GRADING_STAGE_SECONDS = Histogram(
+    "grading_stage_duration_seconds",
+    "Time spent in each grading stage (clean, tfidf, keywords, feedback); batch mode observes once per batch",
+    ["stage", "mode"],
+)
+
+EVALUATIONS_TOTAL = Counter(
+    "evaluations_total",
+    "Answers graded",
+    ["mode"],
+)
+
+EVAL_CACHE_LOOKUPS_TOTAL = Counter(
+    "evaluation_cache_lookups_total",
+    "Evaluation cache lookups by layer (memory|shared) and result (hit|miss)",
+    ["layer", "result"],
+)
+
+SESSIONS_STARTED_TOTAL = Counter(
+    "sessions_started_total",
+    "Interview sessions started",
+)
+
+REPORT_EXPORTS_TOTAL = Counter(
+    "report_exports_total",
+    "Reports rendered, by format, delivery (job|stream) and outcome",
+    ["format", "delivery", "status"],
+)
+
+REPORT_RENDER_SECONDS = Histogram(
+    "report_render_duration_seconds",
+    "Time to render one report",
+    ["format"],
+)
+
+LIVE_SCORING_CONNECTIONS = Gauge(
+    "live_scoring_connections",
+    "Open live-scoring WebSocket connections",
+)
+
+LIVE_SCORING_MESSAGES_TOTAL = Counter(
+    "live_scoring_messages_total",
+    "Live-scoring messages handled, by kind (question|append|replace|error)",
+    ["kind"],
+)
+
+
+# ------------------ ASGI MIDDLEWARE ------------------ #
+
+class MetricsMiddleware:
+    """
+    Records latency and status of every HTTP request.
+
+    Requests are labelled with the matched route's path template (e.g.
+    ``/reports/{job_id}``), never the raw path, so the number of series
+    stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(scope["method"], path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS_TOTAL.labels(scope["method"], path, status[0]).inc()
@@ -0,0 +1,277 @@
+import asyncio
+import contextvars
+import cProfile
+import os
+import pstats
+import random
+import re
+import secrets
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+
+MODES = ("cpu", "memory")
+EXTENSIONS = {"cpu": "prof", "memory": "txt"}
+
+# the capture of the request being handled, if it is profiled
+_capture = contextvars.ContextVar("profile_capture", default=None)
+
+
+def current_capture():
+    """The active ``ProfileCapture`` for this request, or None."""
+    return _capture.get()
+
+
+# ------------------ WORKER SIDE ------------------ #
+
+class _Stats:
+    # pstats.Stats accepts any object with ``create_stats`` and ``stats``
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def profiled_call(mode, fn, *args):
+    """
+    Run ``fn(*args)`` under a profiler; returns ``(result, captured)``.
+
+    Top-level so it can run in a grading worker process: ``captured`` is
+    the raw cProfile stats dict (cpu) or, for memory, the peak traced size
+    plus ``(size, count, where)`` lines of the allocations still alive when
+    ``fn`` returned; both are plain data that pickle cleanly.
+    """
+    if mode == "cpu":
+        profiler = cProfile.Profile()
+        result = profiler.runcall(fn, *args)
+        profiler.create_stats()
+        return result, profiler.stats
+
+    # tracemalloc is process-wide, so a trace already running is left alone
+    if tracemalloc.is_tracing():
+        return fn(*args), None
+
+    tracemalloc.start(25)
+    try:
+        result = fn(*args)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    allocations = [
+        (stat.size, stat.count, "\n".join(stat.traceback.format(limit=8)))
+        for stat in snapshot.statistics("traceback")[:50]
+    ]
+    return result, (peak, allocations)
+
+
+# ------------------ CAPTURE ------------------ #
+
+class ProfileCapture:
+    """Everything profiled for one request: the event loop's share plus each grading call."""
+
+    def __init__(self, mode, label):
+        self.mode = mode
+        self.label = label
+        self.started_at = time.time()
+        self.loop_profiler = None
+        self._worker_stats = []
+        self._peaks = []
+        self._allocations = []
+
+    def add(self, captured):
+        if captured is None:
+            return
+        if self.mode == "cpu":
+            self._worker_stats.append(captured)
+        else:
+            peak, allocations = captured
+            self._peaks.append(peak)
+            self._allocations.extend(allocations)
+
+    def render(self, path):
+        """Write the capture to ``path``; False if nothing was captured."""
+        if self.mode == "cpu":
+            sources = ([self.loop_profiler] if self.loop_profiler is not None else []) + [
+                _Stats(stats) for stats in self._worker_stats
+            ]
+            if not sources:
+                return False
+
+            stats = pstats.Stats(sources[0])
+            for source in sources[1:]:
+                stats.add(source)
+            stats.dump_stats(str(path))
+            return True
+
+        if not self._peaks:
+            return False
+
+        lines = [
+            f"# {self.label}: allocations while grading",
+            f"# peak traced memory per grading call: {', '.join(f'{peak / 1024:.1f} KiB' for peak in self._peaks)}",
+            "# still allocated when grading returned, largest first:",
+            "",
+        ]
+        for size, count, where in sorted(self._allocations, reverse=True):
+            lines.append(f"{size / 1024:.1f} KiB in {count} blocks")
+            lines.append(where)
+            lines.append("")
+        Path(path).write_text("\n".join(lines), encoding="utf-8")
+        return True
+
+
+# ------------------ STORAGE ------------------ #
+
+class ProfileStore:
+    """Saved profiles in one directory, keeping only the newest ``max_files``."""
+
+    def __init__(self, directory="outputs/profiles", max_files=50):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def save(self, capture):
+        label = re.sub(r"[^A-Za-z0-9]+", "_", capture.label).strip("_") or "request"
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(capture.started_at))
+        name = f"{stamp}-{label}-{uuid.uuid4().hex[:8]}.{EXTENSIONS[capture.mode]}"
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not capture.render(self.directory / name):
+            return None
+
+        with self._lock:
+            for old in self._files()[self.max_files:]:
+                old.unlink(missing_ok=True)
+        return name
+
+    def _files(self):
+        # newest first
+        files = [path for path in self.directory.glob("*") if path.suffix[1:] in EXTENSIONS.values()]
+        return sorted(files, key=lambda path: path.stat().st_mtime, reverse=True)
+
+    def list(self):
+        if not self.directory.exists():
+            return []
+        return [
+            {"name": path.name, "bytes": path.stat().st_size, "created_at": path.stat().st_mtime}
+            for path in self._files()
+        ]
+
+    def path(self, name):
+        """Path of a saved profile, or None (names are only ever matched, never joined blindly)."""
+        if not self.directory.exists():
+            return None
+        for path in self._files():
+            if path.name == name:
+                return path
+        return None
+
+
+# ------------------ ASGI MIDDLEWARE ------------------ #
+
+def token_matches(supplied, token):
+    """Constant-time admin token check; a missing header or unset token never matches."""
+    if supplied is None or token is None:
+        return False
+    if isinstance(supplied, str):
+        supplied = supplied.encode()
+    return secrets.compare_digest(supplied, token.encode())
+
+
+class ProfilingMiddleware:
+    """
+    Profiles flagged or sampled HTTP requests.
+
+    A request is profiled when it carries ``X-Profile: cpu|memory`` plus
+    the matching ``X-Admin-Token`` (never, without a ``token``) or when it
+    is picked by ``sample_rate``. Only install this when profiling is enabled; without
+    it nothing on the request path changes.
+    """
+
+    def __init__(self, app, store, sample_rate=0.0, sample_mode="cpu", token=None, skip_prefixes=()):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.sample_mode = sample_mode
+        self.token = token
+        self.skip_prefixes = tuple(skip_prefixes)
+        self._loop_profiling = False
+
+    def _mode(self, scope):
+        headers = dict(scope["headers"])
+        mode = headers.get(b"x-profile", b"").decode().lower()
+
+        if mode in MODES:
+            if token_matches(headers.get(b"x-admin-token"), self.token):
+                return mode
+            return None
+
+        if self.sample_rate and random.random() < self.sample_rate:
+            return self.sample_mode
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.skip_prefixes):
+            return await self.app(scope, receive, send)
+
+        mode = self._mode(scope)
+        if mode is None:
+            return await self.app(scope, receive, send)
+
+        capture = ProfileCapture(mode, f"{scope['method']} {scope['path']}")
+        token = _capture.set(capture)
+
+        # cProfile covers one thread; only one request at a time profiles the event loop
+        # (coroutines of other requests interleaved on it show up in that profile too)
+        if mode == "cpu" and not self._loop_profiling:
+            self._loop_profiling = True
+            capture.loop_profiler = cProfile.Profile()
+            capture.loop_profiler.enable()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if capture.loop_profiler is not None:
+                capture.loop_profiler.disable()
+                self._loop_profiling = False
+            _capture.reset(token)
+            await asyncio.get_running_loop().run_in_executor(None, self.store.save, capture)
+
+
+def profiling_from_env():
+    """
+    ``PROFILING=1`` turns profiling on; returns the middleware options, or None when off.
+
+    ``PROFILE_SAMPLE_RATE`` (0-1) and ``PROFILE_SAMPLE_MODE`` (cpu|memory)
+    pick requests at random, ``PROFILE_DIR`` / ``PROFILE_MAX_FILES`` bound
+    the saved files and ``PROFILE_ADMIN_TOKEN``, which is required, guards
+    both the header and the admin endpoints.
+    """
+    if os.environ.get("PROFILING", "0") not in ("1", "true", "yes"):
+        return None
+
+    # profiles expose code paths and request timings: never serve them unauthenticated
+    token = os.environ.get("PROFILE_ADMIN_TOKEN")
+    if not token:
+        raise ValueError("PROFILING=1 requires PROFILE_ADMIN_TOKEN")
+
+    sample_mode = os.environ.get("PROFILE_SAMPLE_MODE", "cpu")
+    if sample_mode not in MODES:
+        raise ValueError(f"Unknown PROFILE_SAMPLE_MODE {sample_mode!r}")
+
+    return {
+        "store": ProfileStore(
+            os.environ.get("PROFILE_DIR", "outputs/profiles"),
+            max_files=int(os.environ.get("PROFILE_MAX_FILES", 50)),
+        ),
+        "sample_rate": float(os.environ.get("PROFILE_SAMPLE_RATE", 0)),
+        "sample_mode": sample_mode,
+        "token": token,
+    }
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+
+from app.compiled_bank import CompiledBank, is_compiled_bank
+from app.keyword_matcher import KeywordMatcher
+
+# a CSV, or a compiled .qbank file (see app/compiled_bank.py)
+DEFAULT_BANK_PATH = os.environ.get("QUESTION_BANK_PATH", "data/questions.csv")
+
+
+class QuestionBank:
+    """
+    Question bank shared by every session in the process.
+
+    The CSV is parsed once, grouped per role at load time and re-read
+    automatically when the file's mtime changes. Role lists are tuples of
+    the loaded records, so sessions can hold references into them instead
+    of copying the data. A question's ``KeywordMatcher`` is compiled on its
+    first lookup and dropped with the load it was compiled from.
+    """
+
+    def __init__(self, path=DEFAULT_BANK_PATH, reload_interval=1.0):
+        self.path = path
+        self.reload_interval = reload_interval
+
+        # bumped on every (re)load so dependent caches know to rebuild
+        self.version = 0
+
+        self._mtime = None
+        self._checked_at = 0.0
+        self._by_role = {}
+        self._by_id = {}
+        self._matchers = {}
+        self._lock = threading.Lock()
+
+    # ------------------ LOADING ------------------ #
+
+    def _load(self, mtime):
+        # pandas is imported on first load rather than with this module
+        import pandas as pd
+
+        df = pd.read_csv(self.path)
+
+        # normalize column names
+        df.columns = df.columns.str.strip().str.lower()
+
+        by_role = {}
+        by_id = {}
+
+        for record in df.to_dict("records"):
+            role = record["role"]
+            by_role.setdefault(role, []).append(record)
+            by_id[(role, record.get("question_id"))] = record
+
+        # swap in the new index in one step; old sessions keep their references
+        self._by_role = {role: tuple(records) for role, records in by_role.items()}
+        self._by_id = by_id
+        self._matchers = {}
+        self._mtime = mtime
+        self.version += 1
+
+    def refresh(self, force=False):
+        """Reload the bank if the file changed since the last load."""
+        now = time.monotonic()
+        if not force and self._mtime is not None and now - self._checked_at < self.reload_interval:
+            return
+
+        with self._lock:
+            self._checked_at = now
+            mtime = os.stat(self.path).st_mtime_ns
+
+            if force or mtime != self._mtime:
+                self._load(mtime)
+
+    @property
+    def stamp(self):
+        """The loaded file as ``path@mtime``: unlike ``version``, the same in every process on the host."""
+        self.refresh()
+        return f"{self.path}@{self._mtime}"
+
+    # ------------------ LOOKUPS ------------------ #
+
+    def roles(self):
+        self.refresh()
+        return list(self._by_role)
+
+    def role_questions(self, role):
+        self.refresh()
+        return self._by_role.get(role, ())
+
+    def get_question(self, role, question_id):
+        self.refresh()
+        return self._by_id.get((role, question_id))
+
+    def keyword_matcher(self, role, question_id):
+        """The question's compiled ``KeywordMatcher``, or None if it is not in the bank."""
+        from app.session import parse_keywords
+
+        self.refresh()
+        key = (role, question_id)
+        record = self._by_id.get(key)
+        if record is None:
+            return None
+
+        # kept with the record it was compiled from: a lookup racing a reload never serves a stale matcher
+        entry = self._matchers.get(key)
+        if entry is None or entry[0] is not record:
+            entry = self._matchers[key] = (record, KeywordMatcher(parse_keywords(record.get("keywords"))))
+        return entry[1]
+
+    def __len__(self):
+        self.refresh()
+        return len(self._by_id)
+
+
+# ------------------ SHARED INSTANCE ------------------ #
+
+_banks = {}
+_banks_lock = threading.Lock()
+
+
+def get_question_bank(path=DEFAULT_BANK_PATH):
+    """Return the process-wide bank for ``path``, loading it on first use."""
+    bank = _banks.get(path)
+
+    if bank is None:
+        with _banks_lock:
+            bank = _banks.get(path)
+            if bank is None:
+                if is_compiled_bank(path):
+                    bank = CompiledBank(path)
+                else:
+                    bank = QuestionBank(path)
+                _banks[path] = bank
+
+    return bank
@@ -0,0 +1,67 @@
+import random
+import sys
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(x):
+    # splitmix64 finalizer: a cheap, well-spread 64-bit hash
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def new_seed():
+    """Random seed for a session's order; small enough for JSON and SQLite integers."""
+    return random.getrandbits(63)
+
+
+class SeededPermutation:
+    """
+    Pseudo-random order of ``range(size)`` computed one position at a time.
+
+    A keyed Feistel network is a bijection on ``[0, 4**k)``; walking the
+    cycle until the value falls below ``size`` restricts it to a bijection
+    on ``range(size)``. Nothing is materialized: the object holds the seed
+    and four round keys whatever the size, ``order[i]`` costs a few
+    integer hashes, and the same ``(size, seed)`` always gives the same
+    order, so a session can be replayed from its seed.
+    """
+
+    ROUNDS = 4
+
+    __slots__ = ("size", "seed", "_half", "_mask", "_keys")
+
+    def __init__(self, size, seed):
+        self.size = size
+        self.seed = seed
+
+        bits = max(2, (size - 1).bit_length())
+        self._half = (bits + 1) // 2
+        self._mask = (1 << self._half) - 1
+        self._keys = [_mix((seed * self.ROUNDS + r) & _MASK64) for r in range(self.ROUNDS)]
+
+    def _encrypt(self, x):
+        left, right = x >> self._half, x & self._mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix(right ^ key) & self._mask)
+        return (left << self._half) | right
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+
+        # the domain is under 4x size, so this takes a few steps at most on average
+        x = self._encrypt(i)
+        while x >= self.size:
+            x = self._encrypt(x)
+        return x
+
+    def __len__(self):
+        return self.size
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sys.getsizeof(self._keys) + sum(sys.getsizeof(key) for key in self._keys)
+
+    def __iter__(self):
+        return (self[i] for i in range(self.size))
@@ -0,0 +1,155 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.metrics import REPORT_EXPORTS_TOTAL, REPORT_RENDER_SECONDS
+from utils.report_exporter import render_report_json, render_report_pdf
+
+
+RENDERERS = {
+    "pdf": render_report_pdf,
+    "json": render_report_json,
+}
+
+MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "json": "application/json",
+}
+
+
+class ReportQueueFull(Exception):
+    pass
+
+
+def render_report(report, feedback, report_format, delivery):
+    """Render one report to bytes, recording its render time and outcome."""
+    try:
+        with REPORT_RENDER_SECONDS.labels(report_format).time():
+            content = RENDERERS[report_format](report, feedback)
+    except Exception:
+        REPORT_EXPORTS_TOTAL.labels(report_format, delivery, "failed").inc()
+        raise
+
+    REPORT_EXPORTS_TOTAL.labels(report_format, delivery, "done").inc()
+    return content
+
+
+class ReportJob:
+
+    def __init__(self, job_id, report_format):
+        self.job_id = job_id
+        self.format = report_format
+        self.status = "queued"
+        self.content = None
+        self.path = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def as_dict(self):
+        return {
+            "job_id": self.job_id,
+            "format": self.format,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ReportJobQueue:
+    """
+    Background report rendering.
+
+    Jobs run on a bounded thread pool and render in memory; the finished
+    file is kept on the job. With ``output_dir`` set, it is also written to
+    a per-job path. At most ``max_pending`` jobs may wait at once, and only
+    the newest ``max_jobs`` are kept (older finished jobs are dropped along
+    with their files).
+    """
+
+    def __init__(self, workers=2, max_pending=100, max_jobs=500, output_dir=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.output_dir = Path(output_dir) if output_dir else None
+
+        self._jobs = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report")
+
+    def submit(self, report, feedback, report_format="pdf"):
+        if report_format not in RENDERERS:
+            raise ValueError(f"Unknown report format {report_format!r}")
+
+        job = ReportJob(uuid.uuid4().hex, report_format)
+
+        with self._lock:
+            self._admit()
+            self._jobs[job.job_id] = job
+            self._trim()
+
+        self._executor.submit(self._render, job, report, feedback)
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def render(self, report, feedback, report_format="pdf"):
+        """
+        Render on the report threads without keeping a job; returns a future
+        of the bytes. Counts against ``max_pending`` like ``submit``.
+        """
+        with self._lock:
+            self._admit()
+
+        future = self._executor.submit(render_report, report, feedback, report_format, "stream")
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _admit(self):
+        # caller holds the lock
+        if self._pending >= self.max_pending:
+            raise ReportQueueFull("Report queue is full, try again later")
+        self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def _render(self, job, report, feedback):
+        job.status = "running"
+        try:
+            job.content = render_report(report, feedback, job.format, "job")
+
+            if self.output_dir is not None:
+                job.path = self.output_dir / f"{job.job_id}.{job.format}"
+                job.path.parent.mkdir(parents=True, exist_ok=True)
+                job.path.write_bytes(job.content)
+
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            self._release()
+
+    def _trim(self):
+        # drop the oldest finished jobs beyond max_jobs (running ones are kept)
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+
+            job = self._jobs[job_id]
+            if job.status in ("done", "failed"):
+                del self._jobs[job_id]
+                if job.path is not None:
+                    job.path.unlink(missing_ok=True)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
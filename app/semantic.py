@@ -0,0 +1,440 @@
+"""
+Semantic (LSA) scoring: answers and ideal answers compared in a low-rank
+latent space instead of on exact terms.
+
+    python -m app.semantic data/questions.csv data/semantic_model.npz
+    python -m app.semantic data/questions.csv data/semantic_model.npz --dims 256 --extra-corpus notes.txt
+
+A TF-IDF + TruncatedSVD model is fitted over the bank's ideal answers,
+question texts and keyword lists (plus any extra corpus text), so terms
+that keep appearing together, like "gaussian" and "bell curve", end up
+close together. Every ideal answer is projected once into a contiguous
+float32 matrix; scoring an answer is one sparse projection and one dot
+product, and a batch is one projection and one row-wise product.
+Everything runs offline on the CPU, and loading a saved model needs
+neither scikit-learn nor SciPy.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from app.similarity import has_ideal_answer, tokenize
+from utils.text_preprocessing import clean_text
+
+
+# bump when preprocessing or the projection changes: saved models with another version are refitted
+MODEL_VERSION = 1
+DEFAULT_DIMS = 128
+
+DEFAULT_MODEL_PATH = os.environ.get("SEMANTIC_MODEL_PATH", "data/semantic_model.npz")
+
+
+def bank_fingerprint(bank):
+    """Hash of every (role, question_id, ideal_answer) in the bank, in order."""
+    digest = hashlib.blake2b(digest_size=16)
+    for role in bank.roles():
+        for question in bank.role_questions(role):
+            ideal_answer = question.get("ideal_answer")
+            if has_ideal_answer(ideal_answer):
+                digest.update(f"{role}\x00{question.get('question_id')}\x00{ideal_answer}\x01".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def corpus_fingerprint(documents):
+    """Hash of the extra fitting documents, in order."""
+    digest = hashlib.blake2b(digest_size=16)
+    for document in documents:
+        digest.update(f"{document}\x01".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _keywords_text(keywords):
+    if isinstance(keywords, str):
+        return keywords
+    return " ".join(keywords or ())
+
+
+# ------------------ MODEL ------------------ #
+
+class SemanticModel:
+    """
+    LSA projection plus the embedded ideal answer of every bank question.
+
+    ``projection`` is the (terms x dims) SVD basis and ``ideal`` holds one
+    L2-normalized float32 row per (role, question_id); both are plain
+    contiguous arrays, so a saved model loads with NumPy alone.
+    """
+
+    def __init__(self, terms, idf, projection, ideal, roles, question_ids, meta):
+        self.terms = terms
+        self.idf = np.ascontiguousarray(idf, dtype=np.float32)
+        self.projection = np.ascontiguousarray(projection, dtype=np.float32)
+        self.ideal = np.ascontiguousarray(ideal, dtype=np.float32)
+        self.meta = meta
+
+        self._vocabulary = {term: column for column, term in enumerate(terms)}
+        self.index = {(role, question_id): row for row, (role, question_id) in enumerate(zip(roles, question_ids))}
+        self._roles = list(roles)
+        self._question_ids = list(question_ids)
+
+    @property
+    def dims(self):
+        return self.projection.shape[1]
+
+    @classmethod
+    def fit(cls, bank, dims=DEFAULT_DIMS, extra_corpus=(), seed=0):
+        # scikit-learn is only needed to fit; scoring and loading use NumPy alone
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        roles, question_ids, ideal_texts = [], [], []
+        corpus = []
+
+        for role in bank.roles():
+            for question in bank.role_questions(role):
+                # question text and keyword lists add co-occurrences: that is where synonyms come from
+                corpus.append(clean_text(str(question.get("question_text") or "")))
+                corpus.append(clean_text(_keywords_text(question.get("keywords"))))
+
+                if has_ideal_answer(question.get("ideal_answer")):
+                    roles.append(role)
+                    question_ids.append(str(question.get("question_id")))
+                    ideal_texts.append(clean_text(question["ideal_answer"]))
+
+        extra = [clean_text(text) for text in extra_corpus if text and text.strip()]
+        corpus = ideal_texts + [text for text in corpus if text] + extra
+
+        if not ideal_texts:
+            raise ValueError("the question bank has no ideal answers to fit on")
+
+        vectorizer = TfidfVectorizer(sublinear_tf=True)
+        matrix = vectorizer.fit_transform(corpus)
+
+        # near full rank, LSA degenerates into plain TF-IDF: keep well under the corpus size
+        requested_dims = dims
+        dims = max(1, min(dims, matrix.shape[0] // 4, matrix.shape[1] - 1))
+        svd = TruncatedSVD(n_components=dims, random_state=seed)
+        svd.fit(matrix)
+
+        terms = vectorizer.get_feature_names_out().tolist()
+        model = cls(
+            terms,
+            vectorizer.idf_,
+            svd.components_.T,
+            np.zeros((len(ideal_texts), dims), dtype=np.float32),
+            roles,
+            question_ids,
+            {
+                "model_version": MODEL_VERSION,
+                "dims": dims,
+                "requested_dims": requested_dims,
+                "bank_fingerprint": bank_fingerprint(bank),
+                "extra_corpus_fingerprint": corpus_fingerprint(extra_corpus),
+                "questions": len(ideal_texts),
+                "corpus_documents": len(corpus),
+                "extra_documents": len(extra),
+                "explained_variance": round(float(svd.explained_variance_ratio_.sum()), 4),
+                "fitted_at": time.time(),
+                "seed": seed,
+            },
+        )
+        model.ideal = model.embed(ideal_texts, cleaned=True)
+        return model
+
+    # ------------------ SCORING ------------------ #
+
+    def embed(self, texts, cleaned=False):
+        """L2-normalized latent vectors of ``texts``, one float32 row each (zeros if no known term)."""
+        vocabulary = self._vocabulary
+        rows, terms, counts = [], [], []
+
+        for row, text in enumerate(texts):
+            for term, count in Counter(tokenize(text, cleaned)).items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    terms.append(column)
+                    counts.append(count)
+
+        embedded = np.zeros((len(texts), self.dims), dtype=np.float32)
+        if not rows:
+            return embedded
+
+        rows = np.asarray(rows, dtype=np.int64)
+        terms = np.asarray(terms, dtype=np.int64)
+        weights = (1 + np.log(np.asarray(counts, dtype=np.float32))) * self.idf[terms]
+
+        # the sparse (answers x terms) @ (terms x dims) product; rows arrive in order
+        present, starts = np.unique(rows, return_index=True)
+        embedded[present] = np.add.reduceat(weights[:, None] * self.projection[terms], starts, axis=0)
+
+        norms = np.linalg.norm(embedded, axis=1, keepdims=True)
+        np.divide(embedded, norms, out=embedded, where=norms > 0)
+        return embedded
+
+    def similarities(self, keys, user_answers, cleaned=False):
+        """Cosine similarity (clipped to 0–1) of each answer against the ideal answer of its (role, question_id)."""
+        ideal_rows = np.asarray([self.index[(role, str(question_id))] for role, question_id in keys], dtype=np.int64)
+        embedded = self.embed(user_answers, cleaned)
+        scores = np.einsum("ij,ij->i", embedded, self.ideal[ideal_rows], dtype=np.float64)
+        return np.clip(scores, 0.0, 1.0)
+
+    # ------------------ PERSISTENCE ------------------ #
+
+    def save(self, path):
+        """Write the model as an uncompressed ``.npz``; swapped in atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp.npz")   # workers may save at once
+
+        np.savez(
+            tmp_path,
+            meta=np.array(json.dumps(self.meta)),
+            terms=np.array(self.terms, dtype=str),
+            idf=self.idf,
+            projection=self.projection,
+            ideal=self.ideal,
+            roles=np.array(self._roles, dtype=str),
+            question_ids=np.array(self._question_ids, dtype=str),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("model_version") != MODEL_VERSION:
+                raise ValueError(f"{path} is model version {meta.get('model_version')}, expected {MODEL_VERSION}")
+
+            return cls(
+                data["terms"].tolist(),
+                data["idf"],
+                data["projection"],
+                data["ideal"],
+                data["roles"].tolist(),
+                data["question_ids"].tolist(),
+                meta,
+            )
+
+
+class RunningEmbedding:
+    """
+    ``RunningSimilarity`` for the semantic model: the answer's latent vector
+    is updated term by term, so each token costs O(dims).
+    """
+
+    def __init__(self, model, ideal):
+        self.model = model
+        self.ideal = ideal.astype(np.float64)
+        self.counts = {}
+        self.vector = np.zeros(model.dims)
+
+    def _step(self, column):
+        # sublinear tf: a term's weight goes from (1 + log c) to (1 + log(c + 1)) times its idf
+        count = self.counts.get(column, 0)
+        before = 1 + math.log(count) if count else 0.0
+        return (1 + math.log(count + 1) - before) * float(self.model.idf[column]) * self.model.projection[column]
+
+    def add(self, token):
+        column = self.model._vocabulary.get(token)
+        if column is None:
+            return
+
+        self.vector += self._step(column)
+        self.counts[column] = self.counts.get(column, 0) + 1
+
+    def value(self, pending=None):
+        vector = self.vector
+
+        column = self.model._vocabulary.get(pending) if pending else None
+        if column is not None:
+            vector = vector + self._step(column)
+
+        norm = np.linalg.norm(vector)
+        return min(1.0, max(0.0, float(vector @ self.ideal) / norm)) if norm > 0 else 0.0
+
+
+class _RoleView:
+    """One role's questions in a bank-wide ``SemanticModel``, shaped like ``RoleModel``."""
+
+    def __init__(self, model, role):
+        self.model = model
+        self.role = role
+
+    def __contains__(self, question_id):
+        return (self.role, str(question_id)) in self.model.index
+
+    def similarities(self, question_ids, user_answers, cleaned=False):
+        return self.model.similarities([(self.role, question_id) for question_id in question_ids], user_answers, cleaned)
+
+    def similarity(self, question_id, user_answer, cleaned=False):
+        return float(self.similarities([question_id], [user_answer], cleaned)[0])
+
+    def running(self, question_id):
+        return RunningEmbedding(self.model, self.model.ideal[self.model.index[(self.role, str(question_id))]])
+
+
+# ------------------ ENGINE ------------------ #
+
+class SemanticEngine:
+    """
+    Drop-in for ``SimilarityEngine`` that scores with a ``SemanticModel``.
+
+    The model is loaded from ``model_path`` when that file was fitted the
+    way this engine would fit it (same bank fingerprint, model version,
+    dims and extra corpus); otherwise it is refitted in-process and saved
+    back, and again whenever the bank reloads with different ideal answers.
+    """
+
+    def __init__(self, bank, model_path=DEFAULT_MODEL_PATH, dims=DEFAULT_DIMS, extra_corpus_path=None):
+        self.bank = bank
+        self.model_path = model_path
+        self.dims = dims
+        self.extra_corpus_path = extra_corpus_path
+
+        self._version = None
+        self._model = None
+        self._lock = threading.Lock()
+
+        # (stat, documents, fingerprint) of the extra corpus, re-read when the file changes
+        self._corpus = None
+        self._corpus_checked_at = 0.0
+
+    @property
+    def scoring_version(self):
+        """Everything besides the answer and question that scores depend on (see ``app.eval_cache``)."""
+        _, fingerprint = self._extra_corpus()
+        return f"semantic/{MODEL_VERSION}/{self.dims}/{fingerprint}/{self.bank.stamp}"
+
+    def _extra_corpus(self):
+        """``(documents, fingerprint)`` of the extra corpus, checked for edits like the bank is."""
+        now = time.monotonic()
+        if self._corpus is not None and now - self._corpus_checked_at < self.bank.reload_interval:
+            return self._corpus[1:]
+
+        if self.extra_corpus_path:
+            st = os.stat(self.extra_corpus_path)
+            stat = (st.st_mtime_ns, st.st_size)
+        else:
+            stat = None
+        if self._corpus is None or self._corpus[0] != stat:
+            documents = read_corpus(self.extra_corpus_path)
+            self._corpus = (stat, documents, corpus_fingerprint(documents))
+        self._corpus_checked_at = now
+        return self._corpus[1:]
+
+    def semantic_model(self):
+        self.bank.refresh()
+        _, fingerprint = self._extra_corpus()
+        if (self.bank.version, fingerprint) != self._version:
+            with self._lock:
+                if (self.bank.version, fingerprint) != self._version:
+                    version = (self.bank.version, fingerprint)
+                    self._model = self._load_or_fit()
+                    self._version = version
+        return self._model
+
+    def _load_or_fit(self):
+        extra_corpus, fingerprint = self._extra_corpus()
+        # what a fit would get; a model fitted with anything else is stale
+        expected = {
+            "bank_fingerprint": bank_fingerprint(self.bank),
+            "requested_dims": self.dims,
+            "extra_corpus_fingerprint": fingerprint,
+        }
+
+        def current(model):
+            return model is not None and all(model.meta.get(key) == value for key, value in expected.items())
+
+        if current(self._model):
+            return self._model
+
+        if self.model_path and os.path.exists(self.model_path):
+            try:
+                model = SemanticModel.load(self.model_path)
+            except (OSError, ValueError, KeyError):
+                model = None
+            if current(model):
+                return model
+
+        if not any(has_ideal_answer(q.get("ideal_answer")) for role in self.bank.roles() for q in self.bank.role_questions(role)):
+            return None
+
+        model = SemanticModel.fit(self.bank, dims=self.dims, extra_corpus=extra_corpus)
+        if self.model_path:
+            try:
+                model.save(self.model_path)
+            except OSError:
+                pass   # a read-only deployment still scores with the in-memory model
+        return model
+
+    def model(self, role):
+        """Scoring view for ``role``, or None if the bank has no ideal answers."""
+        model = self.semantic_model()
+        return _RoleView(model, role) if model is not None else None
+
+    def similarity(self, role, question_id, user_answer, cleaned=False):
+        """Latent-space cosine similarity (0–1), or None if the question is not in the model."""
+        view = self.model(role)
+        if view is None or question_id not in view:
+            return None
+
+        return view.similarity(question_id, user_answer, cleaned)
+
+
+def read_corpus(path):
+    """Extra fitting text, one document per non-empty line (nothing if ``path`` is unset)."""
+    if not path:
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [line for line in f if line.strip()]
+
+
+def semantic_engine_from_env(bank):
+    return SemanticEngine(
+        bank,
+        model_path=DEFAULT_MODEL_PATH,
+        dims=int(os.environ.get("SEMANTIC_DIMS", DEFAULT_DIMS)),
+        extra_corpus_path=os.environ.get("SEMANTIC_EXTRA_CORPUS") or None,
+    )
+
+
+# ------------------ CLI ------------------ #
+
+def main():
+    from app.question_bank import get_question_bank
+
+    parser = argparse.ArgumentParser(description="Fit the LSA semantic scoring model over a question bank.")
+    parser.add_argument("bank", help="question bank (CSV or compiled .qbank)")
+    parser.add_argument("output", help="model file to write (.npz)")
+    parser.add_argument("--dims", type=int, default=DEFAULT_DIMS, help="latent dimensions")
+    parser.add_argument("--extra-corpus", help="text file with extra fitting documents, one per line")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.output.endswith(".npz"):
+        parser.error("output must end in .npz")
+
+    bank = get_question_bank(args.bank)
+    start = time.perf_counter()
+    model = SemanticModel.fit(bank, dims=args.dims, extra_corpus=read_corpus(args.extra_corpus), seed=args.seed)
+    model.save(args.output)
+
+    meta = model.meta
+    print(f"fitted {meta['questions']} ideal answers, {len(model.terms)} terms, {meta['dims']} dims "
+          f"({meta['explained_variance']:.0%} of variance) in {time.perf_counter() - start:.1f}s")
+    print(f"wrote {args.output} ({Path(args.output).stat().st_size / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
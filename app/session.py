@@ -1,8 +1,9 @@
-import pandas as pd
-import random
-
 # Import evaluator functions
-from app.evaluator import evaluate_answer
+from app.analytics import PerformanceAnalyzer, classify_topics
+from app.evaluator import evaluate_answer, evaluate_answers_batch
+from app.question_bank import get_question_bank
+from app.question_order import SeededPermutation, new_seed
+from app.similarity import get_similarity_engine
 
 
 def parse_keywords(keywords):
@@ -18,114 +19,323 @@ def parse_keywords(keywords):
     return keywords
 
 
-class InterviewSession:
+def resolve_answers(answers, role=None, bank=None):
+    """
+    Turn batch items into ``evaluate_answers_batch`` arguments.
+
+    Each item carries ``user_answer`` plus either the ``question_data`` that
+    ``get_next_question`` returned or a ``question_id`` (and optionally a
+    ``role``, defaulting to ``role``) that is looked up in the bank.
+    Returns the resolved question dicts and the positional arguments.
+    """
+    bank = bank if bank is not None else get_question_bank()
+
+    question_data = []
+    roles = []
+
+    for answer in answers:
+        answer_role = answer.get("role", role)
+        question = answer.get("question_data")
+
+        if question is None:
+            question = bank.get_question(answer_role, answer.get("question_id"))
+            if question is None:
+                raise ValueError(f"Unknown question_id {answer.get('question_id')!r} for role {answer_role!r}")
+
+        question_data.append(question)
+        roles.append(answer_role)
+
+    args = (
+        [answer["user_answer"] for answer in answers],
+        [question.get("ideal_answer") for question in question_data],
+        [parse_keywords(question.get("keywords", "")) for question in question_data],
+        [question.get("question_id") for question in question_data],
+        roles
+    )
+    return question_data, args
+
+
+def grade_answers_batch(answers, role=None, bank=None):
+    """Grade recorded answers without a session (see ``resolve_answers``)."""
+    _, args = resolve_answers(answers, role=role, bank=bank)
+    return evaluate_answers_batch(*args, engine=get_similarity_engine(bank))
 
-    def __init__(self, role):
 
-        # load dataset
-        df = pd.read_csv("data/questions.csv")
+class TopicStats:
+    """Running count, sum, min, max and variance (Welford) of one topic's scores."""
 
-        # normalize column names
-        df.columns = df.columns.str.strip().str.lower()
+    __slots__ = ("count", "total", "min", "max", "mean", "m2")
 
-        # filter questions by role
-        self.questions = df[df["role"] == role]
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
 
-        # convert to list of dictionaries
-        self.questions = self.questions.to_dict("records")
+    def add(self, score):
+        self.count += 1
+        self.total += score   # same left-to-right sum as sum(scores)
+        self.min = score if self.min is None else min(self.min, score)
+        self.max = score if self.max is None else max(self.max, score)
 
-        # shuffle questions
-        random.shuffle(self.questions)
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+
+    @property
+    def average(self):
+        return self.total / self.count
+
+    @property
+    def variance(self):
+        return self.m2 / self.count
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "average": round(self.average, 2),
+            "min": self.min,
+            "max": self.max,
+            "variance": round(self.variance, 2),
+            "std": round(self.variance ** 0.5, 2),
+        }
+
+
+class QuestionBankChanged(Exception):
+    """A stored seeded order was drawn from a bank version that is no longer loaded."""
+
+
+class InterviewSession:
+    """
+    One candidate's interview.
+
+    The session keeps no copy of the questions: it holds the bank's shared
+    per-role tuple plus a ``SeededPermutation`` over it, and
+    ``get_next_question`` looks up one question at a time. Pass ``seed``
+    to get a reproducible order (the same seed and bank replay the same
+    interview); ``question_ids`` fixes an explicit order instead.
+    """
+
+    def __init__(self, role, bank=None, question_ids=None, seed=None, order_size=None):
+
+        # shared, process-wide question bank (loaded once, reloaded on change)
+        self.bank = bank if bank is not None else get_question_bank()
+        self.engine = get_similarity_engine(self.bank)
+        self.role = role
+
+        if question_ids is None:
+            # the bank's immutable per-role tuple, shared by every session of this role,
+            # and the version it came from (re-read if the bank reloaded in between)
+            while True:
+                self.bank_stamp = self.bank.stamp
+                self.questions = self.bank.role_questions(role)
+                if self.bank.stamp == self.bank_stamp:
+                    break
+            self.seed = seed if seed is not None else new_seed()
+
+            # a restored session keeps the size it was created with, so its order is unchanged
+            self.order = SeededPermutation(order_size if order_size is not None else len(self.questions), self.seed)
+        else:
+            # explicit order (questions since removed are skipped)
+            self.questions = tuple(
+                question for question in (self.bank.get_question(role, qid) for qid in question_ids)
+                if question is not None
+            )
+            self.seed = None
+            self.bank_stamp = None
+            self.order = range(len(self.questions))
 
         # tracking
         self.current_index = 0
         self.responses = []   # 🔥 store all responses
+        self.topic_stats = {}   # topic -> TopicStats, updated as answers are recorded
+
+        # shared persistence (see attach / restore)
+        self.session_id = None
+        self.backend = None
+        self.revision = 0
+
+    # ------------------ PERSISTENCE ------------------ #
+
+    def order_state(self):
+        """
+        How to rebuild this session's question order: a seed and size, with
+        the bank version they index into, or the explicit ids.
+        """
+        if self.seed is not None:
+            return {"seed": self.seed, "size": len(self.order), "bank": self.bank_stamp}
+        return {"question_ids": [question.get("question_id") for question in self.questions]}
+
+    def attach(self, session_id, backend):
+        """Persist this new session in ``backend`` under ``session_id``."""
+        backend.create(session_id, self.role, self.order_state())
+        self.session_id = session_id
+        self.backend = backend
+        self.revision = 0
+
+    @classmethod
+    def restore(cls, session_id, backend, bank=None):
+        """
+        Rebuild a session from ``backend``, or None if it does not exist.
+
+        A seeded order only replays against the bank version it was drawn
+        from; after a reload the same positions would map to other
+        questions, so it raises ``QuestionBankChanged`` instead.
+        """
+        state = backend.load(session_id)
+        if state is None:
+            return None
+
+        order = state["question_order"]
+        stamp = order.get("bank")
+        if stamp is not None:
+            bank = bank if bank is not None else get_question_bank()
+            if bank.stamp != stamp:
+                # this worker may simply not have noticed the reload yet
+                bank.refresh(force=True)
+                if bank.stamp != stamp:
+                    raise QuestionBankChanged(f"session {session_id} was started on {stamp}, the bank is now {bank.stamp}")
+        session = cls(
+            state["role"],
+            bank=bank,
+            question_ids=order.get("question_ids"),
+            seed=order.get("seed"),
+            order_size=order.get("size"),
+        )
+        session.current_index = state["current_index"]
+        session.responses = state["responses"]
+        for response in session.responses:
+            session._update_topic_stats(response)
+        session.session_id = session_id
+        session.backend = backend
+        session.revision = state["revision"]
+        return session
+
+    def _advance_revision(self, revision):
+        # a gap means another worker wrote in between, so this copy is stale
+        self.revision = revision if revision == self.revision + 1 else -1
+
+    # ------------------ INTERVIEW FLOW ------------------ #
+
+    def _claim_position(self):
+        """Next position in the order, or None when the interview is out of questions."""
+        if self.backend is not None:
+            # claim the index in shared storage so workers never hand out the same question twice
+            claimed = self.backend.claim_next_question(self.session_id, len(self.order))
+            if claimed is None:
+                return None
+
+            index, revision = claimed
+            self._advance_revision(revision)
+            self.current_index = index
+
+        if self.current_index >= len(self.order):
+            return None
+
+        position = self.order[self.current_index]
+        self.current_index += 1
+        return position
 
     def get_next_question(self):
 
-        if self.current_index < len(self.questions):
+        position = self._claim_position()
+
+        # positions past the end only occur if the bank shrank since the session started
+        while position is not None and position >= len(self.questions):
+            position = self._claim_position()
 
-            question_data = self.questions[self.current_index]
-            self.current_index += 1
+        if position is None:
+            return None
 
-            return {
-                "question": question_data["question_text"],
-                "topic": question_data["topic"],
-                "ideal_answer": question_data["ideal_answer"],
-                "input_type": question_data.get("input_type", "text"),
-                "keywords": question_data.get("keywords", "")
-            }
+        question_data = self.questions[position]
 
-        return None
+        return {
+            "question_id": question_data.get("question_id"),
+            "question": question_data["question_text"],
+            "topic": question_data["topic"],
+            "ideal_answer": question_data["ideal_answer"],
+            "input_type": question_data.get("input_type", "text"),
+            "keywords": question_data.get("keywords", "")
+        }
+
+    def grading_args(self, user_answer, question_data):
+        """Positional ``evaluate_answer`` arguments for one answer in this session."""
+        return (
+            user_answer,
+            question_data.get("ideal_answer"),
+            parse_keywords(question_data.get("keywords", "")),
+            question_data.get("question_id"),
+            self.role
+        )
 
     def evaluate_answer(self, user_answer, question_data):
 
-        ideal_answer = question_data.get("ideal_answer")
-        topic = question_data.get("topic")
-        keywords = parse_keywords(question_data.get("keywords", ""))
+        result = evaluate_answer(*self.grading_args(user_answer, question_data), engine=self.engine)
 
+        self.record_response(question_data, result)
 
-        result = evaluate_answer(user_answer, ideal_answer, keywords)
+        return result
 
-        # ✅ extract correct fields
-        score = result["score"]
-        matched = result["matched_keywords"]
-        missed = result["missing_keywords"]
-        confidence = result["confidence"]
+    def evaluate_answers_batch(self, answers):
+        """Grade ``[{"user_answer", "question_data"}, ...]`` in one pass and record every response."""
+        question_data, args = resolve_answers(answers, role=self.role, bank=self.bank)
 
-    
-        self.responses.append({
+        results = evaluate_answers_batch(*args, engine=self.engine)
+
+        for question, result in zip(question_data, results):
+            self.record_response(question, result)
+
+        return results
+
+    def record_response(self, question_data, result):
+
+        # ✅ extract correct fields
+        response = {
             "question": question_data.get("question"),
-            "topic": topic,
-            "score": score,
-            "confidence": confidence,
-            "matched_keywords": matched,
-            "missing_keywords": missed
-        })
+            "topic": question_data.get("topic"),
+            "score": result["score"],
+            "confidence": result["confidence"],
+            "matched_keywords": result["matched_keywords"],
+            "missing_keywords": result["missing_keywords"]
+        }
 
-        print("KEYWORDS RAW:", question_data.get("keywords"))
+        self.responses.append(response)
+        self._update_topic_stats(response)
 
-        return result
+        if self.backend is not None:
+            self._advance_revision(self.backend.append_response(self.session_id, response))
 
     # 🔥 (PREP FOR TASK 19)
     def get_all_responses(self):
         return self.responses
     
-    def get_topic_wise_scores(self):
-
-        topic_scores = {}
-
-        for response in self.responses:
-            topic = response["topic"]
-            score = response["score"]
+    def _update_topic_stats(self, response):
+        stats = self.topic_stats.get(response["topic"])
+        if stats is None:
+            stats = self.topic_stats[response["topic"]] = TopicStats()
+        stats.add(response["score"])
 
-            if topic not in topic_scores:
-                topic_scores[topic] = []
-
-            topic_scores[topic].append(score)
+    def get_topic_wise_scores(self):
 
-        # compute averages
-        topic_avg = {}
-        for topic, scores in topic_scores.items():
-            topic_avg[topic] = round(sum(scores) / len(scores), 2)
+        # averages from the running per-topic aggregates: O(topics), not O(responses)
+        return {
+            topic: round(stats.average, 2)
+            for topic, stats in self.topic_stats.items()
+        }
 
-        return topic_avg
+    def get_topic_stats(self):
+        """Per-topic count, average, min, max and spread of the scores."""
+        return {topic: stats.as_dict() for topic, stats in self.topic_stats.items()}
 
     # ✅ FIXED: inside class
     def get_strengths_and_weaknesses(self):
 
-        topic_scores = self.get_topic_wise_scores()
+        classification = classify_topics(self.get_topic_wise_scores())
 
-        strengths = []
-        weaknesses = []
+        return classification["strong"], classification["weak"]
 
-        for topic, score in topic_scores.items():
-            if score >= 75:
-                strengths.append(topic)
-            elif score <= 60:
-                weaknesses.append(topic)
-
-        return strengths, weaknesses
-    
-    
-    
+    def get_report(self):
+        """Summary in the shape ``FeedbackGenerator`` and the report exporters expect."""
+        return PerformanceAnalyzer(self.responses, self.role).generate_report()
@@ -0,0 +1,223 @@
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+def new_session_id():
+    """Random, URL-safe id; unique across processes and never reused."""
+    return secrets.token_urlsafe(16)
+
+
+class SessionBackend(ABC):
+    """
+    Shared storage for ``InterviewSession`` state.
+
+    A session is its role, question order (a seed and size, or explicit
+    question ids), ``current_index`` and ``responses``. Every write bumps a per-session revision, which lets a
+    worker tell whether its cached copy is still current. Writes are
+    deltas: claiming a question or appending one response.
+    """
+
+    @abstractmethod
+    def create(self, session_id, role, question_order):
+        ...
+
+    @abstractmethod
+    def load(self, session_id):
+        """Full state dict, or None if the session does not exist."""
+
+    @abstractmethod
+    def revision(self, session_id):
+        """``(revision, updated_at)`` of the session, or None."""
+
+    @abstractmethod
+    def claim_next_question(self, session_id, n_questions):
+        """Atomically take the next index; ``(index, revision)`` or None when exhausted."""
+
+    @abstractmethod
+    def append_response(self, session_id, response):
+        """Store one response; returns the new revision."""
+
+    @abstractmethod
+    def delete(self, session_id):
+        ...
+
+    @abstractmethod
+    def purge(self, older_than):
+        """Drop sessions last written before the ``older_than`` timestamp."""
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Session state in a local SQLite database in WAL mode.
+
+    Every uvicorn worker on the box opens the same file, so any worker can
+    serve any request of an interview.
+    """
+
+    # sessions are short-lived, so a database from an older schema version is simply reset
+    SCHEMA_VERSION = 2
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id     TEXT PRIMARY KEY,
+            role           TEXT NOT NULL,
+            question_order TEXT NOT NULL,
+            current_index  INTEGER NOT NULL DEFAULT 0,
+            revision       INTEGER NOT NULL DEFAULT 0,
+            updated_at     REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS responses (
+            session_id TEXT NOT NULL,
+            seq        INTEGER NOT NULL,
+            response   TEXT NOT NULL,
+            PRIMARY KEY (session_id, seq)
+        );
+        CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+    """
+
+    def __init__(self, path="data/sessions.db", timeout=5.0):
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        self._migrate(conn)
+        conn.close()
+
+    def _migrate(self, conn):
+        # one worker at a time, so a starting worker never drops tables another just created
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS responses")
+                conn.execute("DROP TABLE IF EXISTS sessions")
+
+            for statement in self.SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.execute("COMMIT")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def _conn(self):
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def create(self, session_id, role, question_order):
+        self._conn.execute(
+            "INSERT INTO sessions (session_id, role, question_order, updated_at) VALUES (?, ?, ?, ?)",
+            (session_id, role, json.dumps(question_order), time.time())
+        )
+
+    def load(self, session_id):
+        conn = self._conn
+
+        # one read transaction, so the session row and its responses match
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute(
+                "SELECT role, question_order, current_index, revision, updated_at"
+                " FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            responses = conn.execute(
+                "SELECT response FROM responses WHERE session_id = ? ORDER BY seq",
+                (session_id,)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+
+        role, question_order, current_index, revision, updated_at = row
+        return {
+            "role": role,
+            "question_order": json.loads(question_order),
+            "current_index": current_index,
+            "revision": revision,
+            "updated_at": updated_at,
+            "responses": [json.loads(response) for (response,) in responses],
+        }
+
+    def revision(self, session_id):
+        return self._conn.execute(
+            "SELECT revision, updated_at FROM sessions WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+
+    def claim_next_question(self, session_id, n_questions):
+        rows = self._conn.execute(
+            "UPDATE sessions"
+            " SET current_index = current_index + 1, revision = revision + 1, updated_at = ?"
+            " WHERE session_id = ? AND current_index < ?"
+            " RETURNING current_index, revision",
+            (time.time(), session_id, n_questions)
+        ).fetchall()   # drain RETURNING rows so the statement (and its write lock) completes
+
+        if not rows:
+            return None
+
+        current_index, revision = rows[0]
+        return current_index - 1, revision
+
+    def append_response(self, session_id, response):
+        conn = self._conn
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO responses (session_id, seq, response)"
+                " SELECT ?, COALESCE(MAX(seq), -1) + 1, ? FROM responses WHERE session_id = ?",
+                (session_id, json.dumps(response), session_id)
+            )
+            [(revision,)] = conn.execute(
+                "UPDATE sessions SET revision = revision + 1, updated_at = ?"
+                " WHERE session_id = ? RETURNING revision",
+                (time.time(), session_id)
+            ).fetchall()
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.execute("COMMIT")
+        return revision
+
+    def delete(self, session_id):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM responses WHERE session_id = ?", (session_id,))
+        conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        conn.execute("COMMIT")
+
+    def purge(self, older_than):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "DELETE FROM responses WHERE session_id IN"
+            " (SELECT session_id FROM sessions WHERE updated_at < ?)",
+            (older_than,)
+        )
+        deleted = conn.execute("DELETE FROM sessions WHERE updated_at < ?", (older_than,)).rowcount
+        conn.execute("COMMIT")
+        return deleted
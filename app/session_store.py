@@ -0,0 +1,230 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from app.session import InterviewSession, QuestionBankChanged
+
+
+def approx_session_bytes(session):
+    """
+    Rough memory owned by one session.
+
+    Question records and the per-role tuple belong to the shared bank, so
+    only the session's question order is counted; responses are measured
+    in full.
+    """
+    seen = set()
+
+    def sizeof(obj):
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            size += sum(sizeof(k) + sizeof(v) for k, v in obj.items())
+        elif isinstance(obj, (list, tuple, set)):
+            size += sum(sizeof(item) for item in obj)
+        return size
+
+    size = sys.getsizeof(session) + sys.getsizeof(vars(session))
+    size += sys.getsizeof(session.order)
+    if session.seed is None:
+        size += sys.getsizeof(session.questions)   # an explicit order owns its tuple
+    size += sizeof(session.responses)
+    return size
+
+
+class SessionStore:
+    """
+    In-process session registry with an idle TTL and LRU eviction.
+
+    Sessions untouched for ``ttl_seconds`` expire; past ``max_sessions`` the
+    least recently used one is evicted. Ids of removed sessions are
+    remembered for a while so callers can tell "expired" from "unknown".
+
+    With a shared ``backend`` the backend is the source of truth and this
+    store is a per-worker cache: a cached session is reused only while its
+    revision matches the stored one, otherwise it is reloaded.
+    """
+
+    def __init__(self, ttl_seconds=3600.0, max_sessions=10000, max_tombstones=None, backend=None, bank=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_tombstones = max_tombstones if max_tombstones is not None else max_sessions
+        self.backend = backend
+        self.bank = bank
+        self._purged_at = 0.0
+
+        self._sessions = OrderedDict()   # session_id -> (session, last_access), LRU first
+        self._tombstones = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.reloads = 0
+
+    # ------------------ INTERNALS ------------------ #
+
+    def _bury(self, session_id):
+        self._tombstones[session_id] = None
+        while len(self._tombstones) > self.max_tombstones:
+            self._tombstones.popitem(last=False)
+
+    def _expire(self, now):
+        # LRU order is also idle-time order, so expired sessions sit at the front
+        while self._sessions:
+            session_id, (_, last_access) = next(iter(self._sessions.items()))
+            if now - last_access < self.ttl_seconds:
+                break
+
+            del self._sessions[session_id]
+
+            # with a backend this only drops the local copy; the backend decides expiry
+            if self.backend is None:
+                self._bury(session_id)
+                self.expirations += 1
+
+    def _cache(self, session_id, session, now):
+        self._sessions[session_id] = (session, now)
+        self._sessions.move_to_end(session_id)
+        self._tombstones.pop(session_id, None)
+
+        while len(self._sessions) > self.max_sessions:
+            evicted_id, _ = self._sessions.popitem(last=False)
+            if self.backend is None:
+                self._bury(evicted_id)
+            self.evictions += 1
+
+    def _stored_expired(self, stored):
+        return time.time() - stored[1] >= self.ttl_seconds
+
+    def _purge_backend(self):
+        # stored sessions stay readable as "expired" for one more TTL, then go
+        now = time.time()
+        if now - self._purged_at < min(self.ttl_seconds, 60.0):
+            return
+
+        self._purged_at = now
+        self.backend.purge(older_than=now - 2 * self.ttl_seconds)
+
+    def _get_shared(self, session_id):
+        stored = self.backend.revision(session_id)
+
+        if stored is None or self._stored_expired(stored):
+            with self._lock:
+                self._sessions.pop(session_id, None)
+                self.misses += 1
+                if stored is not None:
+                    self.expirations += 1
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry[0].revision == stored[0]:
+                self._cache(session_id, entry[0], now)
+                self.hits += 1
+                return entry[0]
+
+        # another worker changed it (or it was never cached here)
+        try:
+            session = InterviewSession.restore(session_id, self.backend, bank=self.bank)
+        except QuestionBankChanged:
+            # its order cannot be replayed on the reloaded bank: the interview is over
+            with self._lock:
+                self._sessions.pop(session_id, None)
+                self._bury(session_id)
+                self.misses += 1
+                self.expirations += 1
+            return None
+
+        with self._lock:
+            if session is None:
+                self.misses += 1
+                return None
+
+            self._cache(session_id, session, time.monotonic())
+            self.reloads += 1
+            return session
+
+    # ------------------ API ------------------ #
+
+    def put(self, session_id, session):
+        if self.backend is not None:
+            session.attach(session_id, self.backend)
+            self._purge_backend()
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            self._cache(session_id, session, now)
+
+    def get(self, session_id):
+        """The live session for ``session_id`` (refreshing its TTL), or None."""
+        if self.backend is not None:
+            return self._get_shared(session_id)
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._sessions[session_id] = (entry[0], now)
+            self._sessions.move_to_end(session_id)
+            self.hits += 1
+            return entry[0]
+
+    def is_expired(self, session_id):
+        """True if ``session_id`` existed but was expired or evicted (or outlived its question bank)."""
+        with self._lock:
+            if session_id in self._tombstones:
+                return True
+
+        if self.backend is not None:
+            stored = self.backend.revision(session_id)
+            return stored is not None and self._stored_expired(stored)
+
+        return False
+
+    def remove(self, session_id):
+        if self.backend is not None:
+            self.backend.delete(session_id)
+
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            return entry[0] if entry else None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            sessions = [session for session, _ in self._sessions.values()]
+
+            stats = {
+                "active_sessions": len(sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "reloads": self.reloads,
+                "backend": type(self.backend).__name__ if self.backend is not None else "memory",
+            }
+
+        total_bytes = sum(approx_session_bytes(session) for session in sessions)
+        stats["approx_total_bytes"] = total_bytes
+        stats["approx_bytes_per_session"] = round(total_bytes / len(sessions)) if sessions else 0
+        return stats
@@ -0,0 +1,246 @@
+import math
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+
+from app.question_bank import get_question_bank
+from utils.text_preprocessing import clean_text
+
+
+# "tfidf" (exact terms) or "semantic" (LSA, see app/semantic.py)
+SCORING_MODES = ("tfidf", "semantic")
+SCORING_MODE = os.environ.get("SCORING_MODE", "tfidf")
+
+
+def tokenize(text, cleaned=False):
+    # clean_text leaves only [a-z0-9] runs separated by single spaces, so this
+    # yields exactly the tokens of TfidfVectorizer's default r"(?u)\b\w\w+\b"
+    if not cleaned:
+        text = clean_text(text)
+    return [token for token in text.split(" ") if len(token) > 1]
+
+
+def has_ideal_answer(ideal_answer):
+    return isinstance(ideal_answer, str) and bool(ideal_answer) and ideal_answer != "TO_BE_ADDED"
+
+
+class RunningSimilarity:
+    """
+    Cosine similarity of a growing answer against one ideal TF-IDF vector.
+
+    Term counts are updated one token at a time, and the dot product and
+    squared norm along with them, so each token costs O(1) whatever the
+    answer's length. ``value(pending)`` also counts a token that is not
+    final yet (the word being typed) without committing it.
+    """
+
+    def __init__(self, vocabulary, idf, ideal):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.ideal = ideal   # column -> ideal weight, for the ideal's non-zero terms
+        self.counts = {}
+        self.dot = 0.0
+        self.norm2 = 0.0
+
+    def _step(self, column):
+        # (count + 1)^2 - count^2 = 2 * count + 1
+        idf = float(self.idf[column])
+        return idf * self.ideal.get(column, 0.0), idf * idf * (2 * self.counts.get(column, 0) + 1)
+
+    def add(self, token):
+        column = self.vocabulary.get(token)
+        if column is None:
+            return
+
+        dot, norm2 = self._step(column)
+        self.dot += dot
+        self.norm2 += norm2
+        self.counts[column] = self.counts.get(column, 0) + 1
+
+    def value(self, pending=None):
+        dot, norm2 = self.dot, self.norm2
+
+        column = self.vocabulary.get(pending) if pending else None
+        if column is not None:
+            step_dot, step_norm2 = self._step(column)
+            dot += step_dot
+            norm2 += step_norm2
+
+        return dot / math.sqrt(norm2) if norm2 > 0 else 0.0
+
+
+class RoleModel:
+    """
+    TF-IDF model fitted over every ideal answer of one role.
+
+    Ideal answers are vectorized once at fit time and kept as one sorted
+    sparse index, so scoring an answer only tokenizes it against the fitted
+    vocabulary and looks up the matching ideal weights.
+    """
+
+    def __init__(self, questions):
+        # scikit-learn is slow to import; only fitting needs it, scoring does not
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        ids = []
+        corpus = []
+
+        for question in questions:
+            if has_ideal_answer(question.get("ideal_answer")):
+                ids.append(question.get("question_id"))
+                corpus.append(clean_text(question["ideal_answer"]))
+
+        self.vectorizer = TfidfVectorizer()
+        self.ideal_matrix = self.vectorizer.fit_transform(corpus).tocsr()
+        self.ideal_matrix.sort_indices()
+        self.index = {question_id: row for row, question_id in enumerate(ids)}
+
+        self._vocabulary = self.vectorizer.vocabulary_
+        self._idf = self.vectorizer.idf_
+        self._n_features = len(self._vocabulary)
+
+        # (row, term) of every ideal entry flattened into one sorted key array
+        entry_rows = np.repeat(np.arange(len(ids), dtype=np.int64), np.diff(self.ideal_matrix.indptr))
+        self._ideal_keys = entry_rows * self._n_features + self.ideal_matrix.indices
+        self._ideal_weights = self.ideal_matrix.data
+
+    def __contains__(self, question_id):
+        return question_id in self.index
+
+    def transform(self, user_answers, cleaned=False):
+        """
+        Sparse TF-IDF weights of the answers as (rows, terms, weights)
+        triplets, un-normalized. ``cleaned=True`` skips ``clean_text`` for
+        answers that already went through it.
+        """
+        vocabulary = self._vocabulary
+        rows = []
+        terms = []
+        counts = []
+
+        for row, answer in enumerate(user_answers):
+            for term, count in Counter(tokenize(answer, cleaned)).items():
+                column = vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    terms.append(column)
+                    counts.append(count)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        terms = np.asarray(terms, dtype=np.int64)
+        weights = np.asarray(counts, dtype=np.float64) * self._idf[terms]
+
+        return rows, terms, weights
+
+    def similarities(self, question_ids, user_answers, cleaned=False):
+        """Row-wise cosine similarity of each answer against its question's ideal vector."""
+        n = len(user_answers)
+        rows, terms, weights = self.transform(user_answers, cleaned)
+
+        # ideal weight of every answer term, looked up in the sorted (row, term) keys
+        ideal_rows = np.asarray([self.index[question_id] for question_id in question_ids], dtype=np.int64)
+        keys = ideal_rows[rows] * self._n_features + terms
+        positions = np.searchsorted(self._ideal_keys, keys)
+        positions[positions == len(self._ideal_keys)] = 0
+        ideal = np.where(self._ideal_keys[positions] == keys, self._ideal_weights[positions], 0.0)
+
+        # bincount accumulates each row in order, so a row's score does not depend on the batch
+        dots = np.bincount(rows, weights * ideal, minlength=n)
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=n))
+
+        return np.divide(dots, norms, out=np.zeros(n), where=norms > 0)
+
+    def similarity(self, question_id, user_answer, cleaned=False):
+        return float(self.similarities([question_id], [user_answer], cleaned)[0])
+
+    def running(self, question_id):
+        """A ``RunningSimilarity`` against the ideal answer of ``question_id``."""
+        row = self.index[question_id]
+        start, end = self.ideal_matrix.indptr[row], self.ideal_matrix.indptr[row + 1]
+        ideal = dict(zip(self.ideal_matrix.indices[start:end].tolist(), self.ideal_matrix.data[start:end].tolist()))
+        return RunningSimilarity(self._vocabulary, self._idf, ideal)
+
+
+class SimilarityEngine:
+    """
+    Per-role TF-IDF models over a question bank.
+
+    Models are fitted lazily on first use and dropped when the bank reloads,
+    so only ``transform`` runs at request time.
+    """
+
+    def __init__(self, bank):
+        self.bank = bank
+        self._version = None
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @property
+    def scoring_version(self):
+        """Everything besides the answer and question that scores depend on (see ``app.eval_cache``)."""
+        return f"tfidf/{self.bank.stamp}"
+
+    def model(self, role):
+        """The fitted model for ``role``, or None if it has no ideal answers."""
+        self.bank.refresh()
+        version = self.bank.version
+        models = self._models
+
+        if version != self._version or role not in models:
+            with self._lock:
+                if version != self._version:
+                    self._models = {}
+                    self._version = version
+
+                models = self._models
+                if role not in models:
+                    models[role] = self._fit(role)
+
+        return models[role]
+
+    def _fit(self, role):
+        questions = self.bank.role_questions(role)
+
+        if not any(has_ideal_answer(q.get("ideal_answer")) for q in questions):
+            return None
+
+        return RoleModel(questions)
+
+    def similarity(self, role, question_id, user_answer, cleaned=False):
+        """Cosine similarity (0–1), or None if the question is not in the bank."""
+        model = self.model(role)
+        if model is None or question_id not in model:
+            return None
+
+        return model.similarity(question_id, user_answer, cleaned)
+
+
+# ------------------ SHARED INSTANCE ------------------ #
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_similarity_engine(bank=None):
+    """Return the process-wide engine for ``bank`` (default: the shared bank), per ``SCORING_MODE``."""
+    if bank is None:
+        bank = get_question_bank()
+
+    engine = _engines.get(bank)
+
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(bank)
+            if engine is None:
+                if SCORING_MODE == "semantic":
+                    from app.semantic import semantic_engine_from_env
+                    engine = semantic_engine_from_env(bank)
+                elif SCORING_MODE == "tfidf":
+                    engine = SimilarityEngine(bank)
+                else:
+                    raise ValueError(f"Unknown SCORING_MODE {SCORING_MODE!r}")
+                _engines[bank] = engine
+
+    return engine
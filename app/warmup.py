@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from app.metrics import Gauge
+from app.question_bank import get_question_bank
+from app.session import parse_keywords
+from app.similarity import has_ideal_answer
+
+
+WARMUP_SECONDS = Gauge(
+    "warmup_duration_seconds",
+    "Time the startup warm-up took (0 until it finishes)",
+)
+
+READY = Gauge(
+    "ready",
+    "1 once the startup warm-up has finished, else 0",
+)
+
+SYNTHETIC_ANSWER = "A model that overfits memorizes noise in the training data and generalizes poorly."
+
+
+def _sample_questions(bank):
+    # one question with an ideal answer per role: enough to touch every role's model
+    for role in bank.roles():
+        for question in bank.role_questions(role):
+            if has_ideal_answer(question.get("ideal_answer")):
+                yield role, question
+                break
+
+
+class WarmUp:
+    """
+    Startup warm-up behind the readiness probe.
+
+    Loads the question bank, starts the grading pool (which fits every
+    role's TF-IDF model in each worker) and grades synthetic answers
+    through ``evaluate_answer``, on both the bank-model and the ad-hoc
+    path, so the first real submit pays for none of it.
+    """
+
+    def __init__(self, grading_pool, bank=None):
+        self.grading_pool = grading_pool
+        self.bank = bank
+        self.ready = False
+        self.error = None
+        self.duration = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        try:
+            bank = self.bank if self.bank is not None else get_question_bank()
+            await loop.run_in_executor(None, bank.refresh)
+            await loop.run_in_executor(None, self.grading_pool.start)
+
+            calls = []
+            for role, question in _sample_questions(bank):
+                keywords = parse_keywords(question.get("keywords", ""))
+                calls.append(self.grading_pool.evaluate(
+                    SYNTHETIC_ANSWER, question["ideal_answer"], keywords, question.get("question_id"), role
+                ))
+
+            # ad-hoc questions take the two-document TF-IDF path; give every worker one
+            for _ in range(self.grading_pool.workers):
+                calls.append(self.grading_pool.evaluate(
+                    SYNTHETIC_ANSWER, SYNTHETIC_ANSWER, ["overfitting", "generalization"]
+                ))
+
+            await asyncio.gather(*calls)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            return
+
+        self.duration = time.perf_counter() - started
+        self.ready = True
+        WARMUP_SECONDS.set(round(self.duration, 3))
+        READY.set(1)
+
+    def skip(self):
+        """Fast-start mode: serve at once and warm up lazily on first use."""
+        self.duration = 0.0
+        self.ready = True
+        READY.set(1)
+
+    def status(self):
+        if self.ready:
+            return {"status": "ready", "warmup_seconds": round(self.duration, 3)}
+        if self.error is not None:
+            return {"status": "failed", "error": self.error}
+        return {"status": "warming_up"}
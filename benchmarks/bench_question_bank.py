@@ -0,0 +1,79 @@
+"""
+Start-session latency and per-session memory: per-session CSV parse vs the shared question bank.
+
+    python -m benchmarks.bench_question_bank
+    python -m benchmarks.bench_question_bank --sizes 10000 1000000
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from app.question_bank import QuestionBank
+from app.session import InterviewSession
+from benchmarks.synthetic import ROLES, write_question_bank
+
+
+def _legacy_start_session(path, role):
+    # what InterviewSession.__init__ used to do on every /start-session
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip().str.lower()
+    questions = df[df["role"] == role].to_dict("records")
+    random.shuffle(questions)
+    return questions
+
+
+def _time(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(samples):
+    return f"median {statistics.median(samples):9.3f} ms   max {max(samples):9.3f} ms   (n={len(samples)})"
+
+
+def run(sizes, repeats, legacy_repeats):
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = Path(tmp) / f"bank_{size}.csv"
+            write_question_bank(path, size)
+            role = ROLES[0]
+
+            print(f"\n{size:,} questions ({path.stat().st_size / 1e6:.1f} MB)")
+
+            legacy = _time(lambda: _legacy_start_session(path, role), legacy_repeats)
+            print(f"  per-session read_csv   {_summary(legacy)}")
+
+            bank = QuestionBank(str(path))
+            load = _time(lambda: bank.refresh(force=True), 1)
+            print(f"  shared bank first load {_summary(load)}")
+
+            shared = _time(lambda: InterviewSession(role, bank=bank), repeats)
+            print(f"  shared bank session    {_summary(shared)}")
+
+            # what each live session adds on top of the shared bank
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            sessions = [InterviewSession(role, bank=bank) for _ in range(1000)]
+            per_session = (tracemalloc.get_traced_memory()[0] - before) / len(sessions)
+            tracemalloc.stop()
+            print(f"  memory per session     {per_session / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--legacy-repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.sizes, args.repeats, args.legacy_repeats)
@@ -0,0 +1,60 @@
+"""
+Per-submit similarity cost: two-document TF-IDF fit vs the corpus-fitted engine.
+
+    python -m benchmarks.bench_similarity
+    python -m benchmarks.bench_similarity --bank-size 10000 --answer-words 5 200 2000
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.evaluator import compute_similarity
+from app.question_bank import QuestionBank
+from app.similarity import SimilarityEngine
+from benchmarks.synthetic import ROLES, generate_answer, write_question_bank
+
+
+def _per_call_ms(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(bank_size, answer_words, repeats):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_question_bank(Path(tmp) / "bank.csv", bank_size)
+        bank = QuestionBank(str(path))
+        engine = SimilarityEngine(bank)
+
+        role = ROLES[0]
+        question = bank.role_questions(role)[0]
+
+        start = time.perf_counter()
+        engine.model(role)
+        fit_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{bank_size:,}-question bank, one-off fit for {role!r}: {fit_ms:.1f} ms\n")
+        print(f"{'words':>6}  {'2-doc fit':>12}  {'engine':>12}  {'speedup':>8}")
+
+        for n_words in answer_words:
+            answer = generate_answer(n_words, seed=n_words)
+
+            legacy = _per_call_ms(lambda: compute_similarity(answer, question["ideal_answer"]), repeats)
+            fitted = _per_call_ms(lambda: engine.similarity(role, question["question_id"], answer), repeats)
+
+            print(f"{n_words:>6}  {legacy:>9.3f} ms  {fitted:>9.3f} ms  {legacy / fitted:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bank-size", type=int, default=10_000)
+    parser.add_argument("--answer-words", type=int, nargs="+", default=[5, 50, 200, 2000])
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.bank_size, args.answer_words, args.repeats)
@@ -0,0 +1,149 @@
+"""
+/next-question latency while /submit-answer load ramps up.
+
+Starts the API with uvicorn, then for each submit concurrency level keeps
+that many candidates submitting long answers back to back while a probe
+polls /next-question and records its latency.
+
+    python -m benchmarks.load_next_question
+    python -m benchmarks.load_next_question --executor thread --levels 0 4 16 --json out.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.synthetic import generate_answer
+
+
+ROLE = "Data Scientist"
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def _new_session(client):
+    response = await client.post("/start-session", params={"role": ROLE})
+    return response.json()["session_id"]
+
+
+async def _submitter(client, answer, stop, counter):
+    session_id = await _new_session(client)
+    question = (await client.get("/next-question", params={"session_id": session_id})).json()
+
+    while not stop.is_set():
+        await client.post("/submit-answer", json={
+            "session_id": session_id,
+            "user_answer": answer,
+            "question_data": question,
+        })
+        counter[0] += 1
+
+
+async def _probe(client, stop, latencies, interval):
+    session_id = await _new_session(client)
+
+    while not stop.is_set():
+        start = time.perf_counter()
+        question = (await client.get("/next-question", params={"session_id": session_id})).json()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        if question is None:
+            session_id = await _new_session(client)
+
+        await asyncio.sleep(interval)
+
+
+async def _run_level(base_url, concurrency, duration, answer, interval):
+    limits = httpx.Limits(max_connections=concurrency + 8)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        stop = asyncio.Event()
+        latencies = []
+        submits = [0]
+
+        tasks = [asyncio.create_task(_submitter(client, answer, stop, submits)) for _ in range(concurrency)]
+        tasks.append(asyncio.create_task(_probe(client, stop, latencies, interval)))
+
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    return {
+        "submit_concurrency": concurrency,
+        "submits_per_s": round(submits[0] / duration, 1),
+        "next_question_p50_ms": round(statistics.median(latencies), 2),
+        "next_question_p99_ms": round(percentile(latencies, 99), 2),
+        "next_question_samples": len(latencies),
+    }
+
+
+def _start_server(port, executor, workers):
+    env = dict(os.environ, GRADING_EXECUTOR=executor)
+    if workers:
+        env["GRADING_WORKERS"] = str(workers)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/session-stats", timeout=1)
+            return server, base_url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+
+    server.terminate()
+    raise RuntimeError("API did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[0, 2, 4, 8, 16])
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per level")
+    parser.add_argument("--answer-words", type=int, default=400)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--port", type=int, default=8077)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    answer = generate_answer(args.answer_words)
+    server, base_url = _start_server(args.port, args.executor, args.workers)
+
+    try:
+        results = []
+        print(f"{'submitters':>10}  {'submits/s':>9}  {'p50 ms':>8}  {'p99 ms':>8}")
+        for level in args.levels:
+            row = asyncio.run(_run_level(base_url, level, args.duration, answer, args.probe_interval))
+            results.append(row)
+            print(
+                f"{level:>10}  {row['submits_per_s']:>9}  "
+                f"{row['next_question_p50_ms']:>8}  {row['next_question_p99_ms']:>8}"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"executor": args.executor, "levels": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
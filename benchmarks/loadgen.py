@@ -0,0 +1,260 @@
+"""
+Load generator for the interview flow: how many concurrent candidates one box handles.
+
+Every virtual candidate runs whole interviews back to back:
+/start-session, then N x (/next-question, think, /submit-answer), then
+/get-results. By default the API runs in-process over ASGI; ``--url``
+points at a running server instead. Nothing leaves the machine.
+
+    python -m benchmarks.loadgen --candidates 50 --duration 30
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 --think-time 2 --answer-words lognormal:60:0.8
+    python -m benchmarks.loadgen --candidates 20 --interviews 200 --json load.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import sys
+import time
+
+import httpx
+
+from benchmarks.synthetic import WORDS
+
+
+ENDPOINTS = ("/start-session", "/next-question", "/submit-answer", "/get-results")
+
+
+# ------------------ WORKLOAD ------------------ #
+
+def parse_length_distribution(spec):
+    """
+    Answer length sampler from ``fixed:N``, ``uniform:LO:HI`` or
+    ``lognormal:MEDIAN:SIGMA`` (clipped to 1-2000 words).
+    """
+    kind, *params = spec.split(":")
+    try:
+        params = [float(p) for p in params]
+        if kind == "fixed" and len(params) == 1:
+            return lambda rng: int(params[0])
+        if kind == "uniform" and len(params) == 2:
+            return lambda rng: rng.randint(int(params[0]), int(params[1]))
+        if kind == "lognormal" and len(params) == 2:
+            mu = math.log(params[0])
+            return lambda rng: min(2000, max(1, round(rng.lognormvariate(mu, params[1]))))
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(f"bad answer length distribution {spec!r}")
+
+
+def make_answer(rng, question, n_words):
+    # mostly the question's own vocabulary, so keyword and TF-IDF scoring do real work
+    vocabulary = (str(question.get("ideal_answer") or "") + " " + str(question.get("keywords") or "")).split()
+    vocabulary = vocabulary + WORDS if vocabulary else WORDS
+    return " ".join(rng.choice(vocabulary) for _ in range(n_words))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# ------------------ RUNNER ------------------ #
+
+class Stats:
+
+    def __init__(self):
+        self.latencies = {endpoint: [] for endpoint in ENDPOINTS}
+        self.errors = {endpoint: 0 for endpoint in ENDPOINTS}
+        self.error_samples = []
+        self.interviews = 0
+
+    async def call(self, endpoint, request):
+        start = time.perf_counter()
+        body = None
+        try:
+            response = await request
+            body = response.json()
+            failed = response.status_code >= 400 or (isinstance(body, dict) and "error" in body)
+            reason = body.get("error") if isinstance(body, dict) else None
+            reason = reason or (f"HTTP {response.status_code}" if failed else None)
+        except (httpx.HTTPError, ValueError) as e:
+            failed, reason = True, f"{type(e).__name__}: {e}"
+
+        self.latencies[endpoint].append((time.perf_counter() - start) * 1000)
+        if failed:
+            self.errors[endpoint] += 1
+            if len(self.error_samples) < 20:
+                self.error_samples.append({"endpoint": endpoint, "error": reason})
+            return None
+        return body
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for endpoint, samples in self.latencies.items():
+            if not samples:
+                continue
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": self.errors[endpoint],
+                "error_rate": round(self.errors[endpoint] / len(samples), 4),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+                "mean_ms": round(statistics.fmean(samples), 2),
+            }
+
+        requests = sum(len(samples) for samples in self.latencies.values())
+        errors = sum(self.errors.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "interviews_completed": self.interviews,
+            "interviews_per_s": round(self.interviews / elapsed, 2),
+            "requests": requests,
+            "requests_per_s": round(requests / elapsed, 1),
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "endpoints": endpoints,
+            "error_samples": self.error_samples,
+        }
+
+
+async def candidate(client, stats, args, rng, stop, budget):
+    while not stop.is_set() and budget.take():
+        role = rng.choice(args.roles)
+        started = await stats.call("/start-session", client.post("/start-session", params={"role": role}))
+        if started is None:
+            continue
+        session_id = started["session_id"]
+
+        for _ in range(args.questions):
+            question = await stats.call("/next-question", client.get("/next-question", params={"session_id": session_id}))
+            if not question:
+                break
+
+            if args.think_time:
+                await asyncio.sleep(rng.expovariate(1 / args.think_time))
+
+            answer = make_answer(rng, question, args.answer_length(rng))
+            await stats.call("/submit-answer", client.post("/submit-answer", json={
+                "session_id": session_id,
+                "user_answer": answer,
+                "question_data": question,
+            }))
+
+            if stop.is_set():
+                break
+
+        await stats.call("/get-results", client.get("/get-results", params={"session_id": session_id}))
+        stats.interviews += 1
+
+
+class InterviewBudget:
+    """Hands out at most ``total`` interview starts (unlimited when None)."""
+
+    def __init__(self, total):
+        self.remaining = total
+
+    def take(self):
+        if self.remaining is None:
+            return True
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+async def wait_until_ready(client, timeout=300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/readyz")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("API did not become ready")
+
+
+async def drive(client, args):
+    await wait_until_ready(client)
+
+    stats = Stats()
+    stop = asyncio.Event()
+    budget = InterviewBudget(args.interviews)
+    rngs = [random.Random(args.seed * 100_003 + i) for i in range(args.candidates)]
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(candidate(client, stats, args, rng, stop, budget)) for rng in rngs]
+
+    if args.interviews is None:
+        await asyncio.sleep(args.duration)
+        stop.set()   # candidates fetch results for the interview they are in, then stop
+    await asyncio.gather(*tasks)
+
+    return stats.summary(time.perf_counter() - start)
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.candidates + 4)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            return await drive(client, args)
+
+    # in-process: the real app, its lifespan (warm-up, pools) included, over ASGI
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=args.timeout) as client:
+            return await drive(client, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="running API to target (default: in-process ASGI)")
+    parser.add_argument("--candidates", type=int, default=10, help="concurrent virtual candidates")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to start new interviews for")
+    parser.add_argument("--interviews", type=int, default=None, help="run exactly this many interviews instead")
+    parser.add_argument("--questions", type=int, default=5, help="questions per interview")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean seconds before answering (exponential)")
+    parser.add_argument("--answer-words", default="lognormal:60:0.8",
+                        help="fixed:N | uniform:LO:HI | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--roles", nargs="+", default=["Data Scientist"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    parser.add_argument("--json", help="write the report to this file (default: stdout)")
+    args = parser.parse_args()
+
+    try:
+        args.answer_length = parse_length_distribution(args.answer_words)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    report = asyncio.run(run(args))
+    report["config"] = {
+        "target": args.url or "in-process",
+        "candidates": args.candidates,
+        "duration_s": args.duration if args.interviews is None else None,
+        "interviews": args.interviews,
+        "questions": args.questions,
+        "think_time_s": args.think_time,
+        "answer_words": args.answer_words,
+        "roles": args.roles,
+        "seed": args.seed,
+    }
+
+    output = json.dumps(report, indent=4)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    return 1 if report["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Import-time budget check for the API and worker entry points.
+
+Imports each entry module in a fresh interpreter under ``python -X importtime``
+and fails (exit code 1) if it takes longer than its budget or drags in a
+heavy dependency that should only load on the code path that needs it.
+
+    python -m benchmarks.startup_budget
+    python -m benchmarks.startup_budget --scale 2 --json startup.json
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ("sklearn", "scipy", "pandas", "matplotlib", "reportlab")
+
+# module -> (budget in ms, top-level packages it must not import)
+BUDGETS = {
+    "main": (1500, HEAVY),
+    "app.session": (400, HEAVY),
+    "app.grading_pool": (500, HEAVY),
+    "app.evaluator": (300, HEAVY),
+    "utils.report_exporter": (100, HEAVY),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def measure(module):
+    """Cumulative import time (ms) of ``module`` and every module it imported."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{process.stderr}")
+
+    imported = set()
+    total_us = None
+
+    for line in process.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+
+        _, cumulative, indent, name = match.groups()
+        imported.add(name.split(".")[0])
+        if not indent and name == module:
+            total_us = int(cumulative)
+
+    return total_us / 1000, imported
+
+
+def check(budgets, repeats=3, scale=1.0):
+    results = {}
+
+    for module, (budget_ms, forbidden) in budgets.items():
+        # best of a few runs: the budget is about import work, not a noisy box
+        runs = [measure(module) for _ in range(repeats)]
+        import_ms = min(ms for ms, _ in runs)
+        pulled_in = sorted(set(forbidden) & runs[0][1])
+        limit = budget_ms * scale
+
+        results[module] = {
+            "import_ms": round(import_ms, 1),
+            "budget_ms": limit,
+            "heavy_imports": pulled_in,
+            "ok": import_ms <= limit and not pulled_in,
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow machines)")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = check(BUDGETS, repeats=args.repeats, scale=args.scale)
+
+    print(f"{'module':<24}  {'import':>9}  {'budget':>9}  heavy imports")
+    for module, result in results.items():
+        flag = "" if result["ok"] else "  FAIL"
+        heavy = ", ".join(result["heavy_imports"]) or "-"
+        print(f"{module:<24}  {result['import_ms']:>6.1f} ms  {result['budget_ms']:>6.0f} ms  {heavy}{flag}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+    return 0 if all(result["ok"] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
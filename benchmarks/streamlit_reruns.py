@@ -0,0 +1,260 @@
+"""
+Rerun latency and idle CPU of the Streamlit front end.
+
+Drives ``frontend/streamlit_app.py`` headlessly with Streamlit's ``AppTest``
+through a whole interview (open the app, start an interview, submit
+answers, view the dashboard twice) and times every rerun. The first pass
+is cold (cached resources are built); later passes show the warm cost a
+user actually waits for. Every step also records how far it reran: whether
+the whole script ran or only the answer fragment, and whether an answer
+was graded. Then it starts ``streamlit run`` and measures the server's CPU
+time while nobody uses it (Linux: read from /proc).
+
+    python -m benchmarks.streamlit_reruns
+    python -m benchmarks.streamlit_reruns --passes 5 --answers 5 --idle-seconds 20 --json reruns.json
+    python -m benchmarks.streamlit_reruns --idle-seconds 0 --file-watcher none --strict
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.synthetic import generate_answer
+
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "frontend" / "streamlit_app.py"
+
+
+# ------------------ RERUN LATENCY AND SCOPE ------------------ #
+
+class RerunCounter:
+    """
+    Counts, while active, what the app does on each rerun:
+
+    - ``full_runs``: top-level script runs, seen as calls to the page menu,
+      which only the top level renders. A fragment rerun makes none.
+    - ``gradings``: answers graded (``InterviewSession.evaluate_answer``).
+
+    It patches both functions in place. The app picks up the menu patch
+    because its script imports ``option_menu`` again on every run.
+    """
+
+    def __init__(self):
+        self.full_runs = 0
+        self.gradings = 0
+        self._restore = []
+
+    def _wrap(self, owner, name, counter):
+        original = getattr(owner, name)
+
+        def counted(*args, **kwargs):
+            setattr(self, counter, getattr(self, counter) + 1)
+            return original(*args, **kwargs)
+
+        setattr(owner, name, counted)
+        self._restore.append((owner, name, original))
+
+    def __enter__(self):
+        import streamlit_option_menu
+
+        from app.session import InterviewSession
+
+        self._wrap(streamlit_option_menu, "option_menu", "full_runs")
+        self._wrap(InterviewSession, "evaluate_answer", "gradings")
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self._restore):
+            setattr(owner, name, original)
+        self._restore.clear()
+
+    def snapshot(self):
+        return self.full_runs, self.gradings
+
+
+def _timed(samples, scope, counter, name, run):
+    before = counter.snapshot()
+    start = time.perf_counter()
+    at = run()
+    samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+    if at.exception:
+        raise RuntimeError(f"{name}: the app raised {at.exception[0].value}")
+
+    full_runs, gradings = (after - was for after, was in zip(counter.snapshot(), before))
+    step = scope.setdefault(name, {"steps": 0, "full_runs": 0, "gradings": 0})
+    step["steps"] += 1
+    step["full_runs"] += full_runs
+    step["gradings"] += gradings
+    return at
+
+
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def interview_pass(samples, scope, counter, role, answers):
+    """
+    One user's interview. Appends each step's rerun time (ms) to
+    ``samples`` and adds its full script runs and gradings to ``scope``.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=120)
+    _timed(samples, scope, counter, "open_home", at.run)
+
+    at.query_params["page"] = "Start Interview"
+    _timed(samples, scope, counter, "open_interview_page", at.run)
+
+    at.selectbox[0].select(role)
+    _timed(samples, scope, counter, "start_interview", _button(at, "Start Interview 🚀").click().run)
+
+    for answer in answers:
+        if not at.text_area:
+            break   # out of questions
+
+        # something else reruns the page mid-answer: the unsubmitted form must not be graded
+        at.text_area[0].input(answer)
+        _timed(samples, scope, counter, "rerun_while_typing", at.run)
+
+        # submitting reruns the answer fragment only
+        at.text_area[0].input(answer)
+        _timed(samples, scope, counter, "submit_answer", _button(at, "Submit Answer").click().run)
+
+    at.query_params["page"] = "Dashboard"
+    _timed(samples, scope, counter, "open_dashboard", at.run)
+    # nothing changed since: the derived data and figure come from the cache
+    _timed(samples, scope, counter, "dashboard_rerun", at.run)
+
+
+def scope_problems(scope):
+    """What the reruns did beyond their intended scope; empty when the fragment and form work as intended."""
+    problems = []
+
+    submit = scope.get("submit_answer")
+    if submit:
+        if submit["full_runs"]:
+            problems.append(f"{submit['full_runs']} of {submit['steps']} submits reran the whole script")
+        if submit["gradings"] != submit["steps"]:
+            problems.append(f"{submit['steps']} submits graded {submit['gradings']} answers")
+
+    typing = scope.get("rerun_while_typing")
+    if typing and typing["gradings"]:
+        problems.append(f"{typing['gradings']} unsubmitted answers were graded")
+
+    return problems
+
+
+def _summary(values):
+    ordered = sorted(values)
+    return {
+        "cold_ms": round(values[0], 2),
+        "median_ms": round(statistics.median(ordered[1:] or ordered), 2),
+        "max_ms": round(ordered[-1], 2),
+        "n": len(values),
+    }
+
+
+# ------------------ IDLE CPU ------------------ #
+
+def _cpu_seconds(pid):
+    # utime + stime of the process, from /proc/<pid>/stat (fields 14 and 15)
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def idle_cpu(seconds, port, file_watcher):
+    """Share of one core the server uses while idle, after it finished starting."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP),
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", file_watcher, "--browser.gatherUsageStats", "false"],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        deadline = time.monotonic() + 120
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("Streamlit did not start")
+                time.sleep(0.2)
+
+        time.sleep(2.0)   # let start-up work settle
+        start_cpu, start = _cpu_seconds(server.pid), time.monotonic()
+        time.sleep(seconds)
+        cpu, elapsed = _cpu_seconds(server.pid) - start_cpu, time.monotonic() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "idle_seconds": round(elapsed, 1),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_percent": round(100 * cpu / elapsed, 2),
+        "file_watcher": file_watcher,
+    }
+
+
+# ------------------ CLI ------------------ #
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--passes", type=int, default=3, help="interviews run; the first one is cold")
+    parser.add_argument("--answers", type=int, default=3, help="answers submitted per interview")
+    parser.add_argument("--answer-words", type=int, default=60)
+    parser.add_argument("--role", default="Data Scientist")
+    parser.add_argument("--idle-seconds", type=float, default=10.0, help="0 skips the idle CPU measurement")
+    parser.add_argument("--file-watcher", default="auto", help="server.fileWatcherType for the idle run")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--strict", action="store_true", help="exit 1 if a rerun went beyond its intended scope")
+    args = parser.parse_args()
+
+    answers = [generate_answer(args.answer_words, seed=i) for i in range(args.answers)]
+
+    samples, scope = {}, {}
+    with RerunCounter() as counter:
+        for _ in range(args.passes):
+            interview_pass(samples, scope, counter, args.role, answers)
+
+    problems = scope_problems(scope)
+    results = {
+        "reruns": {name: {**_summary(values), **scope[name]} for name, values in samples.items()},
+        "scope_problems": problems,
+    }
+
+    print(f"{'rerun':<22} {'cold ms':>9} {'median ms':>10} {'max ms':>9} {'full runs':>10} {'gradings':>9}")
+    for name, row in results["reruns"].items():
+        print(f"{name:<22} {row['cold_ms']:>9.1f} {row['median_ms']:>10.1f} {row['max_ms']:>9.1f} "
+              f"{row['full_runs']:>6}/{row['steps']:<3} {row['gradings']:>9}")
+
+    print("\nrerun scope: " + ("; ".join(problems) if problems else "submits reran only the answer fragment, "
+                                                                     "unsubmitted answers were not graded"))
+
+    if args.idle_seconds > 0:
+        results["idle"] = idle_cpu(args.idle_seconds, args.port, args.file_watcher)
+        print(f"\nidle server: {results['idle']['cpu_percent']}% of a core "
+              f"over {results['idle']['idle_seconds']} s (file watcher: {args.file_watcher})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+    if args.strict and problems:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
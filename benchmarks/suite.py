@@ -0,0 +1,320 @@
+"""
+Reproducible benchmark suite: scoring, sessions, results and report export.
+
+Every case runs on synthetic data from ``benchmarks.synthetic`` with fixed
+seeds, and the results are written as JSON. ``compare`` checks a run
+against a stored baseline and exits non-zero if any case got slower.
+
+    python -m benchmarks.suite run --json bench.json
+    python -m benchmarks.suite run --quick --json bench.json --baseline baseline.json
+    python -m benchmarks.suite compare baseline.json bench.json --threshold 0.15
+
+The 1M-question scale writes a ~150 MB CSV bank (about a minute on its
+own); pass ``--data-dir`` to keep the generated banks between runs.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from app.analytics import Cohort, PerformanceAnalyzer
+from app.evaluator import compute_similarity, evaluate_answer, keyword_match_score
+from app.feedback import FeedbackGenerator
+from app.question_bank import QuestionBank
+from app.semantic import SemanticModel
+from app.session import InterviewSession, parse_keywords
+from app.similarity import SimilarityEngine
+from benchmarks.synthetic import ROLES, TOPICS, generate_answer, write_question_bank
+from utils.report_exporter import export_report_json, export_report_pdf
+
+
+BANK_SIZES = [100, 10_000, 1_000_000]
+ANSWER_WORDS = [5, 50, 500, 2000]
+RESPONSE_COUNTS = [10, 1000]
+COHORT_SESSIONS = [1000, 10_000]
+
+QUICK_BANK_SIZES = [100, 10_000]
+QUICK_REPEATS = 10
+
+
+# ------------------ TIMING ------------------ #
+
+def _time(fn, repeats):
+    fn()   # warm-up call, not recorded
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 4),
+        "min_ms": round(ordered[0], 4),
+        "n": len(ordered),
+    }
+
+
+# ------------------ FIXTURES ------------------ #
+
+def _bank_path(data_dir, size, seed):
+    path = Path(data_dir) / f"bank_{size}_seed{seed}.csv"
+    if not path.exists():
+        write_question_bank(path, size, seed=seed)
+    return path
+
+
+def _session_with_responses(bank, n_responses, seed):
+    session = InterviewSession(ROLES[0], bank=bank)
+    for i in range(n_responses):
+        score = (i * 37 + seed) % 101
+        session.record_response(
+            {"question_id": f"Q{i}", "question": "", "topic": TOPICS[i % len(TOPICS)]},
+            {"score": score, "confidence": score, "keyword_match": score,
+             "matched_keywords": [], "missing_keywords": [], "feedback": ""}
+        )
+    return session
+
+
+def _cohort_rows(n_sessions, seed, responses_per_session=12):
+    return [
+        (f"s{i}", ROLES[i % len(ROLES)], float(i), TOPICS[(i + j) % len(TOPICS)], (i * 37 + j * 11 + seed) % 101)
+        for i in range(n_sessions)
+        for j in range(responses_per_session)
+    ]
+
+
+def _report():
+    report = {
+        "role": ROLES[0],
+        "overall_score": 64.5,
+        "confidence_score": 71.0,
+        "topic_scores": {topic: 40 + 9 * i for i, topic in enumerate(TOPICS)},
+    }
+    report["classification"] = {
+        "strong": [t for t, s in report["topic_scores"].items() if s >= 75],
+        "weak": [t for t, s in report["topic_scores"].items() if s <= 60],
+    }
+    return report, FeedbackGenerator(report).generate_feedback()
+
+
+# ------------------ CASES ------------------ #
+
+@contextmanager
+def _eval_cache(value):
+    # the suite runs in-process: leave the caller's EVAL_CACHE as it found it
+    original = os.environ.get("EVAL_CACHE")
+    os.environ["EVAL_CACHE"] = value
+    try:
+        yield
+    finally:
+        if original is None:
+            os.environ.pop("EVAL_CACHE", None)
+        else:
+            os.environ["EVAL_CACHE"] = original
+
+
+def run_suite(bank_sizes, answer_words, repeats, data_dir, seed=0, log=print):
+    results = {}
+
+    def record(name, fn, n=repeats):
+        results[name] = _summary(_time(fn, n))
+        log(f"  {name:<45} median {results[name]['median_ms']:>10.3f} ms")
+
+    answers = {n_words: generate_answer(n_words, seed=seed + n_words) for n_words in answer_words}
+    role = ROLES[0]
+
+    # repeats would all be cache hits: time the grading itself (cached lookups have their own case)
+    with _eval_cache("0"):
+        for size in bank_sizes:
+            log(f"\n{size:,}-question bank")
+            bank = QuestionBank(str(_bank_path(data_dir, size, seed)))
+            engine = SimilarityEngine(bank)
+            question = bank.role_questions(role)[0]
+            keywords = parse_keywords(question["keywords"])
+            engine.model(role)
+
+            if size == bank_sizes[0]:
+                # these do not depend on the bank, so only run them once
+                for n_words, answer in answers.items():
+                    record(f"compute_similarity/{n_words}w",
+                           lambda: compute_similarity(answer, question["ideal_answer"]))
+                    record(f"keyword_match_score/{n_words}w",
+                           lambda: keyword_match_score(answer, keywords, bank, role, question["question_id"]))
+
+                semantic = SemanticModel.fit(bank)
+                key = (role, question["question_id"])
+                for n_words, answer in answers.items():
+                    record(f"semantic_similarity/{n_words}w", lambda: semantic.similarities([key], [answer]))
+                batch = [answers[n_words] for n_words in answer_words] * (1000 // len(answer_words))
+                record(f"semantic_similarity/batch{len(batch)}",
+                       lambda: semantic.similarities([key] * len(batch), batch))
+
+            for n_words, answer in answers.items():
+                record(f"evaluate_answer/{size}q/{n_words}w",
+                       lambda: evaluate_answer(answer, question["ideal_answer"], keywords,
+                                               question_id=question["question_id"], role=role, engine=engine))
+
+            if size == bank_sizes[0]:
+                with _eval_cache("1"):
+                    for n_words, answer in answers.items():
+                        record(f"evaluate_answer_cached/{n_words}w",
+                               lambda: evaluate_answer(answer, question["ideal_answer"], keywords,
+                                                       question_id=question["question_id"], role=role, engine=engine))
+
+            record(f"InterviewSession/{size}q", lambda: InterviewSession(role, bank=bank))
+
+            if size == bank_sizes[0]:
+                for n_responses in RESPONSE_COUNTS:
+                    session = _session_with_responses(bank, n_responses, seed)
+                    record(f"get_topic_wise_scores/{n_responses}r", session.get_topic_wise_scores)
+
+    log("\ncohort")
+    for n_sessions in COHORT_SESSIONS:
+        rows = _cohort_rows(n_sessions, seed)
+        cohort = Cohort.from_rows(rows)
+        candidate = PerformanceAnalyzer(
+            [{"topic": topic, "score": score, "confidence": score} for _, _, _, topic, score in rows[:12]], role
+        ).generate_report()
+
+        record(f"cohort_from_rows/{n_sessions}s", lambda: Cohort.from_rows(rows), n=max(3, repeats // 5))
+        record(f"cohort_topic_percentiles/{n_sessions}s", lambda: cohort.topic_percentiles(role))
+        record(f"cohort_score_distribution/{n_sessions}s", lambda: cohort.score_distribution(role))
+        record(f"cohort_rank/{n_sessions}s", lambda: cohort.rank(candidate))
+
+    log("\nreports")
+    report, feedback = _report()
+    with tempfile.TemporaryDirectory() as out:
+        record("export_report_json", lambda: export_report_json(report, feedback, output_dir=out, report_id="bench"))
+        record("export_report_pdf", lambda: export_report_pdf(report, feedback, output_dir=out, report_id="bench"),
+               n=max(3, repeats // 5))
+
+    return results
+
+
+def _metadata(args):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "bank_sizes": args.bank_sizes,
+        "answer_words": args.answer_words,
+        "repeats": args.repeats,
+        "seed": args.seed,
+    }
+
+
+# ------------------ COMPARE ------------------ #
+
+def compare(baseline, current, threshold=0.15, min_delta_ms=0.01, log=print):
+    """
+    Cases whose median grew by more than ``threshold`` (a fraction) and by
+    at least ``min_delta_ms``; the absolute floor keeps microsecond-scale
+    cases from flagging on timer noise.
+    """
+    regressions = []
+    log(f"{'case':<45}  {'baseline':>10}  {'current':>10}  {'change':>8}")
+
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            log(f"{name:<45}  {'-':>10}  {result['median_ms']:>10.3f}  {'new':>8}")
+            continue
+
+        old, new = before["median_ms"], result["median_ms"]
+        change = (new - old) / old if old else 0.0
+        regressed = change > threshold and new - old >= min_delta_ms
+
+        flag = "  REGRESSION" if regressed else ""
+        log(f"{name:<45}  {old:>10.3f}  {new:>10.3f}  {change:>+7.1%}{flag}")
+
+        if regressed:
+            regressions.append({"case": name, "baseline_ms": old, "current_ms": new, "change": round(change, 4)})
+
+    for name in baseline["results"].keys() - current["results"].keys():
+        log(f"{name:<45}  {baseline['results'][name]['median_ms']:>10.3f}  {'-':>10}  {'missing':>8}")
+
+    return regressions
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _report_regressions(regressions, threshold):
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {threshold:.0%}")
+        return 1
+    print("\nno regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite")
+    run.add_argument("--bank-sizes", type=int, nargs="+", default=None)
+    run.add_argument("--answer-words", type=int, nargs="+", default=ANSWER_WORDS)
+    run.add_argument("--repeats", type=int, default=None, help="timed calls per case (default 50, 10 with --quick)")
+    run.add_argument("--quick", action="store_true", help="skip the 1M-question scale and use fewer repeats")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--data-dir", help="where generated banks are kept (default: a temporary directory)")
+    run.add_argument("--json", help="write results to this file")
+    run.add_argument("--baseline", help="compare against this results file")
+    run.add_argument("--threshold", type=float, default=0.15)
+
+    cmp = commands.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.15)
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        regressions = compare(_load(args.baseline), _load(args.current), args.threshold)
+        return _report_regressions(regressions, args.threshold)
+
+    if args.bank_sizes is None:
+        args.bank_sizes = QUICK_BANK_SIZES if args.quick else BANK_SIZES
+    if args.repeats is None:
+        args.repeats = QUICK_REPEATS if args.quick else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_suite(args.bank_sizes, args.answer_words, args.repeats, args.data_dir or tmp, seed=args.seed)
+
+    output = {"meta": _metadata(args), "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=4)
+
+    if args.baseline:
+        print()
+        regressions = compare(_load(args.baseline), output, args.threshold)
+        return _report_regressions(regressions, args.threshold)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import csv
+import random
+from pathlib import Path
+
+
+# ------------------ VOCABULARY ------------------ #
+
+ROLES = [
+    "Data Scientist",
+    "Machine Learning Engineer",
+    "Backend Developer",
+    "Data Engineer",
+    "Frontend Developer",
+    "DevOps Engineer",
+    "Data Analyst",
+    "Software Engineer",
+]
+
+TOPICS = [
+    "Statistics",
+    "Machine Learning",
+    "Python",
+    "SQL",
+    "System Design Basics",
+    "Operating Systems",
+]
+
+WORDS = (
+    "model data training test variance bias mean median distribution probability "
+    "feature label regression classification cluster query table index join filter "
+    "aggregate python list dictionary array matrix pandas numpy function memory "
+    "process thread cache latency throughput scaling queue storage network request "
+    "overfitting underfitting validation accuracy precision recall gradient loss "
+    "normalization hypothesis significance correlation sample population outlier"
+).split()
+
+
+def _sentence(rng, n_words):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+# ------------------ GENERATORS ------------------ #
+
+def generate_question_rows(n_questions, seed=0, roles=ROLES):
+    """Yield question-bank rows in the same shape as ``data/questions.csv``."""
+    rng = random.Random(seed)
+
+    for i in range(n_questions):
+        keywords = ", ".join(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+            for _ in range(rng.randint(4, 8))
+        )
+        yield {
+            "role": roles[i % len(roles)],
+            "topic": rng.choice(TOPICS),
+            "question_id": f"Q{i + 1}",
+            "question_text": f"Explain {_sentence(rng, 3)}?",
+            "ideal_answer": _sentence(rng, rng.randint(12, 30)),
+            "keywords": keywords,
+        }
+
+
+def write_question_bank(path, n_questions, seed=0):
+    """Write a synthetic bank of ``n_questions`` rows to ``path``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=["role", "topic", "question_id", "question_text", "ideal_answer", "keywords"],
+        )
+        writer.writeheader()
+        writer.writerows(generate_question_rows(n_questions, seed=seed))
+
+    return path
+
+
+def generate_answer(n_words, seed=0):
+    """A candidate answer of exactly ``n_words`` words."""
+    return _sentence(random.Random(seed), n_words)
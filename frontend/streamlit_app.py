@@ -4,14 +4,51 @@ from pathlib import Path
 # Add project root to Python path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+import uuid
+
 import streamlit as st
 from streamlit_option_menu import option_menu
 import plotly.express as px
 import pandas as pd
+from app.question_bank import get_question_bank
 from app.session import InterviewSession
+from app.similarity import get_similarity_engine
 
 st.set_page_config(page_title="AI Interview Platform", layout="wide")
 
+# --------------------------------------------------
+# SHARED RESOURCES
+# --------------------------------------------------
+# Streamlit re-executes this script on every interaction; these are built
+# once per server process and shared by every user's session.
+
+@st.cache_resource
+def load_question_bank():
+    return get_question_bank()
+
+
+# derived dashboard data only changes when a response is recorded, so it is
+# keyed by (interview, response count); the session itself is not hashed
+@st.cache_data(max_entries=1000)
+def dashboard_data(session_key, response_count, _session):
+    topic_scores = _session.get_topic_wise_scores()
+    strengths, weaknesses = _session.get_strengths_and_weaknesses()
+
+    df = pd.DataFrame({
+        "Topic": list(topic_scores.keys()),
+        "Score": list(topic_scores.values())
+    })
+
+    fig = px.line_polar(
+        df,
+        r="Score",
+        theta="Topic",
+        line_close=True
+    )
+
+    return topic_scores, strengths, weaknesses, fig
+
+
 # --------------------------------------------------
 # SESSION STATE
 # --------------------------------------------------
@@ -19,12 +56,18 @@ st.set_page_config(page_title="AI Interview Platform", layout="wide")
 if "session" not in st.session_state:
     st.session_state.session = None
 
+if "session_key" not in st.session_state:
+    st.session_state.session_key = None
+
 if "current_question" not in st.session_state:
     st.session_state.current_question = None
 
 if "score" not in st.session_state:
     st.session_state.score = None
 
+if "last_result" not in st.session_state:
+    st.session_state.last_result = None
+
 
 # --------------------------------------------------
 # CUSTOM CSS
@@ -72,15 +115,64 @@ font-weight:600;
 """, unsafe_allow_html=True)
 
 
+# --------------------------------------------------
+# ANSWER PANEL
+# --------------------------------------------------
+
+# Answering reruns only this fragment, not the whole page. The answer box is
+# a form, so typing does not rerun anything until the answer is submitted.
+@st.fragment
+def answer_panel():
+
+    question_data = st.session_state.current_question
+
+    if question_data:
+
+        st.subheader("Question")
+        st.write(question_data["question"])
+
+        with st.form("answer_form", clear_on_submit=True):
+            user_answer = st.text_area("Enter your answer")
+            submitted = st.form_submit_button("Submit Answer")
+
+        if submitted:
+
+            result = st.session_state.session.evaluate_answer(user_answer, question_data)
+
+            st.session_state.score = result["score"]
+            st.session_state.last_result = result
+
+            # next question; the fragment reruns to show it
+            st.session_state.current_question = st.session_state.session.get_next_question()
+            st.rerun(scope="fragment")
+
+    elif st.session_state.session is not None:
+        st.info("No more questions. See the Dashboard for your results.")
+
+    if st.session_state.last_result is not None:
+        st.write("✅ Matched Keywords:", st.session_state.last_result["matched_keywords"])
+        st.write("❌ Missing Keywords:", st.session_state.last_result["missing_keywords"])
+
+    # SHOW SCORE
+    if st.session_state.score is not None:
+        st.metric("Answer Score", f"{st.session_state.score}%")
+
+
 # --------------------------------------------------
 # NAVIGATION
 # --------------------------------------------------
 
+PAGES = ["Home","Start Interview","Dashboard","Reports"]
+
+# ?page=Dashboard opens a page directly (also how benchmarks.streamlit_reruns navigates)
+page = st.query_params.get("page", "Home")
+
 selected = option_menu(
     menu_title=None,
-    options=["Home","Start Interview","Dashboard","Reports"],
+    options=PAGES,
     icons=["house","mic","bar-chart","file-earmark"],
-    orientation="horizontal"
+    orientation="horizontal",
+    default_index=PAGES.index(page) if page in PAGES else 0
 )
 
 # --------------------------------------------------
@@ -152,40 +244,21 @@ elif selected == "Start Interview":
 
     if st.button("Start Interview 🚀"):
 
-        st.session_state.session = InterviewSession(role)
+        bank = load_question_bank()
+        # the process-wide engine fits (or loads) each role's model once; later sessions of the role reuse it
+        get_similarity_engine(bank).model(role)
+        st.session_state.session = InterviewSession(role, bank=bank)
+        st.session_state.session_key = uuid.uuid4().hex
 
         question = st.session_state.session.get_next_question()
 
         st.session_state.current_question = question
+        st.session_state.score = None
+        st.session_state.last_result = None
 
         st.success(f"Starting {role} interview for {experience} level!")
 
-    # DISPLAY QUESTION
-    if st.session_state.current_question:
-
-        question_data = st.session_state.current_question
-
-        st.subheader("Question")
-        st.write(question_data["question"])
-
-        user_answer = st.text_area("Enter your answer")
-
-        if st.button("Submit Answer"):
-
-            result = st.session_state.session.evaluate_answer(user_answer, question_data)
-
-            st.session_state.score = result["score"]
-
-            st.write("✅ Matched Keywords:", result["matched"])
-            st.write("❌ Missing Keywords:", result["missed"])
-
-            # next question
-            next_q = st.session_state.session.get_next_question()
-            st.session_state.current_question = next_q
-
-    # SHOW SCORE
-    if st.session_state.score is not None:
-        st.metric("Answer Score", f"{st.session_state.score}%")
+    answer_panel()
 
 # --------------------------------------------------
 # DASHBOARD
@@ -199,13 +272,14 @@ elif selected == "Dashboard":
         st.warning("Start an interview first!")
     
     else:
-        topic_scores = st.session_state.session.get_topic_wise_scores()
+        session = st.session_state.session
+        topic_scores, strengths, weaknesses, fig = dashboard_data(
+            st.session_state.session_key, len(session.responses), session
+        )
 
         st.subheader("📊 Topic-wise Performance")
         st.write(topic_scores)
 
-        strengths, weaknesses = st.session_state.session.get_strengths_and_weaknesses()
-
         st.subheader("💪 Strengths")
         st.write(strengths)
 
@@ -213,18 +287,6 @@ elif selected == "Dashboard":
         st.write(weaknesses)
 
         # Radar Chart
-        df = pd.DataFrame({
-            "Topic": list(topic_scores.keys()),
-            "Score": list(topic_scores.values())
-        })
-
-        fig = px.line_polar(
-            df,
-            r="Score",
-            theta="Topic",
-            line_close=True
-        )
-
         st.plotly_chart(fig)
 
 # --------------------------------------------------
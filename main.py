@@ -1,11 +1,62 @@
-from fastapi import FastAPI
+import asyncio
+import io
+import json
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
-from app.session import InterviewSession
+from app import metrics
+from app.analytics import cohort_analytics_from_env
+from app.feedback import FeedbackGenerator
+from app.grading_pool import fast_start, grading_pool_from_env
+from app.live_scoring import LiveConnection
+from app.profiling import ProfilingMiddleware, profiling_from_env, token_matches
+from app.report_jobs import MEDIA_TYPES, RENDERERS, ReportJobQueue, ReportQueueFull
+from app.session import InterviewSession, resolve_answers
+from app.session_backend import SQLiteSessionBackend, new_session_id
+from app.session_store import SessionStore
+from app.warmup import WarmUp
+
+# CPU-bound grading runs here, off the event loop (GRADING_EXECUTOR / GRADING_WORKERS)
+grading_pool = grading_pool_from_env()
+
+# PDF/JSON reports render in memory on REPORT_WORKERS threads;
+# REPORT_OUTPUT_DIR additionally keeps a copy of each file on disk
+report_jobs = ReportJobQueue(
+    workers=int(os.environ.get("REPORT_WORKERS", 2)),
+    output_dir=os.environ.get("REPORT_OUTPUT_DIR") or None,
+)
+
+
+# preloads the bank, starts warm grading workers and grades synthetic answers;
+# the server accepts connections meanwhile, but /readyz says 503 until it is done
+warm_up = WarmUp(grading_pool)
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    if fast_start():
+        warm_up.skip()
+        warm_up_task = None
+    else:
+        warm_up_task = asyncio.create_task(warm_up.run())
+
+    yield
+
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    grading_pool.shutdown()
+    report_jobs.shutdown()
+    session_io.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(lifespan=lifespan)
 
 # ✅ CORS middleware
 app.add_middleware(
@@ -16,6 +67,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# per-route latency and status counts, exposed on /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+# PROFILING=1: profile requests flagged with X-Profile (or sampled); off by default
+profiling = profiling_from_env()
+if profiling is not None:
+    app.add_middleware(ProfilingMiddleware, skip_prefixes=("/admin/", "/static/", "/metrics"), **profiling)
+
 # ✅ Serve static files (JS, CSS)
 app.mount("/static", StaticFiles(directory="frontend"), name="static")
 
@@ -27,46 +86,358 @@ def serve_frontend():
 
 # ---------------- SESSION LOGIC ---------------- #
 
-sessions = {}
+# SESSION_BACKEND=sqlite shares sessions between all uvicorn workers on the box
+if os.environ.get("SESSION_BACKEND", "memory") == "sqlite":
+    session_backend = SQLiteSessionBackend(os.environ.get("SESSION_DB_PATH", "data/sessions.db"))
+else:
+    session_backend = None
+
+# bounded: idle sessions expire, and the least recently used go past the cap
+sessions = SessionStore(
+    ttl_seconds=float(os.environ.get("SESSION_TTL_SECONDS", 3600)),
+    max_sessions=int(os.environ.get("MAX_SESSIONS", 10000)),
+    backend=session_backend,
+)
+
+# SQLite session reads and writes block (a write may wait out another worker's
+# lock for the busy timeout), so they run on these threads, never on the event loop
+session_io = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("SESSION_IO_WORKERS", 4)),
+    thread_name_prefix="session-io",
+)
+
+
+async def run_session_io(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(session_io, fn, *args)
+
+
+async def stored(fn, *args):
+    """Call a store or session method that may touch the shared backend; inline when sessions are in-process only."""
+    if session_backend is None:
+        return fn(*args)
+    return await run_session_io(fn, *args)
+
+# scores of finished sessions outlive the sessions, for cohort statistics (COHORT_DB_PATH)
+cohort = cohort_analytics_from_env()
+
+metrics.Gauge(
+    "active_sessions",
+    "Sessions held by this process (with SESSION_BACKEND=sqlite: this worker's cache)",
+    function=lambda: len(sessions),
+)
+
+
+async def session_error(session_id):
+    if await stored(sessions.is_expired, session_id):
+        return {"error": "Session expired"}
+    return {"error": "Invalid session_id"}
+
+
+# one lock per live session id, so concurrent requests can't race on
+# current_index or responses; entries vanish once no request holds them
+session_locks = weakref.WeakValueDictionary()
+
+
+def session_lock(session_id):
+    lock = session_locks.get(session_id)
+    if lock is None:
+        lock = session_locks[session_id] = asyncio.Lock()
+    return lock
+
 
 @app.post("/start-session")
-def start_session(role: str):
-    session = InterviewSession(role)
-    session_id = str(id(session))
-    sessions[session_id] = session
-    return {"session_id": session_id}
+async def start_session(role: str, seed: int = None):
+    session_id = new_session_id()
+
+    def create():
+        # the same seed (and bank) replays the same question order; building the
+        # session may (re)load the bank, and storing it writes to the backend
+        session = InterviewSession(role, seed=seed)
+        sessions.put(session_id, session)
+        return session
+
+    session = await run_session_io(create)
+    metrics.SESSIONS_STARTED_TOTAL.inc()
+    return {"session_id": session_id, "seed": session.seed}
 
 
 @app.get("/next-question")
-def next_question(session_id: str):
-    session = sessions.get(session_id)
-    if not session:
-        return {"error": "Invalid session_id"}
-    return session.get_next_question()
+async def next_question(session_id: str):
+    async with session_lock(session_id):
+        session = await stored(sessions.get, session_id)
+        if not session:
+            return await session_error(session_id)
+        return await stored(session.get_next_question)
 
 
 @app.post("/submit-answer")
-def submit_answer(data: dict):
-    session = sessions.get(data["session_id"])
+async def submit_answer(data: dict):
+    session_id = data["session_id"]
+
+    async with session_lock(session_id):
+        session = await stored(sessions.get, session_id)
+        if not session:
+            return await session_error(session_id)
+
+        result = await grading_pool.evaluate(
+            *session.grading_args(data["user_answer"], data["question_data"])
+        )
+        await stored(session.record_response, data["question_data"], result)
+
+    return result
+
+
+@app.post("/submit-answers-batch")
+async def submit_answers_batch(data: dict):
+    answers = data.get("answers", [])
+    session_id = data.get("session_id")
+
+    # regrading recorded answers against the question bank
+    if session_id is None:
+        try:
+            _, args = resolve_answers(answers, role=data.get("role"))
+        except ValueError as e:
+            return {"error": str(e)}
+
+        return {"results": await grading_pool.evaluate_batch(*args)}
+
+    # graded into a live session
+    async with session_lock(session_id):
+        session = await stored(sessions.get, session_id)
+        if not session:
+            return await session_error(session_id)
+
+        try:
+            question_data, args = resolve_answers(answers, role=session.role, bank=session.bank)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        results = await grading_pool.evaluate_batch(*args)
+
+        def record_all():
+            for question, result in zip(question_data, results):
+                session.record_response(question, result)
+
+        await stored(record_all)
+
+    return {"results": results}
+
+
+@app.websocket("/live-score")
+async def live_score(websocket: WebSocket, session_id: str):
+    # provisional scores while the candidate types; nothing is recorded,
+    # the final answer still goes through /submit-answer
+    await websocket.accept()
+
+    session = await stored(sessions.get, session_id)
     if not session:
-        return {"error": "Invalid session_id"}
+        await websocket.send_json(await session_error(session_id))
+        await websocket.close(code=1008)
+        return
 
-    return session.evaluate_answer(
-        data["user_answer"],
-        data["question_data"]
-    )
+    live = LiveConnection(session)
+    loop = asyncio.get_running_loop()
+    metrics.LIVE_SCORING_CONNECTIONS.inc()
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                await websocket.send_json({"error": "Expected a JSON object"})
+                continue
+
+            # the first question of a role may fit its model, so keep it off the event loop
+            await websocket.send_json(await loop.run_in_executor(None, live.handle, message))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        metrics.LIVE_SCORING_CONNECTIONS.dec()
 
 
 @app.get("/get-results")
-def get_results(session_id: str):
-    session = sessions.get(session_id)
-    if not session:
-        return {"error": "Invalid session_id"}
+async def get_results(session_id: str):
+    async with session_lock(session_id):
+        session = await stored(sessions.get, session_id)
+        if not session:
+            return await session_error(session_id)
 
-    strengths, weaknesses = session.get_strengths_and_weaknesses()
+        strengths, weaknesses = session.get_strengths_and_weaknesses()
 
-    return {
-        "topic_scores": session.get_topic_wise_scores(),
-        "strengths": strengths,
-        "weaknesses": weaknesses
-    }
\ No newline at end of file
+        results = {
+            "topic_scores": session.get_topic_wise_scores(),
+            "topic_stats": session.get_topic_stats(),
+            "strengths": strengths,
+            "weaknesses": weaknesses
+        }
+        role, responses = session.role, list(session.responses)
+
+    # asking for results is when a session counts as finished
+    await record_finished(session_id, role, responses)
+    return results
+
+
+@app.get("/session-stats")
+async def session_stats():
+    return sessions.stats()
+
+
+@app.get("/healthz")
+async def healthz():
+    # liveness: the process is up and the event loop answers
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    # readiness: warm-up has finished, so the first real submit is fast
+    return JSONResponse(warm_up.status(), status_code=200 if warm_up.ready else 503)
+
+
+@app.get("/metrics")
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+# ---------------- COHORT ---------------- #
+
+def cohort_disabled():
+    return {"error": "Cohort analytics are disabled"}
+
+
+async def record_finished(session_id, role, responses):
+    if cohort is not None:
+        await asyncio.get_running_loop().run_in_executor(None, cohort.record, session_id, role, responses)
+
+
+@app.get("/cohort/stats")
+async def cohort_stats(role: str = None, bins: int = 10):
+    if cohort is None:
+        return cohort_disabled()
+    if not 1 <= bins <= 100:
+        return {"error": "bins must be between 1 and 100"}
+
+    return await asyncio.get_running_loop().run_in_executor(None, cohort.stats, role, bins)
+
+
+@app.get("/cohort/rank")
+async def cohort_rank(session_id: str):
+    if cohort is None:
+        return cohort_disabled()
+
+    async with session_lock(session_id):
+        session = await stored(sessions.get, session_id)
+        if not session:
+            return await session_error(session_id)
+        report = session.get_report()
+
+    return await asyncio.get_running_loop().run_in_executor(None, cohort.rank, report)
+
+
+# ---------------- PROFILES ---------------- #
+
+def profiles_error(admin_token):
+    if profiling is None:
+        return {"error": "Profiling is disabled"}
+    if not token_matches(admin_token, profiling["token"]):
+        return {"error": "Invalid admin token"}
+    return None
+
+
+@app.get("/admin/profiles")
+def list_profiles(x_admin_token: str = Header(None)):
+    error = profiles_error(x_admin_token)
+    if error:
+        return error
+    return {"profiles": profiling["store"].list()}
+
+
+@app.get("/admin/profiles/{name}")
+def download_profile(name: str, x_admin_token: str = Header(None)):
+    error = profiles_error(x_admin_token)
+    if error:
+        return error
+
+    path = profiling["store"].path(name)
+    if path is None:
+        return {"error": "Unknown profile"}
+    return FileResponse(path, filename=name)
+
+
+# ---------------- REPORTS ---------------- #
+
+async def _session_report(session_id):
+    async with session_lock(session_id):
+        session = await stored(sessions.get, session_id)
+        if not session:
+            return None, await session_error(session_id)
+        report = session.get_report()
+        responses = list(session.responses)
+
+    await record_finished(session_id, report["role"], responses)
+    return (report, FeedbackGenerator(report).generate_feedback()), None
+
+
+def report_queue_full(error):
+    # max_pending renders are already queued or running: shed load rather than queue without bound
+    return JSONResponse({"error": str(error)}, status_code=503, headers={"Retry-After": "5"})
+
+
+@app.post("/reports")
+async def create_report(data: dict):
+    session_id = data["session_id"]
+
+    report_and_feedback, error = await _session_report(session_id)
+    if error:
+        return error
+
+    try:
+        job = report_jobs.submit(*report_and_feedback, data.get("format", "pdf"))
+    except ReportQueueFull as e:
+        return report_queue_full(e)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    return job.as_dict()
+
+
+@app.get("/reports/{job_id}")
+async def get_report(job_id: str):
+    job = report_jobs.get(job_id)
+    if job is None:
+        return {"error": "Unknown report job"}
+
+    if job.status != "done":
+        return job.as_dict()
+
+    return Response(
+        job.content,
+        media_type=MEDIA_TYPES[job.format],
+        headers={"Content-Disposition": f'attachment; filename="interview_report_{job.job_id}.{job.format}"'}
+    )
+
+
+@app.get("/export-report")
+async def export_report(session_id: str, format: str = "pdf"):
+    """Render the report in memory and stream it straight back; nothing touches disk."""
+    if format not in RENDERERS:
+        return {"error": f"Unknown report format {format!r}"}
+
+    report_and_feedback, error = await _session_report(session_id)
+    if error:
+        return error
+
+    try:
+        future = report_jobs.render(*report_and_feedback, format)
+    except ReportQueueFull as e:
+        return report_queue_full(e)
+
+    try:
+        content = await asyncio.wrap_future(future)
+    except Exception as e:
+        return {"error": f"Report rendering failed: {e}"}
+
+    return StreamingResponse(
+        io.BytesIO(content),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="interview_report_{session_id}.{format}"'}
+    )
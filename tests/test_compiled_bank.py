@@ -0,0 +1,86 @@
+import pytest
+
+from app.compiled_bank import BankValidationError, CompiledBank, compile_bank, is_compiled_bank
+from app.question_bank import DEFAULT_BANK_PATH, QuestionBank
+from app.session import parse_keywords
+
+
+TEXT_COLUMNS = ("topic", "question_id", "question_text", "ideal_answer")
+
+
+def _text(value):
+    # pandas reads empty CSV cells as NaN in QuestionBank and as None in the compiler
+    return value if isinstance(value, str) else None
+
+
+def _write_csv(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_compiled_bank_round_trips_the_csv(tmp_path):
+    output = tmp_path / "questions.qbank"
+    compile_bank(DEFAULT_BANK_PATH, str(output))
+    assert is_compiled_bank(str(output))
+
+    csv_bank = QuestionBank(DEFAULT_BANK_PATH)
+    compiled = CompiledBank(str(output))
+
+    assert compiled.roles() == csv_bank.roles()
+    assert len(compiled) == len(csv_bank)
+
+    for role in csv_bank.roles():
+        expected = csv_bank.role_questions(role)
+        actual = compiled.role_questions(role)
+        assert len(actual) == len(expected)
+
+        for want, got in zip(expected, actual):
+            assert got["role"] == want["role"]
+            for column in TEXT_COLUMNS:
+                assert got[column] == _text(want[column]), column
+            assert parse_keywords(got["keywords"]) == parse_keywords(want["keywords"])
+
+            by_id = compiled.get_question(role, want["question_id"])
+            assert by_id["question_text"] == got["question_text"]
+            assert compiled.keyword_matcher(role, want["question_id"]).keywords == \
+                csv_bank.keyword_matcher(role, want["question_id"]).keywords
+
+    assert compiled.get_question("No Such Role", "Q1") is None
+    assert compiled.keyword_matcher("No Such Role", "Q1") is None
+
+
+def test_missing_columns_are_rejected(tmp_path):
+    source = _write_csv(tmp_path / "bad.csv", [
+        "role,topic,question_id,question_text,keywords",
+        "Data Scientist,Statistics,Q1,What is a mean?,mean",
+    ])
+    output = tmp_path / "bad.qbank"
+
+    with pytest.raises(BankValidationError, match="ideal_answer"):
+        compile_bank(str(source), str(output))
+    assert not output.exists()
+
+
+def test_duplicate_question_ids_are_rejected(tmp_path):
+    source = _write_csv(tmp_path / "dupes.csv", [
+        "role,topic,question_id,question_text,ideal_answer,keywords",
+        "Data Scientist,Statistics,Q1,What is a mean?,The average.,mean",
+        "Data Scientist,Statistics,Q1,What is a median?,The middle value.,median",
+    ])
+
+    with pytest.raises(BankValidationError, match="duplicate question_id"):
+        compile_bank(str(source), str(tmp_path / "dupes.qbank"))
+
+
+def test_warnings_only_fail_in_strict_mode(tmp_path):
+    source = _write_csv(tmp_path / "todo.csv", [
+        "role,topic,question_id,question_text,ideal_answer,keywords",
+        "Data Scientist,Statistics,Q1,What is a mean?,TO_BE_ADDED,mean",
+    ])
+
+    report = compile_bank(str(source), str(tmp_path / "todo.qbank"))
+    assert report["warnings"] == {"ideal_answer is TO_BE_ADDED": [2]}
+    assert CompiledBank(str(tmp_path / "todo.qbank")).get_question("Data Scientist", "Q1")["ideal_answer"] == "TO_BE_ADDED"
+
+    with pytest.raises(BankValidationError):
+        compile_bank(str(source), str(tmp_path / "strict.qbank"), strict=True)
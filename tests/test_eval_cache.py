@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+import app.eval_cache
+import app.evaluator
+from app.eval_cache import EvaluationCache
+from app.evaluator import _cache_key, evaluate_answer
+from app.question_bank import get_question_bank
+from app.session import parse_keywords
+from app.similarity import get_similarity_engine
+from utils.text_preprocessing import clean_text
+
+
+ROLE = "Data Scientist"
+ANSWER = "The median is the middle value, so outliers barely move it."
+
+
+@pytest.fixture
+def question():
+    return get_question_bank().role_questions(ROLE)[0]
+
+
+def key(question, answer=ANSWER, role=ROLE, question_id=None, ideal_answer=None, keywords=None):
+    return _cache_key(
+        get_similarity_engine(), role,
+        question["question_id"] if question_id is None else question_id,
+        question["ideal_answer"] if ideal_answer is None else ideal_answer,
+        parse_keywords(question["keywords"]) if keywords is None else keywords,
+        clean_text(answer), answer,
+    )
+
+
+def test_key_changes_with_the_answer(question):
+    assert key(question) == key(question)
+    assert key(question, answer=ANSWER + " Also the mean.") != key(question)
+    # keyword matching sees punctuation, so answers differing only in it get their own entry
+    assert key(question, answer=ANSWER.replace(",", "")) != key(question)
+
+
+def test_key_changes_with_the_question(question):
+    assert key(question, question_id="Q-other") != key(question)
+    assert key(question, role="Data Engineer") != key(question)
+    assert key(question, ideal_answer=question["ideal_answer"] + " Edited.") != key(question)
+    assert key(question, keywords=["mean"]) != key(question)
+
+
+def test_key_changes_with_the_scoring_version(question, monkeypatch):
+    before = key(question)
+    monkeypatch.setattr(app.evaluator, "SCORING_VERSION", app.evaluator.SCORING_VERSION + 1)
+    assert key(question) != before
+
+
+def test_new_scoring_version_is_not_served_old_results(question, monkeypatch):
+    cache = EvaluationCache()
+    monkeypatch.setenv("EVAL_CACHE", "1")
+    monkeypatch.setattr(app.eval_cache, "_cache", cache)
+
+    args = (ANSWER, question["ideal_answer"], parse_keywords(question["keywords"]))
+    kwargs = {"question_id": question["question_id"], "role": ROLE}
+
+    evaluate_answer(*args, **kwargs)
+    assert len(cache) == 1
+    evaluate_answer(*args, **kwargs)
+    assert len(cache) == 1
+
+    monkeypatch.setattr(app.evaluator, "SCORING_VERSION", app.evaluator.SCORING_VERSION + 1)
+    evaluate_answer(*args, **kwargs)
+    assert len(cache) == 2
+
+
+def _result(score):
+    return {"score": score, "confidence": score, "keyword_match": 0, "matched_keywords": [],
+            "missing_keywords": [], "feedback": ""}
+
+
+def test_shared_store_trims_to_the_newest_entries(tmp_path):
+    store = app.eval_cache.SQLiteResultStore(tmp_path / "cache.db", max_entries=3)
+    for i in range(5):
+        store.put(f"k{i}", _result(i))
+    store._trim(time.time() + 1)
+
+    assert [store.get(f"k{i}") is not None for i in range(5)] == [False, False, True, True, True]
+
+
+def test_failed_trim_rolls_back(tmp_path, monkeypatch):
+    store = app.eval_cache.SQLiteResultStore(tmp_path / "cache.db")
+    store.put("k", _result(1))
+    conn = store._conn
+
+    class FailingDelete:
+        def execute(self, sql, *args):
+            if sql.startswith("DELETE"):
+                raise KeyboardInterrupt
+            return conn.execute(sql, *args)
+
+    monkeypatch.setattr(app.eval_cache.SQLiteResultStore, "_conn", FailingDelete())
+    with pytest.raises(KeyboardInterrupt):
+        store._trim(time.time())
+
+    assert not conn.in_transaction
+    monkeypatch.undo()
+    store.put("k2", _result(2))
+    assert store.get("k2") is not None
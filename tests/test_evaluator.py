@@ -0,0 +1,67 @@
+import pytest
+
+from app.evaluator import evaluate_answer, evaluate_answers_batch
+from app.question_bank import get_question_bank
+from app.session import parse_keywords
+
+
+ROLE = "Data Scientist"
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    # every answer is graded, not served from the cache
+    monkeypatch.setenv("EVAL_CACHE", "0")
+
+
+def _cases():
+    questions = get_question_bank().role_questions(ROLE)
+    answers = [
+        question["ideal_answer"] for question in questions[:5]
+    ] + [
+        "The median is the middle value and is robust to outliers.",
+        "I don't know.",
+        "",
+        "Regularization   adds a PENALTY to large weights, reducing overfitting; L1 gives sparse models.",
+    ]
+
+    cases = []
+    for i, answer in enumerate(answers):
+        question = questions[i % len(questions)]
+        cases.append((answer, question["ideal_answer"], parse_keywords(question["keywords"]),
+                      question["question_id"], ROLE))
+
+    # ad-hoc questions: not in the bank, or without an ideal answer
+    cases.append(("A list is mutable, a tuple is not.", "Lists are mutable while tuples are immutable.",
+                  ["mutable", "immutable", "tuple"], None, None))
+    cases.append(("Joins combine tables.", "TO_BE_ADDED", ["join", "table"], None, None))
+    cases.append(("Some answer.", "Ideal answer.", [], "not-in-bank", ROLE))
+    return cases
+
+
+def test_batch_matches_scalar():
+    cases = _cases()
+    answers, ideals, keywords, question_ids, roles = (list(column) for column in zip(*cases))
+
+    batch = evaluate_answers_batch(answers, ideals, keywords, question_ids=question_ids, roles=roles)
+    scalar = [
+        evaluate_answer(answer, ideal, kws, question_id=question_id, role=role)
+        for answer, ideal, kws, question_id, role in cases
+    ]
+
+    # same dicts, to the rounding: score, confidence, keyword_match, keyword lists and feedback
+    assert batch == scalar
+
+
+def test_batch_with_a_single_role():
+    cases = [case for case in _cases() if case[4] == ROLE]
+    answers, ideals, keywords, question_ids, _ = (list(column) for column in zip(*cases))
+
+    batch = evaluate_answers_batch(answers, ideals, keywords, question_ids=question_ids, roles=ROLE)
+    scalar = [evaluate_answer(*case[:3], question_id=case[3], role=ROLE) for case in cases]
+
+    assert batch == scalar
+
+
+def test_empty_batch():
+    assert evaluate_answers_batch([], [], []) == []
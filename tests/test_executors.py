@@ -0,0 +1,17 @@
+import pytest
+
+from app.executors import InlineExecutor
+
+
+def test_runs_at_submit():
+    calls = []
+    with InlineExecutor() as executor:
+        future = executor.submit(calls.append, 1)
+        assert calls == [1]
+        assert future.done() and future.result() is None
+
+
+def test_errors_surface_through_the_future():
+    future = InlineExecutor().submit(int, "x")
+    with pytest.raises(ValueError):
+        future.result()
@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from app.keyword_matcher import AUTOMATON_MIN_PATTERNS, KeywordMatcher, get_keyword_matcher, normalize
+
+
+def substring_scan(user_answer, keywords):
+    # the original matcher: one substring test per keyword
+    text = normalize(user_answer)
+    matched = [word for word in keywords if normalize(word) in text]
+    missed = [word for word in keywords if normalize(word) not in text]
+    return (len(matched) / len(keywords)) * 100 if keywords else 0, matched, missed
+
+
+def _keywords(count, rng):
+    # overlapping patterns on purpose: prefixes, suffixes and words inside words
+    letters = "abcdeilmnort"
+    words = {"".join(rng.choice(letters) for _ in range(rng.randint(1, 6))) for _ in range(count * 3)}
+    words = sorted(words)[:count]
+    return words + ["Data Science", "data", "science", "SCIENCES", "  ", "a b"]
+
+
+def _answers(keywords, rng):
+    vocabulary = keywords + ["model", "Regression", "the", "outliers", "mean"]
+    return [
+        "",
+        " ".join(keywords),
+        " ".join(rng.choice(vocabulary) for _ in range(40)),
+        "".join(rng.choice("abcdeilmnort ") for _ in range(300)),
+    ]
+
+
+@pytest.mark.parametrize("count", [AUTOMATON_MIN_PATTERNS, AUTOMATON_MIN_PATTERNS * 2])
+def test_automaton_matches_substring_scan(count):
+    rng = random.Random(count)
+    keywords = _keywords(count, rng)
+    matcher = KeywordMatcher(keywords)
+    assert matcher._automaton is not None
+
+    for answer in _answers(keywords, rng):
+        assert matcher.match(answer) == substring_scan(answer, keywords)
+
+
+def test_small_lists_use_the_substring_scan():
+    keywords = ["mean", "median", "central tendency"]
+    matcher = KeywordMatcher(keywords)
+    assert matcher._automaton is None
+
+    answer = "The mean and the median measure central   tendency."
+    assert matcher.match(answer) == substring_scan(answer, keywords)
+
+
+@pytest.mark.parametrize("count", [8, AUTOMATON_MIN_PATTERNS])
+def test_stream_matches_whole_answer(count):
+    rng = random.Random(count)
+    keywords = _keywords(count, rng)
+    matcher = KeywordMatcher(keywords)
+
+    for answer in _answers(keywords, rng):
+        stream = matcher.stream()
+        position = 0
+        while position < len(answer):
+            step = rng.randint(1, 7)
+            stream.feed(answer[position:position + step])
+            position += step
+        assert stream.result() == matcher.match(answer)
+
+
+@pytest.fixture(params=["csv", "qbank"])
+def bank(request, tmp_path):
+    from app.compiled_bank import CompiledBank, compile_bank
+    from app.question_bank import DEFAULT_BANK_PATH, QuestionBank
+
+    if request.param == "csv":
+        return QuestionBank(DEFAULT_BANK_PATH)
+
+    path = tmp_path / "questions.qbank"
+    compile_bank(DEFAULT_BANK_PATH, path)
+    return CompiledBank(str(path))
+
+
+def test_bank_questions_share_the_snapshot_matcher(bank):
+    from app.session import parse_keywords
+
+    role = bank.roles()[0]
+    question = bank.role_questions(role)[0]
+    keywords = parse_keywords(question["keywords"])
+
+    matcher = get_keyword_matcher(keywords, bank, role, question["question_id"])
+    assert matcher is bank.keyword_matcher(role, question["question_id"])
+    assert get_keyword_matcher(keywords, bank, role, question["question_id"]) is matcher
+
+    # edited keywords, unknown or ad-hoc questions get their own matcher
+    assert get_keyword_matcher(keywords[:1], bank, role, question["question_id"]) is not matcher
+    assert get_keyword_matcher(keywords, bank, role, "no-such-question") is not matcher
+    assert get_keyword_matcher(keywords) is not matcher
+
+    # a reload compiles new matchers along with the new snapshot
+    bank.refresh(force=True)
+    assert bank.keyword_matcher(role, question["question_id"]) is not matcher
+
+
+def test_public_helpers_reuse_the_bank_matcher(bank, monkeypatch):
+    import app.keyword_matcher
+    from app.evaluator import keyword_match_details, keyword_match_score
+    from app.session import parse_keywords
+
+    role = bank.roles()[0]
+    question = bank.role_questions(role)[0]
+    keywords = parse_keywords(question["keywords"])
+    args = (bank, role, question["question_id"])
+    expected = keyword_match_score("mean and median", keywords)
+
+    # the bank's matcher is compiled once; after that nothing is compiled per call
+    bank.keyword_matcher(role, question["question_id"])
+    monkeypatch.setattr(app.keyword_matcher, "KeywordMatcher", None)
+    assert keyword_match_score("mean and median", keywords, *args) == expected
+    assert keyword_match_details("mean and median", keywords, *args)[0] == ["mean", "median"]
@@ -0,0 +1,50 @@
+import pytest
+
+from app.live_scoring import LiveConnection
+from app.session import InterviewSession
+
+
+ROLE = "Data Scientist"
+
+
+@pytest.fixture
+def live():
+    return LiveConnection(InterviewSession(ROLE, seed=1))
+
+
+@pytest.mark.parametrize("message", [
+    {"question_data": "x"},
+    {"question_data": ["x"]},
+    {"question_data": {"question_id": ["a"], "ideal_answer": "x", "keywords": "x"}},
+    {"question_data": {"ideal_answer": "x", "keywords": [1, 2]}},
+    {"question_id": ["a"]},
+    {"question_id": {"a": 1}},
+    {"question_id": None},
+    {"question_id": True},
+    {"question_id": "no-such-question"},
+])
+def test_bad_questions_are_errors(live, message):
+    reply = live.handle(message)
+    assert set(reply) == {"error"}
+
+    # the connection keeps working afterwards
+    question = live.session.bank.role_questions(ROLE)[0]
+    assert "error" not in live.handle({"question_id": question["question_id"]})
+
+
+def test_scores_typed_text(live):
+    question = live.session.bank.role_questions(ROLE)[0]
+    live.handle({"question_id": question["question_id"]})
+
+    live.handle({"append": "The median is the middle "})
+    reply = live.handle({"append": "value; outliers barely move it."})
+    assert "median" in reply["matched_keywords"]
+    assert reply["chars"] == len("The median is the middle value; outliers barely move it.")
+
+    assert live.handle({"replace": "mean"})["matched_keywords"] == ["mean"]
+
+
+def test_ad_hoc_question(live):
+    reply = live.handle({"question_data": {"ideal_answer": "Lists are mutable.", "keywords": ["mutable"]}})
+    assert reply["matched_keywords"] == []
+    assert live.handle({"append": "a list is mutable"})["matched_keywords"] == ["mutable"]
@@ -0,0 +1,37 @@
+import pytest
+
+from app.profiling import profiling_from_env, token_matches
+
+
+def test_off_by_default(monkeypatch):
+    monkeypatch.delenv("PROFILING", raising=False)
+    assert profiling_from_env() is None
+
+
+def test_requires_an_admin_token(monkeypatch):
+    monkeypatch.setenv("PROFILING", "1")
+    monkeypatch.delenv("PROFILE_ADMIN_TOKEN", raising=False)
+    with pytest.raises(ValueError):
+        profiling_from_env()
+
+    monkeypatch.setenv("PROFILE_ADMIN_TOKEN", "")
+    with pytest.raises(ValueError):
+        profiling_from_env()
+
+
+def test_enabled_with_a_token(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILING", "1")
+    monkeypatch.setenv("PROFILE_ADMIN_TOKEN", "secret")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    assert profiling_from_env()["token"] == "secret"
+
+
+def test_token_matches():
+    assert token_matches("secret", "secret")
+    assert token_matches(b"secret", "secret")
+    assert not token_matches("secreT", "secret")
+    assert not token_matches("", "secret")
+    assert not token_matches(None, "secret")
+    assert not token_matches("secret", None)
+    # non-ASCII headers are compared as bytes instead of raising
+    assert not token_matches("sécret", "secret")
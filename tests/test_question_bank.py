@@ -0,0 +1,58 @@
+import os
+import shutil
+
+from app.question_bank import DEFAULT_BANK_PATH, QuestionBank
+from app.session import InterviewSession
+
+
+ROLE = "Data Scientist"
+
+
+def _bank_copy(tmp_path):
+    path = tmp_path / "questions.csv"
+    shutil.copy(DEFAULT_BANK_PATH, path)
+    return path, QuestionBank(str(path), reload_interval=0)
+
+
+def _rewrite_first_question(path, text):
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    first = df.index[df["role"].str.strip() == ROLE][0]
+    df.loc[first, "question_text"] = text
+    df.to_csv(path, index=False)
+    # make sure the mtime moves even on coarse-grained filesystems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def test_unchanged_file_is_not_reloaded(tmp_path):
+    _, bank = _bank_copy(tmp_path)
+    questions = bank.role_questions(ROLE)
+    version = bank.version
+
+    assert bank.role_questions(ROLE) is questions
+    assert bank.version == version
+
+
+def test_rewritten_file_is_reloaded_and_old_sessions_keep_their_questions(tmp_path):
+    path, bank = _bank_copy(tmp_path)
+    session = InterviewSession(ROLE, bank=bank, seed=3)
+    old_questions = session.questions
+    old_text = old_questions[0]["question_text"]
+    version = bank.version
+
+    _rewrite_first_question(path, "What is a p-value, really?")
+
+    reloaded = bank.role_questions(ROLE)
+    assert bank.version == version + 1
+    assert reloaded is not old_questions
+    assert reloaded[0]["question_text"] == "What is a p-value, really?"
+
+    # the running session still reads the tuple it started with
+    assert session.questions is old_questions
+    assert old_questions[0]["question_text"] == old_text
+    assert session.get_next_question()["question"] in {q["question_text"] for q in old_questions}
+
+    # new sessions see the reloaded bank
+    assert InterviewSession(ROLE, bank=bank, seed=3).questions is reloaded
@@ -0,0 +1,30 @@
+import pytest
+
+from app.question_order import SeededPermutation
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 20, 64, 1000, 4097])
+@pytest.mark.parametrize("seed", [0, 1, 2 ** 62 + 12345])
+def test_is_a_bijection(size, seed):
+    order = SeededPermutation(size, seed)
+    assert len(order) == size
+    assert sorted(order) == list(range(size))
+
+
+def test_same_seed_replays_the_same_order():
+    first = list(SeededPermutation(500, 42))
+    assert list(SeededPermutation(500, 42)) == first
+    assert [SeededPermutation(500, 42)[i] for i in reversed(range(500))] == first[::-1]
+
+
+def test_different_seeds_give_different_orders():
+    orders = {tuple(SeededPermutation(50, seed)) for seed in range(20)}
+    assert len(orders) == 20
+
+
+def test_index_out_of_range():
+    order = SeededPermutation(5, 1)
+    with pytest.raises(IndexError):
+        order[5]
+    with pytest.raises(IndexError):
+        order[-1]
@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+import app.report_jobs
+from app.report_jobs import ReportJobQueue, ReportQueueFull
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    # renders wait until the test lets them finish
+    release = threading.Event()
+
+    def render(report, feedback):
+        release.wait(5)
+        return b"report"
+
+    monkeypatch.setitem(app.report_jobs.RENDERERS, "json", render)
+    yield release
+    release.set()
+
+
+def test_render_counts_against_max_pending(blocked):
+    queue = ReportJobQueue(workers=1, max_pending=2)
+    try:
+        first = queue.render({}, {}, "json")
+        queue.submit({}, {}, "json")
+
+        with pytest.raises(ReportQueueFull):
+            queue.render({}, {}, "json")
+        with pytest.raises(ReportQueueFull):
+            queue.submit({}, {}, "json")
+
+        blocked.set()
+        assert first.result(5) == b"report"
+    finally:
+        queue.shutdown()
+
+    assert queue._pending == 0
@@ -0,0 +1,48 @@
+from app.question_bank import QuestionBank, get_question_bank
+from app.semantic import SemanticEngine
+
+
+def _engine(tmp_path, dims=8, extra_corpus_path=None):
+    return SemanticEngine(get_question_bank(), model_path=str(tmp_path / "model.npz"), dims=dims,
+                          extra_corpus_path=extra_corpus_path)
+
+
+def test_saved_model_is_reused_when_nothing_changed(tmp_path):
+    fitted = _engine(tmp_path).semantic_model()
+    loaded = _engine(tmp_path).semantic_model()
+    assert loaded is not fitted
+    assert loaded.meta["fitted_at"] == fitted.meta["fitted_at"]
+
+
+def test_refits_when_dims_change(tmp_path):
+    fitted = _engine(tmp_path, dims=8).semantic_model()
+    refitted = _engine(tmp_path, dims=4).semantic_model()
+    assert refitted.meta["requested_dims"] == 4
+    assert refitted.meta["fitted_at"] != fitted.meta["fitted_at"]
+
+
+def test_refits_when_the_extra_corpus_changes(tmp_path):
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("a gaussian is a bell curve\n", encoding="utf-8")
+    fitted = _engine(tmp_path, extra_corpus_path=str(corpus)).semantic_model()
+    assert fitted.meta["extra_documents"] == 1
+
+    corpus.write_text("a gaussian is a bell curve\noverfitting means high variance\n", encoding="utf-8")
+    refitted = _engine(tmp_path, extra_corpus_path=str(corpus)).semantic_model()
+    assert refitted.meta["extra_documents"] == 2
+
+    without = _engine(tmp_path).semantic_model()
+    assert without.meta["extra_documents"] == 0
+
+
+def test_editing_the_extra_corpus_in_place_changes_scores_and_refits(tmp_path):
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("a gaussian is a bell curve\n", encoding="utf-8")
+    engine = SemanticEngine(QuestionBank(reload_interval=0), model_path=str(tmp_path / "model.npz"), dims=8,
+                            extra_corpus_path=str(corpus))
+    before = engine.scoring_version
+    assert engine.semantic_model().meta["extra_documents"] == 1
+
+    corpus.write_text("a gaussian is a bell curve\noverfitting means high variance\n", encoding="utf-8")
+    assert engine.scoring_version != before
+    assert engine.semantic_model().meta["extra_documents"] == 2
@@ -0,0 +1,144 @@
+import random
+import statistics
+
+import pytest
+
+from app.session import InterviewSession
+from app.session_backend import SQLiteSessionBackend
+
+
+ROLE = "Data Scientist"
+TOPICS = ["Statistics", "Machine Learning", "Python", "SQL"]
+
+
+def _record(session, count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        score = round(rng.uniform(0, 100), 2)
+        session.record_response(
+            {"question": "q", "topic": rng.choice(TOPICS)},
+            {"score": score, "confidence": score, "matched_keywords": [], "missing_keywords": []},
+        )
+
+
+def _by_topic(responses):
+    scores = {}
+    for response in responses:
+        scores.setdefault(response["topic"], []).append(response["score"])
+    return scores
+
+
+def assert_matches_recomputed(session):
+    by_topic = _by_topic(session.get_all_responses())
+
+    assert session.get_topic_wise_scores() == {
+        topic: round(sum(scores) / len(scores), 2) for topic, scores in by_topic.items()
+    }
+
+    stats = session.get_topic_stats()
+    assert stats.keys() == by_topic.keys()
+    for topic, scores in by_topic.items():
+        assert stats[topic]["count"] == len(scores)
+        assert stats[topic]["min"] == min(scores)
+        assert stats[topic]["max"] == max(scores)
+        assert stats[topic]["variance"] == pytest.approx(statistics.pvariance(scores), abs=0.01)
+
+
+@pytest.mark.parametrize("count", [0, 1, 7, 500])
+def test_topic_aggregates_match_recomputed(count):
+    session = InterviewSession(ROLE, seed=1)
+    _record(session, count, seed=count)
+    assert_matches_recomputed(session)
+
+
+def test_report_agrees_with_running_aggregates():
+    session = InterviewSession(ROLE, seed=1)
+    _record(session, 60)
+
+    report = session.get_report()
+    strengths, weaknesses = session.get_strengths_and_weaknesses()
+    assert report["topic_scores"] == session.get_topic_wise_scores()
+    assert report["classification"] == {"strong": strengths, "weak": weaknesses}
+
+
+def test_restored_session_rebuilds_aggregates(tmp_path):
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.db"))
+    session = InterviewSession(ROLE, seed=1)
+    session.attach("s1", backend)
+    _record(session, 40)
+
+    restored = InterviewSession.restore("s1", backend)
+    assert restored.get_topic_wise_scores() == session.get_topic_wise_scores()
+    assert_matches_recomputed(restored)
+
+
+# ------------------ BANK RELOADS ------------------ #
+
+def _bank_copy(tmp_path):
+    import shutil
+
+    from app.question_bank import DEFAULT_BANK_PATH, QuestionBank
+
+    path = tmp_path / "questions.csv"
+    shutil.copy(DEFAULT_BANK_PATH, path)
+    return path, QuestionBank(str(path), reload_interval=0)
+
+
+def _rewrite(path):
+    # drops the first question, shifting every later one
+    import os
+
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    path.write_text("".join(lines[:1] + lines[2:]), encoding="utf-8")
+    # make sure the mtime moves even on coarse-grained filesystems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def test_restore_replays_the_order_on_the_same_bank(tmp_path):
+    _, bank = _bank_copy(tmp_path)
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.db"))
+
+    session = InterviewSession(ROLE, bank=bank, seed=7)
+    session.attach("s1", backend)
+    asked = [session.get_next_question()["question_id"] for _ in range(3)]
+
+    restored = InterviewSession.restore("s1", backend, bank=bank)
+    assert [restored.questions[restored.order[i]]["question_id"] for i in range(3)] == asked
+    assert restored.get_next_question()["question_id"] == session.questions[session.order[3]]["question_id"]
+
+
+def test_restore_rejects_a_seeded_order_after_a_reload(tmp_path):
+    from app.session import QuestionBankChanged
+    from app.session_store import SessionStore
+
+    path, bank = _bank_copy(tmp_path)
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.db"))
+
+    session = InterviewSession(ROLE, bank=bank, seed=7)
+    session.attach("s1", backend)
+    session.get_next_question()
+
+    _rewrite(path)
+    bank.refresh()
+
+    with pytest.raises(QuestionBankChanged):
+        InterviewSession.restore("s1", backend, bank=bank)
+
+    # another worker's store: the session reads as expired, not as unknown
+    store = SessionStore(backend=backend, bank=bank)
+    assert store.get("s1") is None
+    assert store.is_expired("s1")
+
+
+def test_explicit_orders_survive_a_reload(tmp_path):
+    path, bank = _bank_copy(tmp_path)
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.db"))
+    ids = [question["question_id"] for question in bank.role_questions(ROLE)[1:4]]
+
+    session = InterviewSession(ROLE, bank=bank, question_ids=ids)
+    session.attach("s1", backend)
+
+    _rewrite(path)
+    restored = InterviewSession.restore("s1", backend, bank=bank)
+    assert [question["question_id"] for question in restored.questions] == ids
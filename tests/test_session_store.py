@@ -0,0 +1,87 @@
+import pytest
+
+import app.session_store
+from app.session_store import SessionStore
+
+
+class FakeClock:
+    """Stands in for the ``time`` module inside ``app.session_store``."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(app.session_store, "time", clock)
+    return clock
+
+
+def test_sessions_expire_after_the_idle_ttl(clock):
+    store = SessionStore(ttl_seconds=60)
+    session = object()
+    store.put("a", session)
+
+    clock.advance(59)
+    assert store.get("a") is session   # refreshes its last access
+
+    clock.advance(59)
+    assert store.get("a") is session
+
+    clock.advance(60)
+    assert store.get("a") is None
+    assert store.is_expired("a")
+    assert store.expirations == 1
+    assert len(store) == 0
+
+
+def test_least_recently_used_session_is_evicted_at_capacity(clock):
+    store = SessionStore(ttl_seconds=60, max_sessions=2)
+    a, b, c = object(), object(), object()
+    store.put("a", a)
+    clock.advance(1)
+    store.put("b", b)
+    clock.advance(1)
+    assert store.get("a") is a   # "b" is now the least recently used
+
+    store.put("c", c)
+    assert len(store) == 2
+    assert store.evictions == 1
+    assert store.get("b") is None
+    assert store.get("a") is a
+    assert store.get("c") is c
+
+
+def test_is_expired_tells_removed_sessions_from_unknown_ones(clock):
+    store = SessionStore(ttl_seconds=60, max_sessions=1)
+    store.put("a", object())
+    store.put("b", object())   # evicts "a"
+
+    assert store.is_expired("a")
+    assert not store.is_expired("b")
+    assert not store.is_expired("never-seen")
+
+    # reusing an id clears its tombstone
+    store.put("a", object())
+    assert not store.is_expired("a")
+
+
+def test_tombstones_are_bounded(clock):
+    store = SessionStore(ttl_seconds=60, max_sessions=1, max_tombstones=2)
+    for session_id in "abcd":
+        store.put(session_id, object())
+
+    # "a", "b" and "c" were evicted in turn; only the two newest are remembered
+    assert not store.is_expired("a")
+    assert store.is_expired("b")
+    assert store.is_expired("c")
@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+from benchmarks.startup_budget import BUDGETS, check
+
+
+# slow or shared CI machines can loosen every budget, as with --scale
+SCALE = float(os.environ.get("STARTUP_BUDGET_SCALE", 1.0))
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_stays_within_budget(module):
+    result = check({module: BUDGETS[module]}, scale=SCALE)[module]
+
+    assert not result["heavy_imports"], f"{module} imports {', '.join(result['heavy_imports'])} at import time"
+    assert result["ok"], f"{module} took {result['import_ms']} ms to import (budget {result['budget_ms']} ms)"
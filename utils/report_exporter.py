@@ -1,77 +1,94 @@
 import json
+import uuid
+from io import BytesIO
 from pathlib import Path
-import matplotlib.pyplot as plt
-
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer,
-    Table, TableStyle, Image
-)
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import inch
 
+# matplotlib and ReportLab take most of a second to import, so they are
+# imported inside the functions that draw charts and build PDFs; importing
+# this module (e.g. from the API) stays cheap until a report is rendered.
 
 # ---------- CHART GENERATION ----------
+# Each chart is its own Figure (no pyplot state machine), so charts can be
+# rendered from several threads at once without touching each other.
 
 def generate_topic_bar_chart(topic_scores, output_path):
-    plt.figure()
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.subplots()
     topics = list(topic_scores.keys())
     scores = list(topic_scores.values())
 
-    plt.bar(topics, scores)
-    plt.title("Topic-wise Performance")
-    plt.xlabel("Topics")
-    plt.ylabel("Score")
-    plt.xticks(rotation=30)
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+    ax.bar(topics, scores)
+    ax.set_title("Topic-wise Performance")
+    ax.set_xlabel("Topics")
+    ax.set_ylabel("Score")
+    ax.tick_params(axis="x", labelrotation=30)
+    fig.tight_layout()
+    fig.savefig(output_path, format="png")
 
 
 def generate_score_pie_chart(topic_scores, output_path):
-    plt.figure()
-    plt.pie(
-        topic_scores.values(),
-        labels=topic_scores.keys(),
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.subplots()
+    ax.pie(
+        list(topic_scores.values()),
+        labels=list(topic_scores.keys()),
         autopct="%1.1f%%"
     )
-    plt.title("Score Distribution")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+    ax.set_title("Score Distribution")
+    fig.tight_layout()
+    fig.savefig(output_path, format="png")
+
+
+def _chart_png(draw, topic_scores):
+    buffer = BytesIO()
+    draw(topic_scores, buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def _report_path(output_dir, report_id, suffix):
+    # unique per report, so concurrent exports never overwrite each other
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    report_id = report_id or uuid.uuid4().hex[:12]
+    return Path(output_dir) / f"interview_report_{report_id}.{suffix}"
 
 
 # ---------- JSON EXPORT ----------
 
-def export_report_json(report, feedback, output_dir="outputs"):
-    Path(output_dir).mkdir(exist_ok=True)
+def render_report_json(report, feedback):
+    return json.dumps({"report": report, "feedback": feedback}, indent=4).encode("utf-8")
 
-    path = Path(output_dir) / "interview_report.json"
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(
-            {"report": report, "feedback": feedback},
-            f,
-            indent=4
-        )
+
+def export_report_json(report, feedback, output_dir="outputs", report_id=None):
+    path = _report_path(output_dir, report_id, "json")
+    path.write_bytes(render_report_json(report, feedback))
     return path
 
 
 # ---------- PROFESSIONAL PDF EXPORT ----------
 
-def export_report_pdf(report, feedback, output_dir="outputs"):
-    Path(output_dir).mkdir(exist_ok=True)
-
-    bar_chart = Path(output_dir) / "topic_scores.png"
-    pie_chart = Path(output_dir) / "score_distribution.png"
+def render_report_pdf(report, feedback):
+    """Build the PDF entirely in memory (charts included) and return its bytes."""
+    from reportlab.platypus import (
+        SimpleDocTemplate, Paragraph, Spacer,
+        Table, TableStyle, Image
+    )
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
 
-    generate_topic_bar_chart(report["topic_scores"], bar_chart)
-    generate_score_pie_chart(report["topic_scores"], pie_chart)
+    bar_chart = _chart_png(generate_topic_bar_chart, report["topic_scores"])
+    pie_chart = _chart_png(generate_score_pie_chart, report["topic_scores"])
 
-    pdf_path = Path(output_dir) / "interview_report.pdf"
+    pdf_buffer = BytesIO()
 
     doc = SimpleDocTemplate(
-        str(pdf_path),
+        pdf_buffer,
         pagesize=A4,
         rightMargin=40,
         leftMargin=40,
@@ -118,9 +135,9 @@ def export_report_pdf(report, feedback, output_dir="outputs"):
     # ---------- CHARTS ----------
     elements.append(Paragraph("Performance Visualization", styles["Heading2"]))
     elements.append(Spacer(1, 0.2 * inch))
-    elements.append(Image(str(bar_chart), width=4.5 * inch, height=3 * inch))
+    elements.append(Image(bar_chart, width=4.5 * inch, height=3 * inch))
     elements.append(Spacer(1, 0.3 * inch))
-    elements.append(Image(str(pie_chart), width=4.5 * inch, height=3 * inch))
+    elements.append(Image(pie_chart, width=4.5 * inch, height=3 * inch))
     elements.append(Spacer(1, 0.4 * inch))
 
     # ---------- FEEDBACK ----------
@@ -134,4 +151,10 @@ def export_report_pdf(report, feedback, output_dir="outputs"):
 
     doc.build(elements)
 
-    return pdf_path
\ No newline at end of file
+    return pdf_buffer.getvalue()
+
+
+def export_report_pdf(report, feedback, output_dir="outputs", report_id=None):
+    path = _report_path(output_dir, report_id, "pdf")
+    path.write_bytes(render_report_pdf(report, feedback))
+    return path
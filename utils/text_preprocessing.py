@@ -1,4 +1,12 @@
 import re
+import string
+
+# ASCII characters clean_text removes: everything but [a-z0-9] and whitespace
+_ASCII_PUNCTUATION = {
+    code: None
+    for code in range(128)
+    if not (chr(code) in string.ascii_lowercase or chr(code) in string.digits or chr(code).isspace())
+}
 
 def clean_text(text: str) -> str:
     """
@@ -8,6 +16,11 @@ def clean_text(text: str) -> str:
         return ""
 
     text = text.lower()
+
+    # fast path for plain ASCII answers (same result as the regexes below)
+    if text.isascii():
+        return " ".join(text.translate(_ASCII_PUNCTUATION).split())
+
     text = re.sub(r"[^a-z0-9\s]", "", text)  # remove punctuation
     text = re.sub(r"\s+", " ", text).strip()  # normalize spaces
 